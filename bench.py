@@ -0,0 +1,220 @@
+# bench.py
+"""Kleine Mess-Skripte für Hotpaths von QLView.
+
+    python bench.py player-list [--players 64] [--rounds 50]
+    python bench.py names [--players 64] [--rounds 200]
+    python bench.py http [--requests 100] [--delay 0]
+
+player-list: rendert eine synthetische Spielerliste mit beiden Renderern
+(Widgets/Canvas) in einem versteckten Tk-Fenster und gibt Zeit pro
+Aktualisierung, Speicher (tracemalloc) sowie Widget-/Item-Zahlen aus.
+Braucht ein Display (unter Linux ggf. xvfb-run).
+
+names: Namens-Normalisierung pro Refresh (alle Aufrufstellen je Spieler)
+mit der früheren zeichenweisen Implementierung vs. utils.normalize_name.
+
+http: qlstats-Anfragen gegen den lokalen QlstatsStandIn, einmal mit
+urllib.request.urlopen (neue Verbindung pro Call), einmal mit HttpPool.
+"""
+import argparse
+import random
+import re
+import time
+import tracemalloc
+import types
+
+import config
+from udp_engine import Player
+
+COLOR_CODES = "01234567"
+
+
+def synthetic_players(count, seed=1):
+    """Spieler mit farbigen Namen (^N), Scores und Spielzeiten."""
+    rnd = random.Random(seed)
+    players = []
+    for i in range(count):
+        parts = ["^{}{}".format(rnd.choice(COLOR_CODES), rnd.choice(("Ra", "Zo", "Kil", "Mox", "Vex", "Tur")))
+                 for _ in range(rnd.randint(1, 4))]
+        name = "".join(parts) + str(i)
+        players.append(Player(index=i, name=name, score=rnd.randint(-1, 60), duration=rnd.uniform(30, 5400)))
+    return players
+
+
+def _widget_count(widget):
+    return 1 + sum(_widget_count(child) for child in widget.winfo_children())
+
+
+def bench_player_list(args):
+    import tkinter as tk
+    import utils
+    from playerlist import build_player_list
+    from ui import UIManager
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise SystemExit("player-list needs a display ({}); under Linux run it with xvfb-run.".format(e))
+    root.withdraw()
+    app = types.SimpleNamespace(
+        root=root,
+        app_config={"color_scheme": "Dark1", "show_hotkeys": False},
+        switch_to_favorite=lambda i: None,
+        server_handler=types.SimpleNamespace(manual_refresh=lambda: None),
+    )
+    ui = UIManager(app)
+    ui.current_color_scheme = config.COLOR_SCHEMES["Dark1"]
+    header = tk.Frame(root); header.pack(fill="x")
+    pane = tk.Frame(root, width=420, height=900); pane.pack(fill="both", expand=True)
+    ui._create_header(header)
+    ui._create_player_list_frame(pane)
+    root.update()
+
+    players = synthetic_players(args.players)
+    rnd = random.Random(2)
+    elo = {utils.normalize_name(p.name): rnd.randint(800, 2400) for p in players}
+    team = {utils.normalize_name(p.name): rnd.choice((1, 2, 1, 2, -1)) for p in players}
+    sids = {key: str(76561198000000000 + i) for i, key in enumerate(elo)}
+
+    def rounds():
+        # Scores/Zeiten ändern sich wie bei einem echten Refresh.
+        for r in range(args.rounds):
+            yield [p._replace(score=p.score + r % 3, duration=p.duration + r * 5) for p in players]
+
+    print("player-list: {} players, {} rounds".format(args.players, args.rounds))
+    for renderer in ("widgets", "canvas"):
+        ui.player_list_renderer_var.set(renderer)
+        ui.update_player_list([], [])
+        root.update()
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        ui.update_player_list(*build_player_list(players, elo, sids, team))
+        root.update()
+        first_ms = (time.perf_counter() - t0) * 1000
+
+        times = []
+        for batch in rounds():
+            # Zusammenfuehren passiert im Worker -> nicht mitgemessen.
+            records = build_player_list(batch, elo, sids, team)
+            t0 = time.perf_counter()
+            ui.update_player_list(*records)
+            root.update()
+            times.append((time.perf_counter() - t0) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        times.sort()
+        print("  {:<8} first {:7.2f} ms | update avg {:6.2f} ms, p95 {:6.2f} ms | "
+              "peak {:6.1f} KiB | widgets {:4d} | canvas items {:4d}".format(
+                  renderer, first_ms, sum(times) / len(times), times[int(len(times) * 0.95) - 1],
+                  peak / 1024, _widget_count(ui.player_canvas),
+                  len(ui.player_canvas.find_withtag("plist"))))
+    root.destroy()
+
+
+def _legacy_normalize(name):
+    """Frühere Implementierung (zeichenweise, ohne Memo) als Vergleichswert."""
+    out = []
+    i = 0
+    n = len(name)
+    while i < n:
+        ch = name[i]
+        if ch == '^' and i + 1 < n:
+            nxt = name[i + 1]
+            if nxt == '^':
+                out.append('^')
+                i += 2
+                continue
+            elif nxt.isdigit():
+                i += 2
+                continue
+        out.append(ch)
+        i += 1
+    s = ''.join(out).replace('\x00', '')
+    for ch in "'\"<>":
+        s = s.replace(ch, '')
+    s = re.sub(r'\s{2,}', ' ', s)
+    return s.strip().lower()
+
+
+# Aufrufe von normalize_name je Spieler und Refresh (is_ghost, team_of x3,
+# elo_of, Zeilen-Abgleich, Zeile, qlstats-Abgleich).
+NAME_CALL_SITES = 8
+
+
+def bench_names(args):
+    import utils
+
+    players = synthetic_players(args.players)
+    names = [p.name for p in players]
+
+    def run(normalize):
+        t0 = time.perf_counter()
+        for _ in range(args.rounds):
+            for name in names:
+                for _ in range(NAME_CALL_SITES):
+                    normalize(name)
+        return (time.perf_counter() - t0) * 1000 / args.rounds
+
+    utils.normalize_name.cache_clear()
+    utils.color_runs.cache_clear()
+    assert all(_legacy_normalize(n) == utils.normalize_name(n) for n in names)
+    print("names: {} players x {} call sites, {} rounds".format(args.players, NAME_CALL_SITES, args.rounds))
+    print("  legacy   {:8.3f} ms/refresh".format(run(_legacy_normalize)))
+    print("  memo     {:8.3f} ms/refresh  ({})".format(run(utils.normalize_name), utils.normalize_name.cache_info()))
+    t0 = time.perf_counter()
+    for name in names:
+        utils.color_runs.__wrapped__(name)
+    print("  color_runs uncached {:8.3f} ms for all players".format((time.perf_counter() - t0) * 1000))
+
+
+def bench_http(args):
+    import json
+    import urllib.request
+    from httpclient import HttpPool
+    from standin import QlstatsStandIn
+
+    with QlstatsStandIn(delay=args.delay) as standin:
+        url = standin.api_base + "/server/127.0.0.1:27960/players"
+
+        def urllib_get():
+            req = urllib.request.Request(url, headers={"User-Agent": config.APP_NAME})
+            with urllib.request.urlopen(req, timeout=config.QLSTATS_TIMEOUT) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+
+        pool = HttpPool()
+        print("http: {} requests against {}".format(args.requests, standin.api_base))
+        for label, get in (("urllib", urllib_get), ("pool", lambda: pool.get_json(url))):
+            connections = standin.connections
+            t0 = time.perf_counter()
+            for _ in range(args.requests):
+                get()
+            ms = (time.perf_counter() - t0) * 1000
+            print("  {:<7} {:8.2f} ms total, {:6.3f} ms/request, {:4d} connections".format(
+                label, ms, ms / args.requests, standin.connections - connections))
+        print("  pool stats: {}".format(pool.snapshot()))
+        pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QLView micro-benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("player-list", help="Widgets- vs. Canvas-Renderer der Spielerliste")
+    p.add_argument("--players", type=int, default=64)
+    p.add_argument("--rounds", type=int, default=50)
+    p.set_defaults(func=bench_player_list)
+    p = sub.add_parser("names", help="Namens-Normalisierung: zeichenweise vs. Tokenizer+LRU")
+    p.add_argument("--players", type=int, default=64)
+    p.add_argument("--rounds", type=int, default=200)
+    p.set_defaults(func=bench_names)
+    p = sub.add_parser("http", help="qlstats-Client: urllib vs. Keep-Alive-Pool (lokaler Stand-in)")
+    p.add_argument("--requests", type=int, default=100)
+    p.add_argument("--delay", type=float, default=0.0)
+    p.set_defaults(func=bench_http)
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,13 +22,106 @@ CONNECT_COMMAND = "steam://connect/{ip}:{port}"
 # automatisch das A- oder B-Rating: für Vampiric PQL CA ist es das B-Rating.
 QLSTATS_API_BASE = "https://qlstats.net/api"
 QLSTATS_TIMEOUT = 4.0
+# Offene Keep-Alive-Verbindungen je qlstats-Host und Anzahl URLs, fuer die
+# ETag/Last-Modified fuer bedingte Anfragen gemerkt werden.
+HTTP_POOL_SIZE = 4
+HTTP_CONDITIONAL_CACHE = 64
+# Negativ-Cache fuer qlstats: Server, die qlstats nicht trackt, werden nur
+# noch selten erneut geprueft (Backoff in s, verdoppelt sich bis zum Maximum).
+# Kurze Ausfaelle eines getrackten Servers werden schnell wiederholt.
+QLSTATS_UNTRACKED_BACKOFF = (60, 1800)
+QLSTATS_ERROR_BACKOFF = (5, 60)
+# Ab so vielen Fehlschlaegen ohne je eine Antwort gilt ein Server als ungetrackt.
+QLSTATS_UNTRACKED_AFTER = 3
+# Zufaellige Streuung aller Backoff-Wartezeiten (+-20 %).
+BACKOFF_JITTER = 0.2
 SHOW_ELO = True
+# Eigene ELO (fetch_own_elo) aendert sich hoechstens nach einem Match: Ergebnis
+# OWN_ELO_TTL Sekunden merken, auch ueber Neustarts (OWN_ELO_CACHE_FILE).
+OWN_ELO_TTL = 15 * 60
+OWN_ELO_CACHE_FILE = "own_elo_cache.json"
+# Nach einem Matchende: solange qlstats noch die alte ELO liefert, diese nur
+# OWN_ELO_SETTLE_RETRY s merken und erneut fragen (hoechstens fuer
+# OWN_ELO_SETTLE_WINDOW s, falls man gar nicht mitgespielt hat).
+OWN_ELO_SETTLE_WINDOW = 10 * 60
+OWN_ELO_SETTLE_RETRY = 60
+
+# --- Server-Abfrage ---
+# Timeouts der einzelnen Netzwerk-Calls einer Aktualisierung. Die Calls laufen
+# parallel; QUERY_DEADLINE begrenzt die Gesamtdauer einer Aktualisierung.
+A2S_TIMEOUT = 5.0
+RULES_TIMEOUT = 1.5
+PING_TIMEOUT = 1.5
+QUERY_DEADLINE = 6.0
+QUERY_WORKERS = 8
+# Gleichzeitige Abfrage-Runden; eine neue Runde bricht die vorige ab.
+ROUND_WORKERS = 2
+# Anzahl UDP-Sockets, ueber die die Engine alle A2S-/Ping-Abfragen verteilt
+# (dazu kommt ein eigener Socket fuer den PingSampler).
+UDP_SOCKETS = 3
+# Circuit Breaker: nach BREAKER_THRESHOLD fehlgeschlagenen Abfragen in Folge
+# gilt ein Server als down. Statt der vollen Abfrage gibt es dann nur noch
+# getchallenge-Proben (Timeout PROBE_TIMEOUT) im Abstand von 5 s bis 60 s.
+BREAKER_THRESHOLD = 3
+BREAKER_PROBE_BACKOFF = (5, 60)
+PROBE_TIMEOUT = 1.0
+# Dauerhafte Ping-Messung (pingsampler.py): Abstand der Samples (s), Timeout
+# je Sample, Anzahl gemerkter Samples je Server und Breite der Sparkline.
+# PING_SAMPLE_FAVORITES: auch alle Favoriten messen (Dashboard zeigt dann
+# den gemessenen Durchschnitt).
+PING_SAMPLE_INTERVAL = 1.0
+PING_SAMPLE_TIMEOUT = 1.0
+PING_SAMPLE_WINDOW = 120
+PING_SPARKLINE_WIDTH = 30
+PING_SAMPLE_FAVORITES = False
+# Adaptiver Refresh: im laufenden Match gilt das eingestellte Intervall, sonst
+# diese Mindestabstaende (s). visible = Warmup/Fehler, empty = niemand auf dem
+# Server, hidden = Fenster im Tray (dann nur A2S_INFO, Rest beim Anzeigen).
+REFRESH_STATE_INTERVALS = {"visible": 20, "empty": 60, "hidden": 120}
+# Worker-Ergebnisse gehen ueber eine Schlange an den Tk-Hauptthread (handoff.py).
+# Geleert wird alle HANDOFF_PUMP_MS, solange etwas ansteht (laufende Runde oder
+# bis HANDOFF_WAKE_HOLD_MS nach dem Anstossen), sonst alle HANDOFF_IDLE_MS, im
+# Tray alle HANDOFF_HIDDEN_MS.
+HANDOFF_PUMP_MS = 50
+HANDOFF_WAKE_HOLD_MS = 1000
+HANDOFF_IDLE_MS = 250
+HANDOFF_HIDDEN_MS = 500
+# Dauer jeder Aktualisierung (parallel vs. sequentielle Summe) auf der Konsole.
+LOG_REFRESH_TIMING = False
+# Bericht von main.py --profile-startup (Startphasen in ms).
+STARTUP_PROFILE_FILE = "startup_profile.txt"
+# Laufzeit je Phase jeder Aktualisierung (phasestats.py): p50/p95/max ueber die
+# letzten PHASE_STATS_WINDOW Runden je Server. Aus, bis PHASE_STATS gesetzt oder
+# das Debug-Fenster (DEBUG_OVERLAY_KEY) geoeffnet wird. PHASE_LOG_FILE: je
+# Messung eine Zeile in eine rotierende Logdatei (None = kein Log).
+PHASE_STATS = False
+PHASE_STATS_WINDOW = 100
+PHASE_LOG_FILE = None
+PHASE_LOG_MAX_BYTES = 1024 * 1024
+PHASE_LOG_BACKUPS = 3
+DEBUG_OVERLAY_KEY = "<Control-Shift-D>"
+DEBUG_OVERLAY_REFRESH_MS = 1000
 
 # --- UI Layout Constants ---
 MAX_SERVER_MAP_NAME_CHARS = 256
 MAX_PLAYER_NAME_CHARS = 64
+# Gemerkte Ergebnisse der Namens-Normalisierung (LRU, Anzahl Namen).
+NAME_CACHE_SIZE = 1024
+
+# --- Mapshots ---
+# Anzahl fertig skalierter Mapshots (PhotoImage), die im Speicher bleiben.
+# Ein Wechsel zwischen Favoriten trifft so meist den Cache.
+MAPSHOT_CACHE_SIZE = 16
+MAPSHOT_SIZE = (256, 192)
+# Vorskalierte Thumbnails (einmalig im Hintergrund erzeugt) und Intervall,
+# in dem der Mapshot-Ordner auf neue/geaenderte Dateien geprueft wird (s).
+MAPSHOT_THUMB_DIR = "mapshot_cache"
+MAPSHOT_WATCH_INTERVAL = 30
 
 # --- Color Schemes ---
+# Options-Vorschau: Klicks auf Schemata innerhalb dieser Zeit (ms) werden
+# zusammengefasst, angewendet wird nur das zuletzt gewaehlte.
+THEME_PREVIEW_DEBOUNCE_MS = 120
 COLOR_SCHEMES = {
     "Dark1": {"bg": "#1a1a1a", "fg": "#ffffff", "button_bg": "#2d2d2d", "button_fg": "#ffffff", "info_bg": "#2a2a2a", "separator": "#00ff88", "error_bg": "#8B0000", "button_active": "#404040", "accent": "#00ff88", "secondary": "#ff6600"},
     "Dark2": {"bg": "#0d1117", "fg": "#c9d1d9", "button_bg": "#21262d", "button_fg": "#f0f6fc", "info_bg": "#161b22", "separator": "#30d158", "error_bg": "#da3633", "button_active": "#30363d", "accent": "#30d158", "secondary": "#58a6ff"},
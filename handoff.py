@@ -0,0 +1,157 @@
+# handoff.py
+"""Übergabe von Ergebnissen aus Worker-Threads an den Tk-Hauptthread.
+
+Worker (Abfrage-Runden, Bild-Worker, Tray-Thread) rufen nur post() auf: das
+hängt den Callback an eine deque (append ist ohne Lock thread-sicher) und
+fasst Tk nicht an. Der Hauptthread leert die Schlange in pump():
+
+- Einträge mit gleichem key werden zusammengefasst, nur der neueste wird
+  ausgeführt (z.B. ein Ergebnis je Server, ein Teilergebnis je Abschnitt).
+- Ein stale()-Prädikat verwirft veraltete Ergebnisse, bevor sie Tk erreichen.
+
+So liegt auch bei Bursts höchstens ein after()-Timer in der Tcl-Queue.
+
+Takt: alle HANDOFF_PUMP_MS, solange etwas ansteht (Einträge in der Schlange,
+busy() - z.B. laufende Abfrage-Runden - oder bis HANDOFF_WAKE_HOLD_MS nach
+wake()). Sonst nur alle HANDOFF_IDLE_MS, im Tray (Fenster nicht sichtbar)
+alle HANDOFF_HIDDEN_MS. Worker können den Hauptthread nicht wecken (kein
+Tk-Aufruf aus Threads); wer im Hauptthread Arbeit anstößt, ruft wake() auf.
+Posts ohne vorheriges wake() (Tray-Menü, Breaker-Probe) warten also höchstens
+ein Leerlauf-Intervall.
+
+Tiefe der Schlange und Wartezeiten stehen in snapshot().
+"""
+import time
+from collections import deque
+
+import config
+
+
+class Handoff:
+    def __init__(self, root, interval_ms=None, idle_ms=None, hidden_ms=None):
+        self.root = root
+        self.interval_ms = interval_ms or config.HANDOFF_PUMP_MS
+        self.idle_ms = idle_ms or config.HANDOFF_IDLE_MS
+        self.hidden_ms = hidden_ms or config.HANDOFF_HIDDEN_MS
+        self.busy = None            # fn() -> True, solange Worker gleich posten
+        self._items = deque()       # (eingereiht, key, callback, stale)
+        self._job = None
+        self._due = 0.0             # perf_counter() des geplanten pump()
+        self._fast_until = 0.0      # bis dahin im schnellen Takt (wake())
+        self._stopped = False
+        self.stats = {
+            "pumps": 0,
+            "posted": 0,            # ohne Lock gezählt (Richtwert)
+            "delivered": 0,
+            "coalesced": 0,         # von neuerem Eintrag mit gleichem key ersetzt
+            "stale": 0,             # vor Tk verworfen (stale() war True)
+            "depth": 0,             # Einträge beim letzten pump()
+            "max_depth": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    # --- Worker-Seite (beliebiger Thread) ---
+    def post(self, callback, key=None, stale=None):
+        """Reiht callback für den Hauptthread ein. key: Einträge mit gleichem
+        key werden zusammengefasst; stale: fn() -> True, wenn der Eintrag
+        beim Ausführen nicht mehr gebraucht wird (läuft im Hauptthread)."""
+        if self._stopped:
+            return
+        self._items.append((time.perf_counter(), key, callback, stale))
+        self.stats["posted"] += 1
+
+    # --- Hauptthread ---
+    def start(self):
+        if self._job is None and not self._stopped:
+            self._schedule(self.interval_ms)
+        return self
+
+    def wake(self, hold_ms=None):
+        """Vor dem Anstoßen von Worker-Arbeit: schneller Takt für hold_ms
+        (Standard HANDOFF_WAKE_HOLD_MS), ein wartender Leerlauf-Timer wird
+        vorgezogen."""
+        if self._stopped:
+            return
+        now = time.perf_counter()
+        hold_ms = hold_ms or config.HANDOFF_WAKE_HOLD_MS
+        self._fast_until = max(self._fast_until, now + hold_ms / 1000.0)
+        if self._job is not None and self._due - now > self.interval_ms / 1000.0:
+            self.root.after_cancel(self._job)
+            self._schedule(self.interval_ms)
+
+    def stop(self):
+        self._stopped = True
+        self._items.clear()
+
+    def pump(self):
+        """Leert die Schlange (nur Hauptthread) und plant sich neu ein."""
+        self._job = None
+        self.stats["pumps"] += 1
+        depth = 0
+        try:
+            depth = self.drain()
+        finally:
+            if not self._stopped:
+                self._schedule(self._next_delay(depth))
+
+    def _schedule(self, delay_ms):
+        self._due = time.perf_counter() + delay_ms / 1000.0
+        self._job = self.root.after(delay_ms, self.pump)
+
+    def _next_delay(self, depth):
+        if depth or self._items or time.perf_counter() < self._fast_until:
+            return self.interval_ms
+        if self.busy is not None and self.busy():
+            return self.interval_ms
+        try:
+            viewable = self.root.winfo_viewable()
+        except Exception:
+            viewable = True
+        return self.idle_ms if viewable else self.hidden_ms
+
+    def drain(self):
+        """Führt die anstehenden Callbacks aus, gibt die Zahl der Einträge
+        zurück."""
+        stats = self.stats
+        depth = len(self._items)
+        stats["depth"] = depth
+        if not depth:
+            return 0
+        stats["max_depth"] = max(stats["max_depth"], depth)
+        batch = [self._items.popleft() for _ in range(depth)]
+        # Von hinten: der erste Eintrag je key ist der neueste.
+        seen = set()
+        keep = []
+        for item in reversed(batch):
+            key = item[1]
+            if key is not None:
+                if key in seen:
+                    stats["coalesced"] += 1
+                    continue
+                seen.add(key)
+            keep.append(item)
+        now = time.perf_counter()
+        for queued, _, callback, stale in reversed(keep):
+            wait_ms = (now - queued) * 1000.0
+            stats["wait_ms_total"] += wait_ms
+            stats["wait_ms_max"] = max(stats["wait_ms_max"], wait_ms)
+            if self._stopped:
+                return depth
+            if stale is not None and stale():
+                stats["stale"] += 1
+                continue
+            stats["delivered"] += 1
+            try:
+                callback()
+            except Exception as e:
+                print(f"Warning: UI callback failed: {e!r}")
+        return depth
+
+    def snapshot(self):
+        """Kopie der Zähler plus mittlere Wartezeit in ms."""
+        stats = dict(self.stats)
+        handled = stats["delivered"] + stats["stale"]
+        stats["wait_ms_avg"] = stats["wait_ms_total"] / handled if handled else 0.0
+        stats["pending"] = len(self._items)
+        return stats
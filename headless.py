@@ -0,0 +1,147 @@
+# headless.py
+"""QLView ohne Fenster: fragt Server im Takt ab und schreibt je Server und
+Runde eine JSON-Zeile (NDJSON) nach stdout oder in eine Datei.
+
+    python headless.py 91.198.152.211:27003 108.61.179.235:27962
+    python headless.py --favorites --interval 30 --output snapshots.ndjson
+    python headless.py --once
+
+Nutzt dieselbe Abfrage (ServerHandler.query_servers) und dasselbe Modell
+(PlayerRecord aus playerlist.py) wie die GUI, importiert aber weder tkinter
+noch PIL oder pystray.
+"""
+import argparse
+import json
+import sys
+import time
+
+import config
+import utils
+from server import ServerHandler
+
+
+class HeadlessApp:
+    """Das, was ServerHandler von der App braucht - ohne Fenster und Tray."""
+    root = None
+    ui = None
+    tray_icon = None
+    handoff = None
+
+    def __init__(self, addresses, interval):
+        self.app_config = utils.load_app_config()
+        self.favorites = utils.load_favorites()
+        self.SERVER_ADDRESS = addresses[0]
+        self.REFRESH_INTERVAL = interval
+        self.shutting_down = False
+
+
+def snapshot(result, stamp, ping_stats=None):
+    """Ergebnis-Dict einer Abfrage als JSON-taugliches Dict. ping_stats:
+    PingSampler.stats() des Servers (Verlust, Jitter, p95)."""
+    address = result["address"]
+    data = {
+        "time": stamp,
+        "address": "{}:{}".format(address[0], address[1]),
+        "ok": result["ok"],
+    }
+    if not result["ok"]:
+        data["error"] = result.get("msg")
+        data["server_down"] = result.get("server_down", False)
+        return data
+    data.update({
+        "server_name": utils.strip_quake_colors(result["server_name"]),
+        "map": result["map_name"],
+        "game": result["game"],
+        "player_count": result["player_count"],
+        "max_players": result["max_players"],
+        "ping_ms": result["ping_ms"],
+        "ping_stats": ping_stats,
+        "gamestate": result.get("gamestate") or None,
+        "elo": result.get("elo_info"),
+        "qlstats_status": result.get("qlstats_status"),
+        "own_elo": result.get("own_elo"),
+        "playing": [p.as_dict() for p in result.get("playing", ())],
+        "spectators": [p.as_dict() for p in result.get("spectators", ())],
+        "timing_ms": result["timing"]["total_ms"],
+    })
+    return data
+
+
+def _addresses(args, app_config):
+    """Adressen aus der Kommandozeile, den Favoriten (--favorites) bzw. dem
+    Hauptserver. Ungültige Einträge aus gespeicherten Einstellungen werden
+    wie im Dashboard übersprungen (mit Warnung); ungültige Argumente der
+    Kommandozeile lösen ValueError aus."""
+    raw = [(text, None) for text in args.servers]
+    if args.favorites:
+        favorites = utils.load_favorites()
+        raw += [(favorites.get(str(i), ""), "favorite {}".format(i)) for i in range(1, 8)]
+    if not raw:
+        raw = [(app_config.get("main_server_address", ""), "main server")]
+    addresses = []
+    for text, saved in raw:
+        try:
+            address = utils.parse_address(text.strip())
+        except ValueError as e:
+            if saved is None:
+                raise
+            print(f"Warning: Skipping {saved}: {e}", file=sys.stderr)
+            continue
+        if address[0] and address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QLView headless poller (NDJSON snapshots)")
+    parser.add_argument("servers", nargs="*", metavar="IP:PORT",
+                        help="Server (Standard: Hauptserver aus den Einstellungen)")
+    parser.add_argument("--favorites", action="store_true", help="zusätzlich alle Favoriten abfragen")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="Sekunden zwischen zwei Runden (Standard: Refresh-Intervall der Einstellungen)")
+    parser.add_argument("--once", action="store_true", help="nur eine Runde")
+    parser.add_argument("--output", "-o", default="-", help="Datei (wird angehängt) oder - für stdout")
+    args = parser.parse_args(argv)
+
+    app_config = utils.load_app_config()
+    try:
+        addresses = _addresses(args, app_config)
+    except ValueError as e:
+        parser.error(str(e))
+    if not addresses:
+        parser.error("no server address given")
+    interval = args.interval or app_config.get("refresh_interval", config.DEFAULT_REFRESH_INTERVAL)
+
+    app = HeadlessApp(addresses, interval)
+    handler = ServerHandler(app)
+    # Zwischen den Runden pingt der Sampler alle Server weiter.
+    handler.pinger.set_targets(addresses)
+    out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    # Warnungen und Timing-Logs (print) nach stderr, stdout bleibt reines NDJSON.
+    sys.stdout = sys.stderr
+    try:
+        while True:
+            started = time.monotonic()
+            results = handler.query_servers(addresses)
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+            for address in addresses:
+                data = snapshot(results[address], stamp, handler.pinger.stats(address))
+                out.write(json.dumps(data, ensure_ascii=False) + "\n")
+            out.flush()
+            if args.once:
+                break
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.shutting_down = True
+        handler.stop_refresh()
+        handler.engine.stop()
+        handler.http.close()
+        sys.stdout = sys.__stdout__
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
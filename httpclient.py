@@ -0,0 +1,173 @@
+# httpclient.py
+"""Kleiner HTTP(S)-Client mit Keep-Alive-Pool für die qlstats-Abfragen.
+
+Statt pro Call urllib.request.urlopen (DNS + TCP + TLS-Handshake jedes Mal)
+hält HttpPool je Host ein paar offene Verbindungen und verwendet sie wieder.
+Antworten werden gzip-komprimiert angefordert; liefert der Server ETag bzw.
+Last-Modified, fragt der nächste Call bedingt an und bekommt bei 304 das
+gemerkte Ergebnis.
+"""
+import gzip
+import http.client
+import json
+import socket
+import ssl
+import threading
+import urllib.parse
+
+import config
+import utils
+
+# Fehler, an denen man eine vom Server geschlossene Keep-Alive-Verbindung
+# erkennt -> einmal mit frischer Verbindung wiederholen. Bei HTTPS meldet sich
+# eine geschlossene Verbindung als SSLEOFError.
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError, ssl.SSLEOFError)
+
+
+class HttpPool:
+    def __init__(self, max_idle=None, user_agent=None):
+        self.max_idle = max_idle or config.HTTP_POOL_SIZE
+        self.user_agent = user_agent or config.APP_NAME
+        self._idle = {}         # (scheme, host, port) -> [Verbindung, ...]
+        self._lock = threading.Lock()
+        # url -> (etag, last_modified, daten) für bedingte Anfragen
+        self._validators = utils.LRUCache(config.HTTP_CONDITIONAL_CACHE)
+        self.stats = {
+            "requests": 0,
+            "connections": 0,       # neu aufgebaut (= Handshakes)
+            "reused": 0,            # erfolgreich wiederverwendet (= gesparte Handshakes)
+            "retries": 0,
+            "not_modified": 0,
+            "bytes_wire": 0,        # übertragen (ggf. komprimiert)
+            "bytes_body": 0,        # nach dem Entpacken
+        }
+
+    # --- Verbindungen ---
+    def _acquire(self, origin, timeout):
+        with self._lock:
+            idle = self._idle.get(origin)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            self.stats["connections"] += 1
+        scheme, host, port = origin
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def _release(self, origin, conn):
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+    # --- Anfragen ---
+    def get_json(self, url, timeout=None, task=None):
+        """GET url und JSON dekodieren. Mit task (QueryTask) wird die Verbindung
+        beim Abbruch der Runde sofort geschlossen."""
+        if task is not None and task.cancelled:
+            raise ConnectionAbortedError("query cancelled")
+        timeout = timeout or config.QLSTATS_TIMEOUT
+        parts = urllib.parse.urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+        }
+        with self._lock:
+            cached = self._validators.get(url)
+            self.stats["requests"] += 1
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        for attempt in range(2):
+            conn, reused = self._acquire(origin, timeout)
+            closer = lambda: _abort_connection(conn)
+            if task is not None:
+                task.add_closer(closer)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except _STALE_ERRORS:
+                conn.close()
+                if task is not None and task.cancelled:
+                    raise ConnectionAbortedError("query cancelled")
+                if reused and attempt == 0:
+                    with self._lock:
+                        self.stats["retries"] += 1
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            finally:
+                if task is not None:
+                    task.remove_closer(closer)
+            break
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(origin, conn)
+
+        with self._lock:
+            self.stats["bytes_wire"] += len(raw)
+            if reused:
+                self.stats["reused"] += 1
+        if resp.status == 304 and cached is not None:
+            with self._lock:
+                self.stats["not_modified"] += 1
+            return cached[2]
+        if resp.status != 200:
+            raise http.client.HTTPException("HTTP {} for {}".format(resp.status, url))
+
+        if resp.getheader("Content-Encoding", "").lower() == "gzip":
+            raw = gzip.decompress(raw)
+        data = json.loads(raw.decode("utf-8", "replace"))
+        etag, last_modified = resp.getheader("ETag"), resp.getheader("Last-Modified")
+        with self._lock:
+            self.stats["bytes_body"] += len(raw)
+            if etag or last_modified:
+                self._validators.put(url, (etag, last_modified, data))
+            else:
+                self._validators.discard(url)
+        return data
+
+    def snapshot(self):
+        """Kopie der Zähler (für Timing-Ausgaben)."""
+        with self._lock:
+            return dict(self.stats)
+
+
+def _abort_connection(conn):
+    """Bricht einen laufenden Request sofort ab (aus einem anderen Thread)."""
+    sock = conn.sock
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    conn.close()
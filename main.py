@@ -1,18 +1,56 @@
-﻿import tkinter as tk
+﻿import time
+_STARTUP_MARKS = [("start", time.perf_counter())]
+import tkinter as tk
 from tkinter import messagebox
 import os
-import pystray
-from PIL import Image, ImageTk 
+import sys
 import threading
+_STARTUP_MARKS.append(("import tkinter", time.perf_counter()))
+# pystray und PIL werden erst nach dem ersten Zeichnen geladen (setup_tray_icon,
+# Mapshots), webbrowser erst beim ersten Klick auf einen Namen.
 
 # Importe deiner lokalen Dateien
 import config
 import utils
 from ui import UIManager
 from server import ServerHandler
+from handoff import Handoff
+_STARTUP_MARKS.append(("import modules", time.perf_counter()))
+
+
+class StartupProfile:
+    """Zeitpunkte der Startphasen (python main.py --profile-startup). Der
+    Bericht geht nach dem ersten Ergebnis auf die Konsole und nach
+    STARTUP_PROFILE_FILE (die --noconsole-EXE hat keine Konsole)."""
+
+    def __init__(self, marks):
+        self.marks = list(marks)
+
+    def mark(self, phase):
+        if all(name != phase for name, _ in self.marks):
+            self.marks.append((phase, time.perf_counter()))
+
+    def report(self):
+        start = prev = self.marks[0][1]
+        lines = ["Startup profile (ms)      phase    total"]
+        for phase, t in self.marks[1:]:
+            lines.append("  {:<20} {:>8.1f} {:>8.1f}".format(phase, (t - prev) * 1000.0, (t - start) * 1000.0))
+            prev = t
+        loaded = [name for name in ("PIL", "pystray", "webbrowser") if name in sys.modules]
+        lines.append("  loaded at report: {}".format(", ".join(loaded) or "-"))
+        text = "\n".join(lines)
+        print(text)
+        try:
+            with open(config.STARTUP_PROFILE_FILE, "w") as f:
+                f.write(text + "\n")
+        except OSError as e:
+            print(f"Warning: Could not write startup profile: {e}")
+
 
 class QLViewApp:
-    def __init__(self):
+    def __init__(self, profile=None):
+        # Startprofil (nur mit --profile-startup), sonst None.
+        self.startup = profile
         # 1. Konfiguration laden und Variablen setzen
         self.app_config = utils.load_app_config()
         self.favorites = utils.load_favorites()
@@ -23,31 +61,50 @@ class QLViewApp:
         self.SERVER_ADDRESS = self.main_server_address_setting
         self.REFRESH_INTERVAL = self.app_config.get("refresh_interval", config.DEFAULT_REFRESH_INTERVAL)
         self.shutting_down = False
+        self._mark("config")
 
         # 2. Tkinter Fenster erstellen
         self.root = tk.Tk()
         self.root.title(config.APP_NAME)
         self.root.resizable(False, False)
+        self._mark("tk root")
         
+        # Das Icon wird ohne PIL gesetzt: unter Windows liest Tk die .ico
+        # selbst, sonst quake3.png (48x48, PNG kann Tk 8.6 nativ). Das Bild
+        # fuer den Tray folgt in setup_tray_icon.
+        self.icon_path = utils.resource_path("quake3.ico")
+        self.icon_image = None
         try:
-            icon_path = utils.resource_path("quake3.ico")
-            self.window_icon_photo = ImageTk.PhotoImage(Image.open(icon_path)) 
-            self.root.iconphoto(False, self.window_icon_photo)
+            if sys.platform == "win32":
+                self.root.iconbitmap(default=self.icon_path)
+            else:
+                self.window_icon_photo = tk.PhotoImage(file=utils.resource_path("quake3.png"))
+                self.root.iconphoto(False, self.window_icon_photo)
         except Exception as e:
             print(f"Warning: Could not set window icon: {e}")
+        self._mark("window icon")
 
-        # 3. Komponenten initialisieren
-        self.ui = UIManager(self)
-        
+        # Einzige Uebergabe von Worker-/Tray-Threads an den Tk-Hauptthread.
+        self.handoff = Handoff(self.root).start()
+
+        # 3. Erste Abfrage sofort starten: sie laeuft im Runden-Pool, waehrend
+        # die UI aufgebaut wird. Ergebnisse kommen ueber handoff erst in der
+        # mainloop, also nach setup_ui, an.
         # ServerHandler MUSS VOR setup_tray_icon initialisiert werden
         self.server_handler = ServerHandler(self) 
-        
-        self.tray_icon = None
-        self.setup_tray_icon()
-        
-        # 4. UI aufbauen und erste Aktualisierung starten
-        self.ui.setup_ui()
+        # Solange eine Runde laeuft, leert handoff im schnellen Takt.
+        self.handoff.busy = lambda: self.server_handler.in_flight_queries > 0
         self.server_handler.fetch_server_info()
+        self._mark("first query started")
+
+        # 4. UI aufbauen
+        self.ui = UIManager(self)
+        self.ui.setup_ui()
+        self._mark("ui built")
+
+        # Tray-Icon (pystray, PIL) erst nach dem ersten Zeichnen.
+        self.tray_icon = None
+        self.root.after_idle(self._after_first_paint)
         
         # 5. Wichtige Bindings (Minimierung und Schließen)
         self.root.bind('<Unmap>', self.hide_window_on_minimize)
@@ -64,6 +121,29 @@ class QLViewApp:
         finally:
             self.cleanup() 
 
+    def _mark(self, phase):
+        if self.startup is not None:
+            self.startup.mark(phase)
+
+    def startup_done(self):
+        """Vom ServerHandler nach dem ersten angezeigten Ergebnis aufgerufen."""
+        if self.startup is not None:
+            self.startup.mark("first result")
+            self.startup.report()
+            self.startup = None
+
+    def _after_first_paint(self):
+        self.root.update_idletasks()
+        self._mark("first paint")
+        self.setup_tray_icon()
+        self._mark("tray icon")
+
+    def _load_icon_image(self):
+        if self.icon_image is None:
+            from PIL import Image
+            self.icon_image = Image.open(self.icon_path)
+        return self.icon_image
+
     def hide_window_on_minimize(self, event):
         if event.widget == self.root:
             self.root.withdraw()
@@ -72,17 +152,17 @@ class QLViewApp:
 
     def setup_tray_icon(self):
         try:
-            icon_path = utils.resource_path("quake3.ico")
-            icon_image = Image.open(icon_path)
+            import pystray
+            icon_image = self._load_icon_image()
 
             # WICHTIG: pystray-Menü-Callbacks laufen im Tray-Thread, NICHT im
             # Tkinter-Hauptthread. Direkte Tk-Aufrufe von dort (withdraw,
             # deiconify, StringVar.set, messagebox, after_cancel) sind nicht
             # thread-sicher und können sporadische Hänger/Abstürze verursachen.
-            # Deshalb wird jede Aktion über root.after(0, ...) in den Hauptthread
-            # eingereiht.
-            def on_main(func):
-                return lambda icon=None, item=None: self.root.after(0, func)
+            # Deshalb wird jede Aktion über self.handoff in den Hauptthread
+            # eingereiht (der Tray-Thread ruft selbst kein Tk auf).
+            def on_main(func, key=None):
+                return lambda icon=None, item=None: self.handoff.post(func, key)
 
             self.tray_icon = pystray.Icon(
                 'Quake Server Viewer', 
@@ -90,7 +170,7 @@ class QLViewApp:
                 title=config.APP_NAME,
                 menu=pystray.Menu(
                     pystray.MenuItem('Show/Hide', on_main(self.toggle_window_main), default=True), 
-                    pystray.MenuItem('Refresh', on_main(self.server_handler.manual_refresh)),
+                    pystray.MenuItem('Refresh', on_main(self.server_handler.manual_refresh, ('tray', 'refresh'))),
                     pystray.MenuItem('Connect', on_main(self.connect_to_server)),
                     pystray.Menu.SEPARATOR,
                     pystray.MenuItem('Exit', on_main(self.cleanup))
@@ -114,6 +194,9 @@ class QLViewApp:
             self.root.deiconify() 
             self.root.lift()
             self.root.focus_force()
+            # Lief im Tray nur die sparsame Abfrage -> jetzt sofort komplett.
+            if hasattr(self, 'server_handler') and self.server_handler:
+                self.server_handler.on_window_shown()
 
     # --- WICHTIGE HINTERGRUND-METHODEN (CLEANUP) ---
     
@@ -126,6 +209,8 @@ class QLViewApp:
         # 1. Timer stoppen
         if hasattr(self, 'server_handler') and self.server_handler:
             self.server_handler.stop_refresh() 
+        if hasattr(self, 'handoff'):
+            self.handoff.stop()
 
         # 2. Tray-Icon stoppen
         if self.tray_icon:
@@ -154,7 +239,9 @@ class QLViewApp:
                     self.app_config["main_server_address"] = f"{new_address[0]}:{new_address[1]}"
                     utils.save_app_config(self)
                 
-                self.server_handler.manual_refresh()
+                # Dashboard-Modus: sofort aus dem Cache anzeigen, ohne Abfrage.
+                if not self.server_handler.show_cached(new_address):
+                    self.server_handler.manual_refresh()
                 self.show_window_from_tray()
                 
             except ValueError as e:
@@ -173,5 +260,6 @@ class QLViewApp:
 
 # Wenn main.py direkt ausgeführt wird, starte die App
 if __name__ == "__main__":
-    app = QLViewApp()
+    profile = StartupProfile(_STARTUP_MARKS) if "--profile-startup" in sys.argv[1:] else None
+    app = QLViewApp(profile)
     app.run()
\ No newline at end of file
@@ -0,0 +1,166 @@
+# mapshots.py
+"""Index des Mapshot-Ordners und persistenter Thumbnail-Cache.
+
+MapshotIndex liest MAPSHOTS_DIR einmal ein (Mapname -> Datei, mtime), hält
+den Index per Watcher-Thread aktuell und legt für jeden Mapshot einmalig ein
+fertig skaliertes Thumbnail (MAPSHOT_SIZE) in MAPSHOT_THUMB_DIR ab. Danach
+kostet ein Mapwechsel nur noch das Dekodieren eines kleinen Bildes.
+
+Dekodiert wird nie im Tk-Thread: submit() reicht Jobs an einen eigenen
+Bild-Worker, der fertige RGB-Puffer (size, bytes) liefert. Der Tk-Thread
+baut daraus nur noch das PhotoImage. PIL wird erst im Bild-Worker bzw.
+Scan-Thread importiert und hält so den Programmstart nicht auf.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+
+# Reihenfolge = Priorität, falls es mehrere Dateien zu einer Map gibt.
+MAPSHOT_EXTENSIONS = (".png", ".jpg", ".jpeg")
+# Nur Dateien mit dieser Endung räumt build_thumbnails() weg und rescan()
+# überspringt sie, auch wenn MAPSHOT_THUMB_DIR auf den Mapshot-Ordner zeigt.
+THUMB_SUFFIX = ".thumb.jpg"
+
+
+class MapshotIndex:
+    def __init__(self, directory=None, thumb_dir=None, size=None):
+        self.directory = directory or config.MAPSHOTS_DIR
+        self.thumb_dir = thumb_dir or config.MAPSHOT_THUMB_DIR
+        self.size = tuple(size or config.MAPSHOT_SIZE)
+        self._entries = {}          # Mapname (casefold) -> (Pfad, mtime_ns)
+        self.ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+
+    # --- Lebenszyklus ---
+    def start(self):
+        """Startet Scan, Thumbnail-Aufbau und Watcher im Hintergrund."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="qlview-mapshots", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self):
+        self.rescan()
+        self.ready.set()
+        self.build_thumbnails()
+        while not self._stop.wait(config.MAPSHOT_WATCH_INTERVAL):
+            if self.rescan():
+                self.build_thumbnails()
+
+    # --- Index ---
+    def rescan(self):
+        """Liest den Ordner neu ein. True, wenn sich etwas geändert hat.
+        Mapnamen ohne Groß-/Kleinschreibung, wie os.path.exists unter Windows."""
+        entries = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    stem, ext = os.path.splitext(entry.name)
+                    stem, ext = stem.casefold(), ext.lower()
+                    if ext not in MAPSHOT_EXTENSIONS or entry.name.endswith(THUMB_SUFFIX) or not entry.is_file():
+                        continue
+                    prio = MAPSHOT_EXTENSIONS.index(ext)
+                    known = entries.get(stem)
+                    if known is not None and known[2] <= prio:
+                        continue
+                    entries[stem] = (entry.path, entry.stat().st_mtime_ns, prio)
+        except OSError:
+            entries = {}
+        entries = {name: (path, mtime) for name, (path, mtime, _) in entries.items()}
+        changed = entries != self._entries
+        self._entries = entries     # atomarer Tausch, Leser brauchen kein Lock
+        return changed
+
+    def lookup(self, map_name):
+        """(Pfad, mtime) des Mapshots oder (None, None). Solange der erste Scan
+        läuft, wird direkt im Ordner nachgesehen."""
+        if self.ready.is_set():
+            return self._entries.get(map_name.casefold(), (None, None))
+        for ext in MAPSHOT_EXTENSIONS:
+            path = os.path.join(self.directory, map_name + ext)
+            try:
+                return path, os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return None, None
+
+    def __len__(self):
+        return len(self._entries)
+
+    # --- Thumbnails ---
+    def _thumb_path(self, map_name, mtime):
+        return os.path.join(self.thumb_dir, "{}-{}{}".format(map_name.casefold(), mtime, THUMB_SUFFIX))
+
+    def build_thumbnails(self):
+        """Erzeugt fehlende Thumbnails und räumt veraltete weg."""
+        entries = self._entries
+        wanted = {os.path.basename(self._thumb_path(name, mtime)) for name, (_, mtime) in entries.items()}
+        for name, (path, mtime) in entries.items():
+            if self._stop.is_set():
+                return
+            if not os.path.exists(self._thumb_path(name, mtime)):
+                try:
+                    self._make_thumbnail(name, path, mtime)
+                except Exception as e:
+                    print(f"Warning: Could not build thumbnail for '{path}': {e}")
+        try:
+            for file_name in os.listdir(self.thumb_dir):
+                if file_name.endswith(THUMB_SUFFIX) and file_name not in wanted:
+                    os.remove(os.path.join(self.thumb_dir, file_name))
+        except OSError:
+            pass
+
+    def _decode_resized(self, path):
+        from PIL import Image
+        with Image.open(path) as img:
+            # JPEG: schon beim Dekodieren verkleinern (1/2, 1/4, 1/8).
+            if img.format == "JPEG":
+                img.draft("RGB", self.size)
+            return img.convert("RGB").resize(self.size, Image.Resampling.LANCZOS)
+
+    def _make_thumbnail(self, map_name, path, mtime):
+        thumb = self._decode_resized(path)
+        os.makedirs(self.thumb_dir, exist_ok=True)
+        target = self._thumb_path(map_name, mtime)
+        tmp = "{}.{}.tmp".format(target, threading.get_ident())
+        thumb.save(tmp, "JPEG", quality=92)
+        os.replace(tmp, target)
+        return thumb
+
+    def load(self, map_name, path, mtime):
+        """Fertig skaliertes RGB-Bild des Mapshots. Nutzt das Thumbnail, wenn
+        vorhanden, und legt es sonst sofort an."""
+        from PIL import Image
+        thumb_path = self._thumb_path(map_name, mtime)
+        try:
+            with Image.open(thumb_path) as img:
+                img.load()
+                return img.convert("RGB")
+        except (OSError, ValueError):
+            return self._make_thumbnail(map_name, path, mtime)
+
+    # --- Bild-Worker ---
+    def submit(self, fn, *args):
+        """Führt fn(*args) im Bild-Worker aus (ein Thread, FIFO) -> Future."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qlview-img")
+        return self._executor.submit(fn, *args)
+
+    def load_rgb(self, map_name, path, mtime):
+        """Wie load(), aber als RGB-Puffer (size, bytes) für den Tk-Thread."""
+        img = self.load(map_name, path, mtime)
+        return img.size, img.tobytes()
+
+    def decode_rgb(self, path):
+        """Beliebige Bilddatei auf MAPSHOT_SIZE skaliert als (size, bytes)."""
+        img = self._decode_resized(path)
+        return img.size, img.tobytes()
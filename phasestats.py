@@ -0,0 +1,146 @@
+# phasestats.py
+"""Laufzeit jeder Aktualisierung, aufgeteilt nach Phasen, je Server.
+
+Eine Abfrage-Runde liefert je Server die Dauer der einzelnen Calls (info,
+ping, players, rules, qlstats, own_elo) und die Gesamtdauer (total); der
+Tk-Hauptthread ergänzt apply (Ergebnis zeichnen) und layout (bis die danach
+anstehenden Idle-Tasks - Geometrie, Neuzeichnen - erledigt sind).
+
+Je Server und Phase hält ein PhaseRing die letzten PHASE_STATS_WINDOW Werte
+(array('d') plus Status als array('b')), stats() liefert daraus p50/p95/max
+und die Zahl der Fehler und Timeouts im Fenster.
+
+Gemessen wird nur, solange ServerHandler.phase_stats gesetzt ist (Config
+PHASE_STATS oder das Debug-Fenster, DEBUG_OVERLAY_KEY); sonst prüfen die
+Aufrufer nur auf None. Optional geht je Messung eine Zeile in eine rotierende
+Logdatei (PHASE_LOG_FILE).
+"""
+import math
+import socket
+import threading
+from array import array
+
+import config
+
+PHASES = ("info", "ping", "players", "rules", "qlstats", "own_elo", "total", "apply", "layout")
+
+# SKIPPED: Call hat nichts abgefragt (Backoff, Cache, keine SteamID) und wird
+# nicht gezählt, damit Beinahe-0-ms-Werte p50/p95 nicht verfälschen.
+OK, ERROR, TIMEOUT, SKIPPED = 0, 1, 2, 3
+_FLAGS = {OK: "", ERROR: "!err", TIMEOUT: "!timeout"}
+
+
+def outcome_status(ok, value):
+    """Status eines (ok, wert_oder_exception, ms)-Call-Ergebnisses."""
+    if ok:
+        return OK
+    return TIMEOUT if isinstance(value, socket.timeout) else ERROR
+
+
+def _percentile(ranked, p):
+    return ranked[max(0, math.ceil(p / 100.0 * len(ranked)) - 1)]
+
+
+class PhaseRing:
+    """Ringpuffer der letzten Laufzeiten (ms) einer Phase samt Status."""
+    __slots__ = ("_ms", "_status", "_pos", "count")
+
+    def __init__(self, capacity):
+        self._ms = array("d", [0.0]) * capacity
+        self._status = array("b", [OK]) * capacity
+        self._pos = 0
+        self.count = 0              # gespeicherte Werte (<= capacity)
+
+    def add(self, ms, status=OK):
+        self._ms[self._pos] = ms
+        self._status[self._pos] = status
+        self._pos = (self._pos + 1) % len(self._ms)
+        if self.count < len(self._ms):
+            self.count += 1
+
+    def stats(self):
+        """n, p50/p95/max in ms sowie errors/timeouts im Fenster, None ohne Werte.
+        Die Reihenfolge spielt keine Rolle, daher kein Umsortieren nach Zeit."""
+        if not self.count:
+            return None
+        ranked = sorted(self._ms[:self.count])
+        status = self._status[:self.count]
+        return {"n": self.count, "p50": _percentile(ranked, 50), "p95": _percentile(ranked, 95),
+                "max": ranked[-1], "errors": status.count(ERROR), "timeouts": status.count(TIMEOUT)}
+
+
+class PhaseStats:
+    def __init__(self, window=None, log_file=None):
+        self.window = window or config.PHASE_STATS_WINDOW
+        self._rings = {}            # (address, phase) -> PhaseRing
+        self._lock = threading.Lock()
+        self._log = None
+        log_file = log_file if log_file is not None else config.PHASE_LOG_FILE
+        if log_file:
+            self._log = self._open_log(log_file)
+
+    @staticmethod
+    def _open_log(path):
+        # logging nur laden, wenn wirklich geloggt wird.
+        import logging
+        from logging.handlers import RotatingFileHandler
+        try:
+            handler = RotatingFileHandler(path, maxBytes=config.PHASE_LOG_MAX_BYTES,
+                                          backupCount=config.PHASE_LOG_BACKUPS, encoding="utf-8")
+        except OSError as e:
+            print(f"Warning: Could not open phase log '{path}': {e}")
+            return None
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger = logging.getLogger("qlview.phases")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.handlers[:] = [handler]
+        return logger
+
+    def record(self, address, phases):
+        """phases: {phase: (ms, status)} einer Messung von address (beliebiger
+        Thread)."""
+        address = tuple(address)
+        with self._lock:
+            for phase, (ms, status) in phases.items():
+                ring = self._rings.get((address, phase))
+                if ring is None:
+                    ring = self._rings[(address, phase)] = PhaseRing(self.window)
+                ring.add(ms, status)
+        if self._log is not None:
+            self._log.info("%s:%s %s", address[0], address[1], " ".join(
+                "{}={:.0f}{}".format(phase, ms, _FLAGS[status]) for phase, (ms, status) in phases.items()))
+
+    def servers(self):
+        with self._lock:
+            return list(dict.fromkeys(address for address, _ in self._rings))
+
+    def stats(self, address):
+        """{phase: stats} für address in PHASES-Reihenfolge (nur gemessene)."""
+        address = tuple(address)
+        with self._lock:
+            rings = {phase: self._rings.get((address, phase)) for phase in PHASES}
+            return {phase: ring.stats() for phase, ring in rings.items() if ring is not None}
+
+    def report(self, addresses=None):
+        """Textübersicht (feste Breite) je Server: n, p50/p95/max in ms,
+        Fehler und Timeouts je Phase. addresses: Reihenfolge (Standard: alle)."""
+        lines = []
+        for address in addresses or self.servers():
+            stats = self.stats(address)
+            if not stats:
+                continue
+            if lines:
+                lines.append("")
+            lines.append("{}:{}".format(*address))
+            lines.append("{:<8} {:>4} {:>6} {:>6} {:>6} {:>4} {:>4}".format("phase", "n", "p50", "p95", "max", "err", "t/o"))
+            for phase, st in stats.items():
+                lines.append("{:<8} {n:>4} {p50:>6.0f} {p95:>6.0f} {max:>6.0f} {errors:>4} {timeouts:>4}".format(phase, **st))
+        return "\n".join(lines) or "No refresh measured yet."
+
+    def close(self):
+        if self._log is not None:
+            for handler in self._log.handlers:
+                handler.close()
+            self._log.handlers[:] = []
+            self._log = None
@@ -0,0 +1,147 @@
+# pingsampler.py
+"""Dauerhafte Ping-Messung im Hintergrund.
+
+PingSampler schickt im festen Takt (PING_SAMPLE_INTERVAL) getchallenge-Pakete
+an den aktuellen Server (optional auch an alle Favoriten) über die UdpEngine.
+Mit socket_index (ServerHandler: ein eigener Socket der Engine außerhalb des
+Pools, UdpEngine.dedicated_sockets) laufen alle Samples über diesen einen
+Socket und teilen ihn nicht mit A2S und den Pings der Refreshs. Die Engine
+hält je Socket und Server nur eine Probe offen und verwirft späte Antworten.
+Die RTTs landen je Server in einem PingRing: einem Ringpuffer
+fester Größe auf array('d'), verlorene Pakete als NaN. Der Speicher pro
+Server bleibt damit konstant, egal wie lange gemessen wird.
+
+Kein tkinter-Import: läuft in einem eigenen Thread, die UI liest nur stats().
+"""
+import math
+import threading
+from array import array
+
+import config
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+SPARK_LOST = "·"
+
+
+class PingRing:
+    """Ringpuffer für RTT-Samples in ms (NaN = keine Antwort)."""
+    __slots__ = ("_buf", "_pos", "count")
+
+    def __init__(self, capacity):
+        self._buf = array("d", [math.nan]) * capacity
+        self._pos = 0
+        self.count = 0              # gespeicherte Samples (<= capacity)
+
+    def add(self, ms):
+        self._buf[self._pos] = math.nan if ms is None else ms
+        self._pos = (self._pos + 1) % len(self._buf)
+        if self.count < len(self._buf):
+            self.count += 1
+
+    def values(self):
+        """Samples in zeitlicher Reihenfolge (älteste zuerst)."""
+        if self.count < len(self._buf):
+            return self._buf[:self.count].tolist()
+        return (self._buf[self._pos:] + self._buf[:self._pos]).tolist()
+
+    def stats(self):
+        """min/avg/p95/jitter in ms und loss in Prozent, None ohne Samples.
+        jitter = mittlere Differenz aufeinanderfolgender Antworten."""
+        if not self.count:
+            return None
+        samples = self.values()
+        ok = [ms for ms in samples if ms == ms]
+        stats = {"sent": len(samples), "loss": 100.0 * (len(samples) - len(ok)) / len(samples),
+                 "last": samples[-1] if samples[-1] == samples[-1] else None,
+                 "min": None, "avg": None, "p95": None, "jitter": None}
+        if ok:
+            ranked = sorted(ok)
+            stats["min"] = ranked[0]
+            stats["avg"] = sum(ok) / len(ok)
+            stats["p95"] = ranked[max(0, math.ceil(0.95 * len(ranked)) - 1)]
+            if len(ok) > 1:
+                stats["jitter"] = sum(abs(b - a) for a, b in zip(ok, ok[1:])) / (len(ok) - 1)
+            else:
+                stats["jitter"] = 0.0
+        return stats
+
+    def sparkline(self, width):
+        """Die letzten `width` Samples als Blockzeichen, skaliert auf min..max."""
+        samples = self.values()[-width:]
+        ok = [ms for ms in samples if ms == ms]
+        if not ok:
+            return SPARK_LOST * len(samples)
+        lo, hi = min(ok), max(ok)
+        span = (hi - lo) or 1.0
+        top = len(SPARK_CHARS) - 1
+        return "".join(SPARK_CHARS[int(round((ms - lo) / span * top))] if ms == ms else SPARK_LOST
+                       for ms in samples)
+
+
+class PingSampler:
+    def __init__(self, engine, interval=None, window=None, timeout=None, socket_index=None):
+        self.engine = engine
+        self.interval = interval or config.PING_SAMPLE_INTERVAL
+        self.window = window or config.PING_SAMPLE_WINDOW
+        self.timeout = min(timeout or config.PING_SAMPLE_TIMEOUT, self.interval)
+        self.socket_index = socket_index
+        self._rings = {}            # address -> PingRing
+        self._targets = ()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- Lebenszyklus ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="qlview-ping", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def set_targets(self, addresses):
+        """Legt fest, welche Server gepingt werden. Ringe anderer Server
+        werden verworfen."""
+        targets = tuple(dict.fromkeys(tuple(a) for a in addresses if a and a[0]))
+        with self._lock:
+            self._targets = targets
+            for address in list(self._rings):
+                if address not in targets:
+                    del self._rings[address]
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                targets = self._targets
+            for address in targets:
+                try:
+                    fut = self.engine.submit(self.engine.ping(address, self.timeout, self.socket_index))
+                except RuntimeError:
+                    return          # Engine ist schon gestoppt
+                fut.add_done_callback(lambda f, address=address: self._record(address, f))
+            self._stop.wait(self.interval)
+
+    def _record(self, address, fut):
+        ms = None
+        if not fut.cancelled() and fut.exception() is None:
+            ms = fut.result()
+        with self._lock:
+            if address not in self._targets:
+                return
+            ring = self._rings.get(address)
+            if ring is None:
+                ring = self._rings[address] = PingRing(self.window)
+            ring.add(ms)
+
+    # --- Auswertung ---
+    def stats(self, address):
+        with self._lock:
+            ring = self._rings.get(tuple(address))
+            return ring.stats() if ring is not None else None
+
+    def sparkline(self, address, width=None):
+        with self._lock:
+            ring = self._rings.get(tuple(address))
+            return ring.sparkline(width or config.PING_SPARKLINE_WIDTH) if ring is not None else ""
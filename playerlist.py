@@ -0,0 +1,108 @@
+# playerlist.py
+"""Spielerliste als fertiges Modell: A2S-Spieler und qlstats-Daten werden
+einmal pro Aktualisierung im Worker-Thread zusammengeführt, klassifiziert
+und sortiert. Die UI zeichnet nur noch (siehe UIManager.update_player_list).
+
+Kein tkinter-Import: wird im Worker-Thread benutzt.
+"""
+import config
+import utils
+
+
+class PlayerRecord:
+    """Ein Spieler mit allen Daten, die die Spielerliste braucht."""
+    __slots__ = ("name", "key", "runs", "score", "duration", "team", "elo",
+                 "steamid", "is_spec", "is_ghost")
+
+    def __init__(self, name, key, runs, score, duration, team=None, elo=None,
+                 steamid=None, is_spec=False, is_ghost=False):
+        self.name = name
+        self.key = key              # normalize_name(name), Schlüssel für qlstats
+        self.runs = runs            # ((Farbcode, Text), ...) des Anzeigenamens
+        self.score = score
+        self.duration = duration
+        self.team = team            # qlstats-Team oder None
+        self.elo = elo
+        self.steamid = steamid      # None bei Bots und ohne qlstats
+        self.is_spec = is_spec
+        self.is_ghost = is_ghost
+
+    def __repr__(self):
+        return "PlayerRecord({!r}, score={}, team={}, elo={}, spec={})".format(
+            self.name, self.score, self.team, self.elo, self.is_spec)
+
+    def as_dict(self):
+        """JSON-taugliche Form (headless.py)."""
+        return {
+            "name": self.name,
+            "clean_name": utils.strip_quake_colors(self.name),
+            "score": self.score,
+            "duration": round(self.duration, 1),
+            "team": self.team,
+            "elo": self.elo,
+            "steamid": self.steamid,
+            "spectator": self.is_spec,
+        }
+
+
+def build_player_list(players, elo_by_name=None, steamid_by_name=None, team_by_name=None):
+    """Führt A2S-Spieler und qlstats-Daten zusammen.
+
+    Gibt (playing, spectators) als Listen von PlayerRecord zurück: Aktive nach
+    Team (1=rot, 2=blau, dann Rest), innerhalb nach Score; Spectators nach
+    Spielzeit. Ghost-Player tauchen in keiner der Listen auf."""
+    elo_by_name = elo_by_name or {}
+    steamid_by_name = steamid_by_name or {}
+    team_by_name = team_by_name or {}
+    # Ohne qlstats-Daten wird gar nicht gefiltert.
+    has_qlstats = bool(steamid_by_name)
+
+    playing = []
+    spectators = []
+    for p in players:
+        name = p.name or ""
+        key = utils.normalize_name(name)
+        is_bot = name in config.BOT_NAMES
+        team = team_by_name.get(key)
+
+        # Ghost-Player: QL haelt manchmal Karteileichen in der Liste (Score 0,
+        # seit >1h "verbunden"). Ein echter (auch stundenlanger) Spectator ist
+        # von qlstats getrackt und hat eine SteamID -> nur qlstats-UNBEKANNTE
+        # Score-0-Leichen fliegen raus.
+        is_ghost = (not is_bot and has_qlstats and key not in steamid_by_name
+                    and p.score <= 0 and p.duration >= 3600)
+
+        # Spectator-Erkennung ueber das qlstats-Team (zuverlaessig; der
+        # A2S-Score ist bei QL unbrauchbar). team -1 oder >=3 = Spectator,
+        # 0/1/2 = aktiv. Ohne qlstats-Daten Fallback auf A2S-Score < 0.
+        if is_bot:
+            is_spec = True
+        elif team is not None:
+            is_spec = team < 0 or team >= 3
+        else:
+            is_spec = p.score < 0
+
+        display_name = utils.truncate_text(name or "(anon)", config.MAX_PLAYER_NAME_CHARS)
+        record = PlayerRecord(
+            name, key, utils.color_runs(display_name), p.score, p.duration,
+            team=team, elo=elo_by_name.get(key),
+            steamid=None if is_bot else steamid_by_name.get(key),
+            is_spec=is_spec, is_ghost=is_ghost,
+        )
+        if not is_ghost:
+            (spectators if is_spec else playing).append(record)
+
+    spectators.sort(key=lambda r: r.duration, reverse=True)
+    playing.sort(key=lambda r: (r.team if r.team is not None else 99, -r.score))
+    return playing, spectators
+
+
+def list_fingerprint(playing, spectators):
+    """(Struktur, Zeiten) einer fertigen Liste. Die Struktur umfasst alles
+    außer den Spielzeiten; die Zeiten sind die angezeigten Texte (Minuten).
+    Gleiche Struktur -> die UI muss nur die Zeit-Spalte nachziehen."""
+    rows = playing + spectators
+    structure = (len(playing),) + tuple(
+        (r.name, r.score, r.team, r.elo, r.steamid) for r in rows)
+    times = tuple(utils.format_seconds(r.duration) for r in rows)
+    return structure, times
@@ -1,75 +1,238 @@
 # server.py
-import a2s
+import asyncio
 import socket
 import time
 import threading
-import json
-import urllib.request
-import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 import config
 import utils
+from udp_engine import UdpEngine
+from httpclient import HttpPool
+from playerlist import build_player_list, list_fingerprint
+from pingsampler import PingSampler
+from phasestats import PhaseStats, outcome_status, OK as PHASE_OK, TIMEOUT as PHASE_TIMEOUT, SKIPPED as PHASE_SKIPPED
+
+_MISSING = object()
+
+
+class QueryTask:
+    """Eine laufende Abfrage-Runde. cancel() bricht alle noch offenen Calls
+    ab: Engine-Futures werden gecancelt (Socket-Eintraege sofort frei),
+    laufende HTTP-Antworten geschlossen, wartende Runden gar nicht erst
+    gestartet."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cancelled = False
+        self._futures = []
+        self._closers = set()
+        # address -> Round-Trip-Zaehler der A2S-Calls (siehe UdpEngine.info)
+        self.a2s_traces = {}
+        # (address, "qlstats") bzw. "own_elo" -> {"status": ...} der HTTP-Calls.
+        # Die Fetcher fangen ihre Fehler selbst ab; der Status (phasestats)
+        # sagt, ob sie uebersprungen, fehlgeschlagen oder zu langsam waren.
+        self.http_traces = {}
+
+    def add_future(self, fut):
+        with self._lock:
+            if not self.cancelled:
+                self._futures.append(fut)
+                return fut
+        fut.cancel()
+        return fut
+
+    def add_closer(self, closer):
+        with self._lock:
+            if not self.cancelled:
+                self._closers.add(closer)
+                return
+        closer()
+
+    def remove_closer(self, closer):
+        with self._lock:
+            self._closers.discard(closer)
+
+    def cancel(self):
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            futures, closers = self._futures, list(self._closers)
+            self._futures, self._closers = [], set()
+        for fut in futures:
+            fut.cancel()
+        for closer in closers:
+            try:
+                closer()
+            except Exception:
+                pass
+
+
+class ServerDown(Exception):
+    """Circuit Breaker offen: der Server gilt als down, statt der vollen
+    Abfrage gibt es nur noch getchallenge-Proben."""
+
+
+class _Breaker:
+    """Circuit Breaker eines Servers. Nach BREAKER_THRESHOLD Fehlschlaegen
+    in Folge offen; dann wird nur noch nach Backoff-Plan geprobt (eigene
+    Task in der UDP-Engine, unabhaengig von den Abfrage-Runden)."""
+    __slots__ = ("failures", "open", "backoff", "prober")
+
+    def __init__(self):
+        self.failures = 0
+        self.open = False
+        self.backoff = utils.Backoff(*config.BREAKER_PROBE_BACKOFF)
+        self.prober = None          # Future der laufenden Proben-Task
+
+
+class _QlstatsState:
+    """qlstats-Status eines Servers fuer den Negativ-Cache."""
+    __slots__ = ("tracked", "untracked", "backoff")
+
+    def __init__(self):
+        self.tracked = False        # hat schon einmal Daten geliefert
+        self.untracked = False      # letzter Fehlschlag: nicht getrackt
+        self.backoff = utils.Backoff(*config.QLSTATS_ERROR_BACKOFF)
 
 
 class ServerHandler:
     def __init__(self, app):
         self.app = app
         self.refresh_job = None
+        # Zustand, nach dem die naechste Abfrage geplant wurde (siehe
+        # _refresh_state): active, visible, empty oder hidden.
+        self.refresh_state = None
         self._current_query = 0  # ignoriert veraltete Antworten
+        # A2S und Ping laufen ueber die gemeinsame asyncio-UDP-Engine (ein
+        # Thread fuer alle Abfragen), die blockierenden HTTP-Calls (qlstats,
+        # eigene ELO) ueber einen kleinen Pool. Der PingSampler bekommt einen
+        # eigenen Socket ausserhalb des Pools.
+        self.engine = UdpEngine(sockets=config.UDP_SOCKETS, dedicated=1).start()
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.QUERY_WORKERS, thread_name_prefix="qlview-query"
+        )
+        # Ganze Abfrage-Runden laufen in einem festen, kleinen Pool statt in
+        # einem neuen Thread pro Aktualisierung. Eine neue Runde bricht die
+        # vorige (QueryTask.cancel) ab.
+        self._round_executor = ThreadPoolExecutor(
+            max_workers=config.ROUND_WORKERS, thread_name_prefix="qlview-round"
+        )
+        # Gemeinsamer Keep-Alive-Pool fuer alle qlstats-Anfragen.
+        self.http = HttpPool()
+        # Negativ-Cache/Backoff je Server fuer qlstats (address -> _QlstatsState).
+        self._qlstats = {}
+        self._qlstats_lock = threading.Lock()
+        # Circuit Breaker je Server (address -> _Breaker).
+        self._breakers = {}
+        self._breaker_lock = threading.Lock()
+        self._task = None
+        self._rounds = set()   # noch nicht abgeschlossene Runden-Futures
+        self.last_timing = None
+        # Dashboard-Modus: letztes Ergebnis je Server (address -> result).
+        self.result_cache = {}
+        # Fingerprints der gerade angezeigten UI-Teile (nur Hauptthread):
+        # unveraenderte Teile werden nicht erneut an Tk gegeben.
+        self._shown = {}
+        self._layout_dirty = True
+        self.render_stats = {"results": 0, "list_skipped": 0, "list_times_only": 0, "sections_skipped": 0}
+        # Letzte qlstats-Antwort je Server: gestreamte Spielerlisten nutzen sie,
+        # bis die aktuelle Antwort da ist (sonst wuerde die Liste bei jedem
+        # Refresh erst ohne, dann mit ELO gezeichnet).
+        self._last_qlstats = {}
+        # Gestreamtes Teilergebnis der laufenden Abfrage (nur Hauptthread).
+        self._partial_id = None
+        self._partial = {}
+        self._partial_done = set()
+        self._partial_apply_ms = 0.0
+        # Laufzeit je Phase (phasestats.py); None = es wird nicht gemessen.
+        self.phase_stats = PhaseStats() if config.PHASE_STATS else None
+        # Eigene ELO: (steamid, gametype, A/B) -> (elo, games) oder None.
+        self._own_elo_cache = utils.TTLCache(config.OWN_ELO_TTL, config.OWN_ELO_CACHE_FILE)
+        # Zuletzt geholte eigene ELO je Schluessel (auch nach Ablauf der TTL)
+        # und nach einem Matchende: Schluessel -> (Wert davor, Fenster-Ende).
+        # Beide unter _own_elo_lock (Worker und Hauptthread).
+        self._own_elo_last = {}
+        self._own_elo_settle = {}
+        self._own_elo_lock = threading.Lock()
+        # (address, gamestate) des zuletzt angezeigten Servers.
+        self._last_gamestate = None
+        # Dauerhafte Ping-Messung des aktuellen Servers (optional aller
+        # Favoriten) ueber die Engine; die UI liest im Takt nach.
+        self.pinger = PingSampler(self.engine, socket_index=self.engine.dedicated_sockets[0]).start()
+        self._ping_job = None
+        if app.root is not None:
+            self._ping_job = app.root.after(int(config.PING_SAMPLE_INTERVAL * 1000), self._ping_tick)
 
     def measure_ping(self, server_address, timeout=1.0, attempts=2):
-        OOB = b'\xff\xff\xff\xff'
-        payload = OOB + b'getchallenge'
-        best = 999
-        sock = None
+        """Bester von `attempts` getchallenge-Versuchen in ms, 999 = keine Antwort."""
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(timeout)
-            sock.connect(server_address)
-            for _ in range(attempts):
-                try:
-                    start = time.perf_counter()
-                    sock.send(payload)
-                    sock.recv(2048)
-                    end = time.perf_counter()
-                    ms = max(1, int((end - start) * 1000))
-                    best = min(best, ms)
-                except socket.timeout:
-                    continue
-        except (OSError, socket.gaierror):
+            best = self.engine.submit(
+                self.engine.best_ping(server_address, timeout, attempts)
+            ).result(timeout * attempts + 1.0)
+        except Exception:
             return 999
-        finally:
-            if sock:
-                sock.close()
-        return best
+        return 999 if best is None else max(1, int(best))
+
+    @property
+    def in_flight_queries(self):
+        """Anzahl gestarteter, noch nicht abgeschlossener Abfrage-Runden."""
+        return len(self._rounds)
+
+    def _get_json(self, url, task=None):
+        """GET url und JSON dekodieren. Mit task wird die Antwort beim Abbruch
+        der Runde sofort geschlossen."""
+        return self.http.get_json(url, config.QLSTATS_TIMEOUT, task)
 
-    def fetch_qlstats_players(self, address):
+    def fetch_qlstats_players(self, address, task=None, trace=None):
         """Holt die Live-Spielerliste inkl. ELO vom qlstats-Feeder.
 
         Der Endpunkt /api/server/<ip>:<port>/players liefert für jeden aktuell
         getrackten Spieler steamid, name, team und rating. Das rating ist je
         nach Server-Factory automatisch das A- oder B-Rating (für Vampiric PQL
         CA also das B-Rating). team: 1=rot, 2=blau, 0=frei, >=3/-1=Spectator.
-        Gibt (elo_by_name, steamid_by_name, team_by_name, info) zurück, oder
-        ({}, {}, {}, None) bei jedem Fehler (Server nicht getrackt, Timeout,
-        kein Netz, ...).
+        Gibt (elo_by_name, steamid_by_name, team_by_name, info, status) zurück;
+        bei jedem Fehler (Server nicht getrackt, Timeout, kein Netz, ...) bzw.
+        solange der Backoff laeuft ({}, {}, {}, None, status). status ist None,
+        wenn qlstats geantwortet hat, sonst ein kurzer Text fuer die ELO-Zeile.
+        trace: dict, in dem "status" (phasestats) gesetzt wird, wenn nicht
+        abgefragt wurde oder die Anfrage fehlschlug.
         """
+        trace = {} if trace is None else trace
         if not getattr(config, "SHOW_ELO", True):
-            return {}, {}, {}, None
+            trace["status"] = PHASE_SKIPPED
+            return {}, {}, {}, None, None
         ip, port = address
         if not ip:
-            return {}, {}, {}, None
+            trace["status"] = PHASE_SKIPPED
+            return {}, {}, {}, None, None
+        state = self._qlstats_state(address)
+        with self._qlstats_lock:
+            if not state.backoff.ready():
+                trace["status"] = PHASE_SKIPPED
+                return {}, {}, {}, None, self._qlstats_status_text(state)
         url = "{base}/server/{ip}:{port}/players".format(
             base=config.QLSTATS_API_BASE.rstrip("/"), ip=ip, port=port
         )
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": config.APP_NAME})
-            with urllib.request.urlopen(req, timeout=config.QLSTATS_TIMEOUT) as resp:
-                data = json.loads(resp.read().decode("utf-8", "replace"))
-        except Exception:
-            return {}, {}, {}, None
+            data = self._get_json(url, task)
+        except Exception as e:
+            trace["status"] = outcome_status(False, e)
+            if task is not None and task.cancelled:
+                return {}, {}, {}, None, None
+            data = None
+            untracked = False
+        else:
+            untracked = not data or not data.get("ok")
 
-        if not data or not data.get("ok"):
-            return {}, {}, {}, None
+        if data is None or untracked:
+            with self._qlstats_lock:
+                self._qlstats_failed(state, untracked)
+                return {}, {}, {}, None, self._qlstats_status_text(state)
+        with self._qlstats_lock:
+            state.tracked = True
+            state.untracked = False
+            state.backoff.success()
 
         elo_by_name = {}
         steamid_by_name = {}
@@ -93,25 +256,76 @@ class ServerHandler:
                 elo_by_name[key] = int(rating)
 
         info = data.get("serverinfo") or None
-        return elo_by_name, steamid_by_name, team_by_name, info
+        return elo_by_name, steamid_by_name, team_by_name, info, None
+
+    def _qlstats_state(self, address):
+        with self._qlstats_lock:
+            state = self._qlstats.get(tuple(address))
+            if state is None:
+                state = self._qlstats[tuple(address)] = _QlstatsState()
+            return state
+
+    @staticmethod
+    def _qlstats_failed(state, untracked):
+        """Naechsten Versuch planen (unter _qlstats_lock). Ein Server, der
+        nicht getrackt wird (oder nie geantwortet hat), wird nur noch selten
+        geprueft; ein bekannter Server nach kurzem Ausfall schnell wieder.
+        untracked bleibt bis zum naechsten Erfolg gesetzt, sonst fiele der
+        Backoff nach jedem Planwechsel auf den kurzen Fehler-Plan zurueck."""
+        if state.untracked:
+            untracked = True
+        elif not untracked and not state.tracked and state.backoff.failures + 1 >= config.QLSTATS_UNTRACKED_AFTER:
+            untracked = True
+        state.untracked = untracked
+        base, maximum = config.QLSTATS_UNTRACKED_BACKOFF if untracked else config.QLSTATS_ERROR_BACKOFF
+        state.backoff.failure(base, maximum)
+
+    @staticmethod
+    def _qlstats_status_text(state):
+        label = "not tracked by qlstats" if state.untracked else "qlstats unavailable"
+        return "{} (retry in {})".format(label, utils.format_duration(state.backoff.remaining()))
 
     # --- Öffentlicher Einstiegspunkt: plant eine Abfrage ---
-    def fetch_server_info(self):
-        """Startet eine Abfrage in einem Worker-Thread (UI bleibt responsiv)."""
+    def fetch_server_info(self, light=False):
+        """Startet eine Abfrage-Runde im Runden-Pool (UI bleibt responsiv).
+        Im Dashboard-Modus werden alle Favoriten in einer Runde abgefragt.
+        Eine noch laufende, damit veraltete Runde wird abgebrochen.
+
+        light=True (Fenster im Tray): nur A2S_INFO des aktuellen Servers fuer
+        Titel und Tray-Tooltip; Spieler, ELO und Rules erst beim Anzeigen."""
         self._current_query += 1
         query_id = self._current_query
-        address = self.app.SERVER_ADDRESS
-        threading.Thread(
-            target=self._query_worker, args=(query_id, address), daemon=True
-        ).start()
+        if self._task is not None:
+            self._task.cancel()
+        task = self._task = QueryTask()
+        if light:
+            target, args = self._query_worker, (query_id, self.app.SERVER_ADDRESS, task, True)
+        elif self.dashboard_enabled():
+            target, args = self._dashboard_worker, (
+                query_id, self._dashboard_addresses(), task, tuple(self.app.SERVER_ADDRESS)
+            )
+        else:
+            target, args = self._query_worker, (query_id, self.app.SERVER_ADDRESS, task)
+        if self.app.handoff is not None:
+            self.app.handoff.wake()
+        fut = self._round_executor.submit(target, *args)
+        self._rounds.add(fut)
+        fut.add_done_callback(self._rounds.discard)
+        # Noch wartende Runde wird beim Abbruch gar nicht erst gestartet.
+        task.add_future(fut)
+
+    def dashboard_enabled(self):
+        return bool(self.app.app_config.get("show_dashboard", False))
 
-    def fetch_own_elo(self):
+    def fetch_own_elo(self, task=None, trace=None):
         """Eigene ELO per SteamID aus den Optionen, unabhaengig davon ob man
         gerade auf dem Server ist. Gamemode und A/B-Rating kommen ebenfalls aus
         den Optionen (Route /elo bzw. /elo_b). Gibt (elo, games) oder None
-        (keine ID, 0 Spiele, Fehler)."""
+        (keine ID, 0 Spiele, Fehler). trace: wie bei fetch_qlstats_players."""
+        trace = {} if trace is None else trace
         steamid = str(self.app.app_config.get("own_steamid", "")).strip()
         if not steamid.isdigit() or not getattr(config, "SHOW_ELO", True):
+            trace["status"] = PHASE_SKIPPED
             return None
         gt = str(self.app.app_config.get("own_gametype", "ca")).lower()
         rating = str(self.app.app_config.get("own_rating", "B")).upper()
@@ -120,12 +334,35 @@ class ServerHandler:
         base = config.QLSTATS_API_BASE.rstrip("/")
         site = base[:-4] if base.endswith("/api") else base
         url = "{site}/{route}/{sid}".format(site=site, route=route, sid=steamid)
+        key = (steamid, gt, rating)
+        cached = self._own_elo_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            trace["status"] = PHASE_SKIPPED
+            with self._own_elo_lock:
+                self._own_elo_last.setdefault(key, cached)
+            return tuple(cached) if cached else None
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": config.APP_NAME})
-            with urllib.request.urlopen(req, timeout=config.QLSTATS_TIMEOUT) as resp:
-                data = json.loads(resp.read().decode("utf-8", "replace"))
-        except Exception:
-            return None
+            data = self._get_json(url, task)
+        except Exception as e:
+            trace["status"] = outcome_status(False, e)
+            return None     # Netzfehler nicht cachen
+        result = self._parse_own_elo(data, gt)
+        stored = list(result) if result else None
+        ttl = None
+        with self._own_elo_lock:
+            settle = self._own_elo_settle.get(key)
+            if settle is not None:
+                if stored == settle[0] and time.time() < settle[1]:
+                    # qlstats hat das Match noch nicht verarbeitet: bald erneut fragen.
+                    ttl = config.OWN_ELO_SETTLE_RETRY
+                else:
+                    self._own_elo_settle.pop(key, None)
+            self._own_elo_last[key] = stored
+        self._own_elo_cache.put(key, stored, ttl)
+        return result
+
+    @staticmethod
+    def _parse_own_elo(data, gt):
         players = data.get("players") or []
         if not players:
             return None
@@ -136,62 +373,474 @@ class ServerHandler:
             return None
         return (int(elo), int(games))
 
-    def _query_worker(self, query_id, address):
-        """Läuft im Hintergrund-Thread. KEINE Tkinter-Zugriffe hier!"""
-        result = {"ok": False}
+    def invalidate_own_elo(self, match_end=False):
+        """Gemerkte eigene ELO verwerfen (Optionen geaendert, Match vorbei).
+
+        match_end: qlstats verarbeitet das Match erst nach einer Weile. Bis
+        OWN_ELO_SETTLE_WINDOW nach dem Matchende wird ein unveraenderter Wert
+        deshalb nur OWN_ELO_SETTLE_RETRY Sekunden gemerkt und dann erneut
+        geholt, bis die neue ELO da ist."""
+        if match_end:
+            until = time.time() + config.OWN_ELO_SETTLE_WINDOW
+            with self._own_elo_lock:
+                for key, value in self._own_elo_last.items():
+                    self._own_elo_settle[key] = (value, until)
+        self._own_elo_cache.invalidate()
+
+    def _track_gamestate(self, address, gamestate):
+        """Wechselt der angezeigte Server von Active zurueck auf Warmup, ist ein
+        Match zu Ende und die eigene ELO kann sich geaendert haben. Ein leerer
+        gamestate (Rules-Abfrage fehlgeschlagen) aendert den Stand nicht."""
+        if not gamestate:
+            return
+        previous = self._last_gamestate
+        self._last_gamestate = (tuple(address), gamestate)
+        if previous == (tuple(address), "Active") and gamestate == "Warmup":
+            self.invalidate_own_elo(match_end=True)
+
+    @staticmethod
+    def _timed(func):
+        """Fuehrt func aus und gibt (ok, wert_oder_exception, dauer_ms) zurueck."""
+        start = time.perf_counter()
+        try:
+            value, ok = func(), True
+        except Exception as e:
+            value, ok = e, False
+        return ok, value, (time.perf_counter() - start) * 1000.0
+
+    @staticmethod
+    async def _atimed(coro):
+        """Wie _timed, fuer Coroutines der UDP-Engine."""
+        start = time.perf_counter()
+        try:
+            value, ok = await coro, True
+        except Exception as e:
+            value, ok = e, False
+        return ok, value, (time.perf_counter() - start) * 1000.0
+
+    @staticmethod
+    def _parse_gamestate(rules):
+        """Gamestate aus den A2S-Rules (g_gameState): Active, Warmup oder ''."""
+        raw = rules.get("g_gameState", "")
+        if raw == "IN_PROGRESS":
+            return "Active"
+        return "Warmup" if raw else ""
+
+    def _start_calls(self, address, own_elo_future, task, light=False):
+        """Startet alle Netzwerk-Calls fuer address und gibt {name: Future}
+        zurueck. Die Calls haengen nicht voneinander ab und laufen parallel
+        (UDP in der Engine, HTTP im Pool). light: nur info."""
+        down = self._breaker_down(address)
+        if down is not None:
+            # Server gilt als down: keine A2S-/qlstats-Calls, sofort fertig.
+            failed = (False, down, 0.0)
+            if light:
+                return {"info": self._completed(failed)}
+            futures = {name: self._completed(failed) for name in ("info", "ping", "players", "rules", "qlstats")}
+            futures["own_elo"] = own_elo_future
+            return futures
+        engine = self.engine
+        trace = task.a2s_traces.setdefault(tuple(address), {})
+        if light:
+            return {"info": task.add_future(engine.submit(self._atimed(
+                engine.info(address, config.A2S_TIMEOUT, trace))))}
+        udp_calls = {
+            "info": engine.info(address, config.A2S_TIMEOUT, trace),
+            "ping": engine.best_ping(address, config.PING_TIMEOUT, 2),
+            "players": engine.players(address, config.A2S_TIMEOUT, trace),
+            "rules": engine.rules(address, config.RULES_TIMEOUT, trace),
+        }
+        futures = {name: task.add_future(engine.submit(self._atimed(coro))) for name, coro in udp_calls.items()}
+        # ELO vom qlstats-Feeder.
+        futures["qlstats"] = task.add_future(
+            self._executor.submit(self._timed, lambda: self.fetch_qlstats_players(
+                address, task, task.http_traces.setdefault((tuple(address), "qlstats"), {})))
+        )
         # Eigene ELO unabhaengig vom Server-Ergebnis (zeigt sie auch, wenn der
-        # getrackte Server gerade down ist).
-        own_elo = self.fetch_own_elo()
+        # getrackte Server gerade down ist). Wird von allen Servern einer
+        # Dashboard-Runde geteilt.
+        futures["own_elo"] = own_elo_future
+        return futures
+
+    @staticmethod
+    def _completed(value):
+        fut = Future()
+        fut.set_result(value)
+        return fut
+
+    # --- Circuit Breaker ---
+    def _breaker(self, address):
+        with self._breaker_lock:
+            breaker = self._breakers.get(tuple(address))
+            if breaker is None:
+                breaker = self._breakers[tuple(address)] = _Breaker()
+            return breaker
+
+    def _breaker_down(self, address):
+        """ServerDown-Exception, wenn der Breaker von address offen ist."""
+        breaker = self._breaker(address)
+        with self._breaker_lock:
+            if not breaker.open:
+                return None
+            return ServerDown("Server down (next probe in {}).".format(
+                utils.format_duration(breaker.backoff.remaining())))
+
+    def _start_prober(self, address, breaker):
+        """Startet die Proben-Task fuer einen gerade geoeffneten Breaker
+        (Aufrufer haelt _breaker_lock)."""
+        if breaker.prober is not None and not breaker.prober.done():
+            return
+        coro = self._probe_loop(address, breaker)
         try:
-            info = a2s.info(address, timeout=5.0)
-            ping_ms = self.measure_ping(address, timeout=1.5)
+            breaker.prober = self.engine.submit(coro)
+        except RuntimeError:
+            coro.close()            # Engine ist schon gestoppt
+
+    async def _probe_loop(self, address, breaker):
+        """Laeuft im Engine-Loop: ein getchallenge je faelligem Backoff-Schritt,
+        bis der Server antwortet. Die Abfrage-Runden warten nie darauf."""
+        while True:
+            with self._breaker_lock:
+                if not breaker.open:
+                    return
+                delay = breaker.backoff.remaining()
+            await asyncio.sleep(delay)
             try:
-                players = a2s.players(address, timeout=5.0)
+                await self.engine.ping(address, config.PROBE_TIMEOUT)
             except Exception:
-                players = []
-
-            # ELO vom qlstats-Feeder (Netzwerk-Call gehört in den Worker-Thread).
-            elo_by_name, steamid_by_name, team_by_name, elo_info = self.fetch_qlstats_players(address)
+                with self._breaker_lock:
+                    breaker.backoff.failure()
+                continue
+            with self._breaker_lock:
+                breaker.open = False
+                breaker.failures = 0
+                breaker.backoff.success()
+            break
+        if self.app.handoff is not None:
+            self.app.handoff.post(lambda: self._on_breaker_closed(address), ("breaker", tuple(address)))
 
-            # Gamestate aus den A2S-Rules (g_gameState). Manche Server liefern
-            # keine Rules -> leer lassen.
-            gamestate = ""
+    def _on_breaker_closed(self, address):
+        """Hauptthread: Server antwortet wieder -> sofort neu abfragen, wenn
+        er gerade angezeigt wird (bzw. im Dashboard steht)."""
+        if self.app.shutting_down:
+            return
+        address = tuple(address)
+        shown = address == tuple(self.app.SERVER_ADDRESS)
+        if not shown and self.dashboard_enabled():
+            shown = address in self._dashboard_addresses()
+        if not shown:
+            return
+        if self.refresh_job is not None:
             try:
-                rules = a2s.rules(address, timeout=1.5)
-                raw = rules.get("g_gameState", "")
-                if raw == "IN_PROGRESS":
-                    gamestate = "Active"
-                elif raw:
-                    gamestate = "Warmup"
+                self.app.root.after_cancel(self.refresh_job)
             except Exception:
-                gamestate = ""
-
-            result = {
-                "ok": True,
-                "server_name": info.server_name,
-                "map_name": info.map_name,
-                "max_players": info.max_players,
-                "players": players,
-                "player_count": len(players),
-                "ping_ms": ping_ms,
-                "game": getattr(info, "game", "N/A"),
-                "address": address,
+                pass
+            self.refresh_job = None
+        self._scheduled_refresh()
+
+    def _record_availability(self, address, result):
+        """Ergebnis einer vollen Abfrage im Breaker verbuchen."""
+        if result.get("server_down"):
+            return
+        breaker = self._breaker(address)
+        with self._breaker_lock:
+            if result["ok"]:
+                breaker.failures = 0
+                return
+            breaker.failures += 1
+            if not breaker.open and breaker.failures >= config.BREAKER_THRESHOLD:
+                breaker.open = True
+                breaker.backoff.success()
+                breaker.backoff.failure()
+                self._start_prober(address, breaker)
+
+    # Reihenfolge, in der Teilergebnisse an die UI gestreamt werden.
+    SECTIONS = ("info", "ping", "players", "qlstats", "rules", "own_elo")
+
+    def _section_fields(self, name, outcome):
+        """Ergebnis-Felder, die der Call `name` beitraegt (fuer das fertige
+        Ergebnis-Dict wie fuer gestreamte Teilergebnisse)."""
+        ok, value, _ = outcome
+        if name == "info":
+            return {
+                "server_name": value.server_name,
+                "map_name": value.map_name,
+                "max_players": value.max_players,
+                "player_count": value.player_count,
+                "game": getattr(value, "game", "N/A"),
+            }
+        if name == "ping":
+            return {"ping_ms": max(1, int(value)) if ok and value is not None else 999}
+        if name == "players":
+            players = value if ok else []
+            return {"players": players, "player_count": len(players)}
+        if name == "qlstats":
+            elo_by_name, steamid_by_name, team_by_name, elo_info, status = value if ok else ({}, {}, {}, None, None)
+            return {
                 "elo_by_name": elo_by_name,
                 "steamid_by_name": steamid_by_name,
                 "team_by_name": team_by_name,
                 "elo_info": elo_info,
-                "gamestate": gamestate,
-                "own_elo": own_elo,
+                "qlstats_status": status,
             }
-        except (socket.timeout, ConnectionRefusedError, socket.gaierror):
-            result = {"ok": False, "msg": "Connection failed.", "own_elo": own_elo}
-        except Exception:
-            result = {"ok": False, "msg": "Error.", "own_elo": own_elo}
+        if name == "rules":
+            # Manche Server liefern keine Rules -> Gamestate leer lassen.
+            return {"gamestate": self._parse_gamestate(value) if ok else ""}
+        return {"own_elo": value if ok else None}
+
+    @staticmethod
+    def _player_fields(players_outcome, qlstats_outcome):
+        """Fertige Spielerliste (PlayerRecords, klassifiziert und sortiert)
+        aus A2S-Spielern und - falls schon da - den qlstats-Daten."""
+        players = players_outcome[1] if players_outcome[0] else []
+        elo_by_name = steamid_by_name = team_by_name = None
+        if qlstats_outcome is not None and qlstats_outcome[0]:
+            elo_by_name, steamid_by_name, team_by_name, _, _ = qlstats_outcome[1]
+        playing, spectators = build_player_list(players, elo_by_name, steamid_by_name, team_by_name)
+        return {"playing": playing, "spectators": spectators,
+                "list_fp": list_fingerprint(playing, spectators)}
+
+    def _collect_result(self, address, futures, started, task):
+        """Baut aus den Futures das Ergebnis-Dict (nach wait()).
+
+        Nicht rechtzeitig fertige Calls zaehlen als Timeout; sie laufen noch
+        bis zu ihrem eigenen Timeout aus, werden aber ignoriert."""
+        outcome = {}
+        for name, fut in futures.items():
+            if fut.cancelled():
+                outcome[name] = (False, socket.timeout("cancelled"), 0.0)
+            elif fut.done():
+                outcome[name] = fut.result()
+            else:
+                outcome[name] = (False, socket.timeout("deadline"), config.QUERY_DEADLINE * 1000.0)
+
+        total_ms = (time.perf_counter() - started) * 1000.0
+        timing = {
+            "total_ms": int(total_ms),
+            # So lange haette die fruehere, sequentielle Abfrage gedauert.
+            "sequential_ms": int(sum(o[2] for o in outcome.values())),
+            "calls": {name: int(o[2]) for name, o in outcome.items()},
+        }
+        # Durch gemerkte A2S-Challenges eingesparte Round Trips.
+        trace = task.a2s_traces.get(tuple(address), {})
+        timing["round_trips"] = trace.get("round_trips", 0)
+        timing["saved_rtts"] = trace.get("saved_rtts", 0)
+        timing["saved_rtt_ms"] = int(trace.get("saved_ms", 0.0))
+        stats = self.phase_stats
+        if stats is not None and not isinstance(outcome["info"][1], ServerDown):
+            phases = {name: (o[2], outcome_status(o[0], o[1])) for name, o in outcome.items()}
+            # best_ping meldet "keine Antwort" als None statt als Exception.
+            if phases.get("ping", (0, PHASE_OK))[1] == PHASE_OK and outcome["ping"][1] is None:
+                phases["ping"] = (outcome["ping"][2], PHASE_TIMEOUT)
+            # Die HTTP-Fetcher fangen Fehler selbst ab und melden sie ueber
+            # ihren Trace; uebersprungene Calls (Backoff, Cache) zaehlen nicht.
+            for name, key in (("qlstats", (tuple(address), "qlstats")), ("own_elo", "own_elo")):
+                status = task.http_traces.get(key, {}).get("status")
+                if name in phases and phases[name][1] == PHASE_OK and status is not None:
+                    phases[name] = (phases[name][0], status)
+            phases = {name: value for name, value in phases.items() if value[1] != PHASE_SKIPPED}
+            phases["total"] = (total_ms, PHASE_OK)
+            stats.record(address, phases)
+        if config.LOG_REFRESH_TIMING:
+            http = self.http.snapshot()
+            print("Refresh {}:{}: {total_ms}ms (sequential {sequential_ms}ms) {calls}".format(
+                address[0], address[1], **timing)
+                + " | a2s: {round_trips} round trips, {saved_rtts} saved (~{saved_rtt_ms}ms)".format(**timing)
+                + " | http: {reused} reused / {connections} new connections, {not_modified} not modified".format(**http))
+
+        ok, info, _ = outcome["info"]
+        if not ok:
+            if isinstance(info, ServerDown):
+                msg = str(info)
+            elif isinstance(info, (socket.timeout, ConnectionRefusedError, socket.gaierror)):
+                msg = "Connection failed."
+            else:
+                msg = "Error."
+            result = {"ok": False, "msg": msg, "address": address, "timing": timing,
+                      "server_down": isinstance(info, ServerDown)}
+            if "own_elo" in outcome:
+                result.update(self._section_fields("own_elo", outcome["own_elo"]))
+            return result
+
+        result = {"ok": True, "address": address, "timing": timing}
+        if outcome.get("qlstats", (False,))[0]:
+            self._last_qlstats[tuple(address)] = outcome["qlstats"]
+        if "players" not in outcome:
+            # Sparsame Abfrage (nur info).
+            result.update(self._section_fields("info", outcome["info"]))
+            result["light"] = True
+            return result
+        for name in self.SECTIONS:
+            result.update(self._section_fields(name, outcome[name]))
+        result.update(self._player_fields(outcome["players"], outcome["qlstats"]))
+        return result
+
+    def _stream_sections(self, address, futures, emitted, on_section):
+        """Meldet fertige Calls in SECTIONS-Reihenfolge an on_section. Solange
+        info fehlt (oder fehlgeschlagen ist), wird nichts gestreamt."""
+        for name in self.SECTIONS:
+            if name in emitted:
+                continue
+            fut = futures[name]
+            if not fut.done() or fut.cancelled():
+                if name == "info":
+                    return
+                continue
+            outcome = fut.result()
+            if name == "info" and not outcome[0]:
+                return
+            emitted.append(name)
+            fields = self._section_fields(name, outcome)
+            # Spielerliste neu zusammenfuehren, sobald A2S-Spieler da sind
+            # (und erneut, wenn qlstats nachkommt).
+            if name in ("players", "qlstats") and "players" in emitted:
+                qlstats = futures["qlstats"]
+                if qlstats.done() and not qlstats.cancelled():
+                    qlstats_outcome = qlstats.result()
+                else:
+                    qlstats_outcome = self._last_qlstats.get(tuple(address))
+                fields.update(self._player_fields(futures["players"].result(), qlstats_outcome))
+            on_section(name, fields)
+
+    def query_servers(self, addresses, task=None, on_section=None, stream_address=None, light=False):
+        """Fragt alle addresses gleichzeitig ab (blockierend, KEINE Tkinter-
+        Zugriffe). Gibt {address: result} zurueck, oder None, wenn die Runde
+        abgebrochen wurde. Eine Runde dauert etwa so lange wie der langsamste
+        Call, begrenzt durch QUERY_DEADLINE.
+
+        Mit on_section(name, felder) werden die Teilergebnisse von
+        stream_address schon gemeldet, sobald der jeweilige Call fertig ist.
+        light: nur A2S_INFO je Server (ohne Spieler, qlstats, eigene ELO)."""
+        task = task or QueryTask()
+        started = time.perf_counter()
+        own_elo_future = None
+        if not light:
+            own_elo_future = task.add_future(self._executor.submit(
+                self._timed, lambda: self.fetch_own_elo(task, task.http_traces.setdefault("own_elo", {}))))
+        pending = {address: self._start_calls(address, own_elo_future, task, light) for address in addresses}
+        # Beim Abbruch werden alle Futures gecancelt bzw. ihre Verbindungen
+        # geschlossen -> wait() kehrt dann sofort zurueck.
+        remaining = {f for futures in pending.values() for f in futures.values()}
+        if on_section is None or stream_address not in pending:
+            wait(remaining, timeout=config.QUERY_DEADLINE)
+        else:
+            deadline = started + config.QUERY_DEADLINE
+            emitted = []
+            while remaining and not task.cancelled:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                _, remaining = wait(remaining, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not task.cancelled:
+                    self._stream_sections(stream_address, pending[stream_address], emitted, on_section)
+        if task.cancelled:
+            return None
+        results = {address: self._collect_result(address, futures, started, task) for address, futures in pending.items()}
+        for address, result in results.items():
+            self._record_availability(address, result)
+        # Nach der Deadline noch laufende Calls nicht weiter warten lassen.
+        task.cancel()
+        return results
+
+    def _post(self, query_id, callback, key):
+        """Gibt einen Callback aus dem Worker-Thread an den Hauptthread (ueber
+        app.handoff, ohne Tk-Aufruf hier). Gleiche keys werden zusammengefasst;
+        Ergebnisse einer inzwischen ueberholten Abfrage verwirft der Pump."""
+        self.app.handoff.post(callback, key, lambda: query_id != self._current_query or self.app.shutting_down)
 
+    def _section_poster(self, query_id, address):
+        """on_section-Callback, der Teilergebnisse in den Hauptthread gibt."""
+        def on_section(name, fields):
+            self._post(query_id, lambda: self._apply_section(query_id, address, name, fields),
+                       ("section", tuple(address), name))
+        return on_section
+
+    def _query_worker(self, query_id, address, task, light=False):
+        """Läuft im Hintergrund-Thread. KEINE Tkinter-Zugriffe hier!"""
+        if light:
+            results = self.query_servers([address], task, light=True)
+        else:
+            results = self.query_servers(
+                [address], task, self._section_poster(query_id, address), address
+            )
+        if results is None:
+            return
+        result = results[address]
+        self.last_timing = result["timing"]
         # Ergebnis zurück in den Hauptthread geben
-        root = self.app.root
-        if root and root.winfo_exists() and not self.app.shutting_down:
-            root.after(0, lambda: self._apply_result(query_id, result))
+        self._post(query_id, lambda: self._apply_result(query_id, result), ("result",))
+
+    def _dashboard_worker(self, query_id, addresses, task, current):
+        """Dashboard-Modus: alle Favoriten in einer Runde (Hintergrund-Thread).
+        Der angezeigte Server wird dabei wie im Einzelmodus gestreamt."""
+        results = self.query_servers(
+            addresses, task, self._section_poster(query_id, current), current
+        )
+        if results is None:
+            return
+        self._post(query_id, lambda: self._apply_dashboard(query_id, results), ("dashboard",))
+
+    def _dashboard_addresses(self):
+        """Alle gueltigen Favoriten-Adressen (ohne Duplikate) plus den aktuell
+        angezeigten Server, falls er kein Favorit ist."""
+        addresses = []
+        for i in range(1, 8):
+            try:
+                address = utils.parse_address(self.app.favorites.get(str(i), "").strip())
+            except ValueError:
+                continue
+            if address[0] and address not in addresses:
+                addresses.append(address)
+        current = tuple(self.app.SERVER_ADDRESS)
+        if current[0] and current not in addresses:
+            addresses.append(current)
+        return addresses
+
+    def _apply_dashboard(self, query_id, results):
+        """Läuft im Hauptthread: Cache und Dashboard aktualisieren, dann den
+        aktuell gewählten Server wie eine normale Antwort anzeigen."""
+        if query_id != self._current_query or self.app.shutting_down:
+            return
+        self.result_cache.update(results)
+        self.app.ui.update_dashboard()
+        result = self.result_cache.get(tuple(self.app.SERVER_ADDRESS))
+        if result is None:
+            # Server nach dem Start der Runde gewechselt und nicht im Cache.
+            self.fetch_server_info()
+            return
+        self.last_timing = result["timing"]
+        self._apply_result(query_id, result)
+
+    def show_cached(self, address):
+        """Zeigt address sofort aus dem Dashboard-Cache an (ohne neue Abfrage).
+        False, wenn kein Ergebnis im Cache liegt."""
+        result = self.result_cache.get(tuple(address))
+        if result is None or not self.dashboard_enabled():
+            return False
+        self._partial_id = None
+        self._render_result(result)
+        self.app.ui.update_dashboard()
+        return True
+
+    def _apply_section(self, query_id, address, name, fields):
+        """Läuft im Hauptthread: ein gestreamtes Teilergebnis sofort anzeigen."""
+        if query_id != self._current_query or self.app.shutting_down:
+            return
+        if tuple(address) != tuple(self.app.SERVER_ADDRESS):
+            return
+        started = time.perf_counter() if self.phase_stats is not None else None
+        if self._partial_id != query_id:
+            self._partial_id = query_id
+            self._partial = {"ok": True, "address": address}
+            self._partial_done = set()
+            self._partial_apply_ms = 0.0
+        self._partial.update(fields)
+        self._partial_done.add(name)
+        if name == "rules":
+            self._track_gamestate(address, fields.get("gamestate"))
+        self._render_section(name, self._partial)
+        if started is not None:
+            self._partial_apply_ms += (time.perf_counter() - started) * 1000.0
 
     def _apply_result(self, query_id, result):
         """Läuft im Hauptthread. Hier sind Tkinter-Zugriffe erlaubt."""
@@ -201,61 +850,253 @@ class ServerHandler:
         if self.app.shutting_down:
             return
 
-        ui = self.app.ui
+        if result.get("light"):
+            # Fenster im Tray: nur Spielerzahl in Titel/Tooltip.
+            self._partial_id = None
+            if result["ok"]:
+                self._render_player_count(result)
+        else:
+            started = time.perf_counter() if self.phase_stats is not None else None
+            self.render_stats["results"] += 1
+            if result["ok"]:
+                self._track_gamestate(result["address"], result.get("gamestate"))
 
-        if result["ok"]:
+            # Bereits gestreamte Teile nicht noch einmal zeichnen.
+            done = ()
+            if result["ok"] and self._partial_id == query_id:
+                done = self._partial_done
+            self._partial_id = None
+            self._render_result(result, done)
+            if started is not None:
+                # apply = Zeichnen des Ergebnisses samt vorab gestreamter Teile.
+                streamed_ms = self._partial_apply_ms if done else 0.0
+                self._record_ui_phases(result["address"], (time.perf_counter() - started) * 1000.0 + streamed_ms)
+            if config.LOG_REFRESH_TIMING:
+                print("UI: {results} results, list rebuild skipped {list_skipped}x, times only {list_times_only}x, "
+                      "{sections_skipped} unchanged sections".format(**self.render_stats)
+                      + " | handoff: depth {depth} (max {max_depth}), wait avg {wait_ms_avg:.1f}ms max {wait_ms_max:.1f}ms, "
+                      "{coalesced} coalesced, {stale} stale".format(**self.app.handoff.snapshot()))
+
+        # Startprofil (main.py --profile-startup): erstes Ergebnis ist da.
+        if getattr(self.app, "startup", None) is not None:
+            self.app.startup_done()
+
+        # Nächste Abfrage planen (immer im Hauptthread)
+        if self.app.root and self.app.root.winfo_exists() and not self.app.shutting_down:
+            self.refresh_state = self._refresh_state(result)
+            self.refresh_job = self.app.root.after(
+                int(self._refresh_delay(self.refresh_state) * 1000), self._scheduled_refresh
+            )
+
+    # --- Phasen-Messung ---
+    def enable_phase_stats(self):
+        """Startet die Messung (falls noch aus) und gibt PhaseStats zurueck."""
+        if self.phase_stats is None:
+            self.phase_stats = PhaseStats()
+        return self.phase_stats
+
+    def _record_ui_phases(self, address, apply_ms):
+        """apply sofort, layout sobald Tk die danach anstehenden Idle-Tasks
+        (Geometrie, Neuzeichnen) abgearbeitet hat (Hauptthread)."""
+        stats = self.phase_stats
+        applied = time.perf_counter()
+
+        def idle():
+            stats.record(address, {"apply": (apply_ms, PHASE_OK),
+                                   "layout": ((time.perf_counter() - applied) * 1000.0, PHASE_OK)})
+        try:
+            self.app.root.after_idle(idle)
+        except Exception:
+            stats.record(address, {"apply": (apply_ms, PHASE_OK)})
+
+    # --- Adaptiver Refresh ---
+    def _window_visible(self):
+        try:
+            return bool(self.app.root.winfo_viewable())
+        except Exception:
+            return True
+
+    def _refresh_state(self, result):
+        """Zustand fuer die naechste Abfrage: hidden (Fenster im Tray), empty
+        (niemand auf dem Server bzw. allen Favoriten), active (laufendes Match)
+        oder visible (Warmup, unbekannt, Fehler)."""
+        if not self._window_visible():
+            return "hidden"
+        if not result["ok"] or result.get("light"):
+            return "visible"
+        results = self.result_cache.values() if self.dashboard_enabled() else (result,)
+        if not any(self._has_humans(r) for r in results):
+            return "empty"
+        if result.get("gamestate") == "Active":
+            return "active"
+        return "visible"
+
+    @staticmethod
+    def _has_humans(result):
+        if not result.get("ok"):
+            return False
+        if result.get("light"):
+            return result.get("player_count", 0) > 0
+        return any(r.name not in config.BOT_NAMES
+                   for r in result.get("playing", ()) + result.get("spectators", ()))
+
+    def _refresh_delay(self, state):
+        """Abstand bis zur naechsten Abfrage in s. Im laufenden Match gilt das
+        eingestellte Intervall, sonst REFRESH_STATE_INTERVALS (nie kuerzer)."""
+        interval = max(1, self.app.REFRESH_INTERVAL)
+        if state == "active":
+            return interval
+        return max(interval, config.REFRESH_STATE_INTERVALS[state])
+
+    def _scheduled_refresh(self):
+        """Vom Timer geplante Abfrage: im Tray nur die sparsame Variante."""
+        self.refresh_job = None
+        self.fetch_server_info(light=not self._window_visible())
+
+    def on_window_shown(self):
+        """Fenster aus dem Tray geholt: Lief zuletzt nur die sparsame Abfrage
+        (oder der lange Hidden-Timer), sofort vollstaendig aktualisieren."""
+        if self.refresh_state != "hidden" or self.app.shutting_down:
+            return
+        self.refresh_state = None
+        if self.refresh_job is not None:
+            try:
+                self.app.root.after_cancel(self.refresh_job)
+            except Exception:
+                pass
+            self.refresh_job = None
+        self.fetch_server_info()
+
+    @staticmethod
+    def _section_fingerprint(name, r):
+        """Vergleichswert fuer das, was der UI-Teil `name` anzeigt."""
+        if name == "info":
+            return (tuple(r["address"]), r["server_name"], r["map_name"], r["game"])
+        if name == "ping":
+            return r["ping_ms"]
+        if name == "qlstats":
+            return (r.get("elo_info"), r.get("qlstats_status"))
+        if name == "rules":
+            return r.get("gamestate")
+        return r.get("own_elo")
+
+    def _unchanged(self, name, fp):
+        """True, wenn der UI-Teil `name` schon genau fp zeigt; sonst merken."""
+        if name in self._shown and self._shown[name] == fp:
+            return True
+        self._shown[name] = fp
+        self._layout_dirty = True
+        return False
+
+    def _render_section(self, name, r):
+        """Zeichnet den Teil der UI, zu dem der Call `name` gehoert. Nur wenn
+        sich seine Daten seit der letzten Anzeige geaendert haben."""
+        ui = self.app.ui
+        if name == "players":
+            self._render_player_list(r)
+            return
+        if name == "qlstats":
+            self._render_elo_info(r)
+            # ELO/Team-Overlay auf eine bereits angezeigte Liste legen.
+            if "playing" in r:
+                self._render_player_list(r)
+            return
+        if self._unchanged(name, self._section_fingerprint(name, r)):
+            self.render_stats["sections_skipped"] += 1
+            if name == "info":
+                self._render_player_count(r)
+            return
+        if name == "info":
             ui.error_message_var.set("")
             ui.server_name_var.set(
-                utils.truncate_text(result["server_name"], config.MAX_SERVER_MAP_NAME_CHARS)
+                utils.truncate_text(r["server_name"], config.MAX_SERVER_MAP_NAME_CHARS)
             )
             ui.map_name_var.set(
-                utils.truncate_text(result["map_name"], config.MAX_SERVER_MAP_NAME_CHARS)
+                utils.truncate_text(r["map_name"], config.MAX_SERVER_MAP_NAME_CHARS)
             )
-            ui.set_gamestate(result.get("gamestate"))
-            ui.player_count_var.set(f"{result['player_count']}/{result['max_players']}")
-            ui.ip_label_var.set(f"{result['address'][0]}:{result['address'][1]}")
-            ui.ping_var.set(f"{result['ping_ms']}ms")
-
+            ui.ip_label_var.set(f"{r['address'][0]}:{r['address'][1]}")
+            ui.game_type_var.set(r["game"])
+            ui.update_map_preview(r["map_name"])
+            self._render_player_count(r)
+        elif name == "ping":
+            ui.ping_var.set(f"{r['ping_ms']}ms")
             if hasattr(ui, 'ping_label') and ui.ping_label.winfo_exists():
                 if ui.current_color_scheme:
                     ui.ping_label.configure(fg=ui.current_color_scheme["fg"])
+        elif name == "rules":
+            ui.set_gamestate(r.get("gamestate"))
+        elif name == "own_elo":
+            ui.set_own_elo(r.get("own_elo"))
 
-            ui.game_type_var.set(result["game"])
-            ui.update_map_preview(result["map_name"])
-            ui.set_server_elo_info(result.get("elo_info"))
-            ui.set_own_elo(result.get("own_elo"))
-            ui.update_player_list(
-                result["players"],
-                elo_by_name=result.get("elo_by_name", {}),
-                steamid_by_name=result.get("steamid_by_name", {}),
-                team_by_name=result.get("team_by_name", {}),
-            )
+    def _render_elo_info(self, r):
+        if self._unchanged("qlstats", self._section_fingerprint("qlstats", r)):
+            self.render_stats["sections_skipped"] += 1
+            return
+        self.app.ui.set_server_elo_info(r.get("elo_info"), r.get("qlstats_status"))
 
-            if self.app.root and self.app.root.winfo_exists():
-                self.app.root.after(0, ui.auto_adjust_window_geometry)
+    def _render_player_list(self, r):
+        """Spielerliste nur bei geaenderter Struktur neu abgleichen; haben sich
+        nur die Spielzeiten geaendert, wird nur die Zeit-Spalte gesetzt."""
+        ui = self.app.ui
+        playing, spectators = r.get("playing", []), r.get("spectators", [])
+        structure, times = r.get("list_fp") or list_fingerprint(playing, spectators)
+        # Der Header-Spielstand haengt an den qlstats-Infos (siehe update_player_list).
+        fp = (tuple(r["address"]), structure, dict(ui.last_server_info or {}))
+        self._render_player_count(r)
+        if self._unchanged("list", fp):
+            if self._shown.get("times") != times:
+                self._shown["times"] = times
+                ui.update_player_durations(playing, spectators)
+                self.render_stats["list_times_only"] += 1
+            else:
+                self.render_stats["list_skipped"] += 1
+            return
+        self._shown["times"] = times
+        ui.update_player_list(playing, spectators)
 
-            self.app.root.title(
-                f"{config.APP_NAME} – {result['player_count']}/{result['max_players']}"
-            )
-            if self.app.tray_icon and hasattr(self.app.tray_icon, 'update_menu'):
-                self.app.tray_icon.title = (
-                    f"Players: {result['player_count']}/{result['max_players']}"
-                )
+    def _render_player_count(self, r):
+        count = f"{r['player_count']}/{r['max_players']}"
+        if self._shown.get("count") == count:
+            return
+        self._shown["count"] = count
+        ui = self.app.ui
+        ui.player_count_var.set(count)
+        self.app.root.title(f"{config.APP_NAME} – {count}")
+        if self.app.tray_icon and hasattr(self.app.tray_icon, 'update_menu'):
+            self.app.tray_icon.title = f"Players: {count}"
+
+    def _render_result(self, result, done=()):
+        """Zeigt ein Ergebnis-Dict in der UI an (Hauptthread). Teile in done
+        wurden bereits gestreamt und werden uebersprungen, unveraenderte Teile
+        ebenso (siehe _render_section)."""
+        ui = self.app.ui
+
+        if result["ok"]:
+            for name in ("info", "ping", "rules", "own_elo"):
+                if name not in done:
+                    self._render_section(name, result)
+            # Server-Info vor der Liste setzen (Spielstand im Header).
+            if "qlstats" not in done:
+                self._render_elo_info(result)
+            if "players" not in done or "qlstats" not in done:
+                self._render_player_list(result)
+
+            if self._layout_dirty and self.app.root and self.app.root.winfo_exists():
+                self._layout_dirty = False
+                self.app.root.after(0, ui.auto_adjust_window_geometry)
         else:
             self.handle_connection_error(result.get("msg", "Error."))
             ui.set_own_elo(result.get("own_elo"))
 
         # Aktiven Favoriten-Button markieren (Server kann gewechselt haben).
-        ui.refresh_hotkey_buttons()
-
-        # Nächste Abfrage planen (immer im Hauptthread)
-        if self.app.root and self.app.root.winfo_exists() and not self.app.shutting_down:
-            self.refresh_job = self.app.root.after(
-                max(1000, self.app.REFRESH_INTERVAL * 1000), self.fetch_server_info
-            )
+        if self._shown.get("hotkeys") != tuple(self.app.SERVER_ADDRESS):
+            self._shown["hotkeys"] = tuple(self.app.SERVER_ADDRESS)
+            ui.refresh_hotkey_buttons()
 
     def handle_connection_error(self, msg):
         ui = self.app.ui
+        self._shown.clear()
+        self._layout_dirty = True
         ui.error_message_var.set(msg)
         ui.ping_var.set("N/A")
         ui.server_name_var.set("Connection failed")
@@ -265,9 +1106,38 @@ class ServerHandler:
         ui.game_type_var.set("N/A")
         ui.set_server_elo_info(None)
         ui.set_placeholder_or_clear_preview()
-        ui.update_player_list([], elo_by_name={}, steamid_by_name={}, team_by_name={})
+        ui.update_player_list([], [])
+
+    def _ping_tick(self):
+        """Gibt dem PingSampler die aktuellen Ziele und zeigt dessen Werte
+        an (Hauptthread, im Takt von PING_SAMPLE_INTERVAL)."""
+        self._ping_job = None
+        if self.app.shutting_down or not self.app.root.winfo_exists():
+            return
+        current = tuple(self.app.SERVER_ADDRESS)
+        targets = [current]
+        if config.PING_SAMPLE_FAVORITES:
+            targets += self._dashboard_addresses()
+        # Im Tray wird nicht gemessen.
+        self.pinger.set_targets(targets if self._window_visible() else ())
+        ui = self.app.ui
+        ui.set_ping_stats(self.pinger.stats(current), self.pinger.sparkline(current))
+        if config.PING_SAMPLE_FAVORITES and self.dashboard_enabled():
+            ui.update_dashboard()
+        self._ping_job = self.app.root.after(int(config.PING_SAMPLE_INTERVAL * 1000), self._ping_tick)
 
     def stop_refresh(self):
+        if self._task is not None:
+            self._task.cancel()
+        self.pinger.stop()
+        if self.phase_stats is not None:
+            self.phase_stats.close()
+        try:
+            if self._ping_job is not None:
+                self.app.root.after_cancel(self._ping_job)
+                self._ping_job = None
+        except Exception:
+            pass
         try:
             if self.refresh_job is not None:
                 self.app.root.after_cancel(self.refresh_job)
@@ -292,5 +1162,6 @@ class ServerHandler:
         ui.ping_var.set("...")
         ui.game_type_var.set("...")
         ui.set_server_elo_info(None)
+        self._shown.clear()
 
         self.fetch_server_info()
\ No newline at end of file
@@ -0,0 +1,266 @@
+# standin.py
+"""Lokale Stand-in-Server für Entwicklung und Tests ohne echten QL-Server.
+
+A2SStandIn beantwortet A2S_INFO/PLAYER/RULES (mit Challenge-Runde, optional
+als gesplittete, auch bzip2-komprimierte Pakete) und getchallenge auf einem
+lokalen UDP-Port.
+QlstatsStandIn ist ein lokaler HTTP/1.1-Server (Keep-Alive, gzip, ETag) mit
+den qlstats-Routen /api/server/<ip:port>/players und /elo(_b)/<steamid>.
+
+    python standin.py [port]
+"""
+import bz2
+import gzip
+import hashlib
+import http.server
+import json
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+
+OOB = b"\xff\xff\xff\xff"
+SPLIT = b"\xfe\xff\xff\xff"
+
+
+def _cstr(text):
+    return text.encode("utf-8") + b"\x00"
+
+
+class A2SStandIn:
+    def __init__(self, host="127.0.0.1", port=0, server_name="^1Stand-in ^7Server",
+                 map_name="campgrounds", max_players=16, players=None, rules=None,
+                 challenge=0x1234ABCD, split_size=None, compress=False, delay=0.0):
+        self.host = host
+        self.port = port
+        self.server_name = server_name
+        self.map_name = map_name
+        self.max_players = max_players
+        # (name, score, duration)
+        self.players = list(players) if players is not None else [
+            ("^1Red^7Player", 12, 600.0), ("BluePlayer", 7, 1200.0), ("Spec", 0, 90.0),
+        ]
+        self.rules = dict(rules) if rules is not None else {"g_gameState": "IN_PROGRESS"}
+        self.challenge = challenge
+        self.split_size = split_size   # Antworten > split_size als Split-Pakete
+        self.compress = compress       # Split-Antworten bzip2-komprimiert
+        self.delay = delay             # künstliche Latenz pro Antwort (s)
+        self.requests = []             # empfangene Anfragen (Typ-Byte bzw. b"getchallenge")
+        self._sock = None
+        self._thread = None
+        self._running = False
+        self._msg_id = 0
+
+    @property
+    def address(self):
+        return (self.host, self.port)
+
+    def start(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((self.host, self.port))
+        self._sock.settimeout(0.2)
+        self.port = self._sock.getsockname()[1]
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="a2s-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(1.0)
+        if self._sock is not None:
+            self._sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Antworten ---
+    def _info(self):
+        return (b"\x49\x11" + _cstr(self.server_name) + _cstr(self.map_name) + _cstr("baseq3")
+                + _cstr("Quake Live") + struct.pack("<HBBB", 282440 & 0xFFFF, len(self.players), self.max_players, 0)
+                + b"dl\x00\x01" + _cstr("1069"))
+
+    def _players(self):
+        body = bytes([0x44, len(self.players)])
+        for i, (name, score, duration) in enumerate(self.players):
+            body += bytes([i]) + _cstr(name) + struct.pack("<if", score, duration)
+        return body
+
+    def _rules(self):
+        body = b"\x45" + struct.pack("<h", len(self.rules))
+        for key, value in self.rules.items():
+            body += _cstr(key) + _cstr(str(value))
+        return body
+
+    def _reply(self, body, addr):
+        if self.delay:
+            time.sleep(self.delay)
+        packet = OOB + body
+        if not self.split_size or len(packet) <= self.split_size:
+            self._sock.sendto(packet, addr)
+            return
+        self._msg_id += 1
+        msg_id = self._msg_id
+        if self.compress:
+            # Source-Format: Größe und CRC32 der entpackten Antwort vorweg.
+            packet = struct.pack("<II", len(packet), zlib.crc32(packet)) + bz2.compress(packet)
+            msg_id |= 0x80000000
+        chunks = [packet[i:i + self.split_size] for i in range(0, len(packet), self.split_size)]
+        for number, chunk in enumerate(chunks):
+            header = SPLIT + struct.pack("<IBBH", msg_id, len(chunks), number, self.split_size)
+            self._sock.sendto(header + chunk, addr)
+
+    def _challenge_ok(self, data):
+        return len(data) >= 4 and struct.unpack_from("<I", data, len(data) - 4)[0] == self.challenge
+
+    def _handle(self, data, addr):
+        if not data.startswith(OOB):
+            return
+        data = data[4:]
+        if data.startswith(b"getchallenge"):
+            self.requests.append(b"getchallenge")
+            self._reply(b"challengeResponse 123456789", addr)
+            return
+        kind = data[:1]
+        self.requests.append(kind)
+        builders = {b"\x54": self._info, b"\x55": self._players, b"\x56": self._rules}
+        if kind not in builders:
+            return
+        payload = data[1:]
+        if kind == b"\x54":
+            payload = payload[len(b"Source Engine Query\x00"):]
+        if not self._challenge_ok(payload):
+            self._reply(b"\x41" + struct.pack("<I", self.challenge), addr)
+            return
+        self._reply(builders[kind](), addr)
+
+    def _serve(self):
+        while self._running:
+            try:
+                data, addr = self._sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._handle(data, addr)
+
+
+class _QlstatsHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"     # Keep-Alive
+
+    def setup(self):
+        super().setup()
+        self.server.standin.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        standin = self.server.standin
+        standin.requests.append(self.path)
+        if standin.delay:
+            time.sleep(standin.delay)
+        data = standin.route(self.path)
+        if data is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(data).encode("utf-8")
+        etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+        if standin.etag and self.headers.get("If-None-Match") == etag:
+            standin.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if standin.etag:
+            self.send_header("ETag", etag)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class QlstatsStandIn:
+    """Lokaler Ersatz für qlstats.net. players: [(name, steamid, team, rating)],
+    own_elo: {gametype: (elo, games)}. Zählt Verbindungen (= Handshakes),
+    Anfragen und 304-Antworten."""
+
+    def __init__(self, host="127.0.0.1", port=0, players=None, own_elo=None, etag=True, delay=0.0):
+        self.host = host
+        self.port = port
+        self.players = list(players) if players is not None else [
+            ("RedPlayer", "76561198000000001", 1, 1650), ("BluePlayer", "76561198000000002", 2, 1420),
+            ("Spec", "76561198000000003", 3, None),
+        ]
+        self.own_elo = dict(own_elo) if own_elo is not None else {"ca": (1600, 120)}
+        self.etag = etag
+        self.delay = delay
+        self.requests = []
+        self.connections = 0
+        self.not_modified = 0
+        self._server = None
+
+    @property
+    def address(self):
+        return (self.host, self.port)
+
+    @property
+    def api_base(self):
+        """Wert für config.QLSTATS_API_BASE."""
+        return "http://{}:{}/api".format(self.host, self.port)
+
+    def route(self, path):
+        if path.startswith("/api/server/") and path.endswith("/players"):
+            players = [{"name": n, "steamid": sid, "team": team, "rating": rating}
+                       for n, sid, team, rating in self.players]
+            return {"ok": True, "players": players, "serverinfo": {"gt": "ca", "rating": "B"}}
+        if path.startswith("/elo/") or path.startswith("/elo_b/"):
+            entry = {gt: {"elo": elo, "games": games} for gt, (elo, games) in self.own_elo.items()}
+            return {"players": [entry]}
+        return None
+
+    def start(self):
+        self._server = http.server.ThreadingHTTPServer((self.host, self.port), _QlstatsHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="qlstats-standin", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 27960
+    server = A2SStandIn(port=port).start()
+    qlstats = QlstatsStandIn(port=port + 1).start()
+    print("A2S stand-in listening on {}:{}".format(*server.address))
+    print("qlstats stand-in: QLSTATS_API_BASE = {}".format(qlstats.api_base))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        qlstats.stop()
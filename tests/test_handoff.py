@@ -0,0 +1,92 @@
+"""Handoff-Takt mit einem Tk-Ersatz, der after()-Aufrufe nur aufzeichnet."""
+import pytest
+
+from handoff import Handoff
+
+
+class FakeRoot:
+    def __init__(self):
+        self.viewable = True
+        self.jobs = {}              # id -> (delay_ms, callback)
+        self._next_id = 0
+
+    def after(self, delay_ms, callback):
+        self._next_id += 1
+        self.jobs[self._next_id] = (delay_ms, callback)
+        return self._next_id
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def winfo_viewable(self):
+        return self.viewable
+
+    def delay(self):
+        (delay_ms, _), = self.jobs.values()
+        return delay_ms
+
+    def fire(self):
+        (job, (_, callback)), = self.jobs.items()
+        del self.jobs[job]
+        callback()
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def handoff(root):
+    return Handoff(root, interval_ms=50, idle_ms=250, hidden_ms=500).start()
+
+
+def test_idle_pump_backs_off(root, handoff):
+    assert root.delay() == 50
+    root.fire()
+    assert root.delay() == 250
+    root.viewable = False
+    root.fire()
+    assert root.delay() == 500
+
+
+def test_pending_items_keep_fast_interval(root, handoff):
+    root.fire()
+    calls = []
+    handoff.post(lambda: calls.append(1))
+    root.fire()
+    assert calls == [1]
+    # Direkt nach einer Auslieferung bleibt der Takt schnell, danach Leerlauf.
+    assert root.delay() == 50
+    root.fire()
+    assert root.delay() == 250
+
+
+def test_wake_pulls_idle_timer_forward(root, handoff):
+    root.fire()
+    assert root.delay() == 250
+    handoff.wake(hold_ms=60000)
+    assert root.delay() == 50
+    root.fire()
+    assert root.delay() == 50
+
+
+def test_busy_keeps_fast_interval(root, handoff):
+    running = [True]
+    handoff.busy = lambda: running[0]
+    root.fire()
+    assert root.delay() == 50
+    running[0] = False
+    root.fire()
+    assert root.delay() == 250
+
+
+def test_coalesced_and_stale(root, handoff):
+    calls = []
+    handoff.post(lambda: calls.append("a1"), key="a")
+    handoff.post(lambda: calls.append("b"), stale=lambda: True)
+    handoff.post(lambda: calls.append("a2"), key="a")
+    root.fire()
+    assert calls == ["a2"]
+    stats = handoff.snapshot()
+    assert (stats["coalesced"], stats["stale"], stats["delivered"]) == (1, 1, 1)
@@ -0,0 +1,34 @@
+"""Adressauswahl von headless.py."""
+import argparse
+
+import pytest
+
+import headless
+import utils
+
+
+def args(servers=(), favorites=False):
+    return argparse.Namespace(servers=list(servers), favorites=favorites)
+
+
+def test_invalid_favorites_are_skipped(monkeypatch, capsys):
+    monkeypatch.setattr(utils, "load_favorites", lambda: {
+        "1": "10.0.0.1:27960", "2": "broken", "3": "10.0.0.2:abc", "4": "10.0.0.1:27960", "5": "10.0.0.3:27961",
+    })
+    addresses = headless._addresses(args(favorites=True), {})
+    assert addresses == [("10.0.0.1", 27960), ("10.0.0.3", 27961)]
+    err = capsys.readouterr().err
+    assert "favorite 2" in err and "favorite 3" in err
+
+
+def test_invalid_command_line_address_is_an_error(monkeypatch):
+    monkeypatch.setattr(utils, "load_favorites", lambda: {})
+    with pytest.raises(ValueError):
+        headless._addresses(args(["10.0.0.1"]), {})
+
+
+def test_no_valid_favorite_left_exits(monkeypatch):
+    monkeypatch.setattr(utils, "load_favorites", lambda: {"1": "broken"})
+    monkeypatch.setattr(utils, "load_app_config", lambda: {})
+    with pytest.raises(SystemExit):
+        headless.main(["--favorites", "--once"])
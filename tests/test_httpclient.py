@@ -0,0 +1,78 @@
+"""HttpPool gegen den lokalen qlstats-Stand-in (standin.QlstatsStandIn)."""
+import json
+import time
+
+import pytest
+
+import standin
+from httpclient import HttpPool
+
+
+@pytest.fixture
+def qlstats():
+    with standin.QlstatsStandIn() as server:
+        yield server
+
+
+@pytest.fixture
+def pool():
+    pool = HttpPool()
+    yield pool
+    pool.close()
+
+
+def players_url(server):
+    return server.api_base + "/server/127.0.0.1:27960/players"
+
+
+def test_keep_alive_reuses_connection(qlstats, pool):
+    for _ in range(3):
+        data = pool.get_json(players_url(qlstats), timeout=2.0)
+        assert data["ok"]
+    assert qlstats.connections == 1
+    assert pool.stats["connections"] == 1
+    assert pool.stats["reused"] == 2
+
+
+def test_gzip_body_is_decoded(qlstats, pool):
+    qlstats.players = [("Player{}".format(i), str(76561198000000000 + i), 1 + i % 2, 1500) for i in range(50)]
+    data = pool.get_json(players_url(qlstats), timeout=2.0)
+    assert [p["name"] for p in data["players"]] == [p[0] for p in qlstats.players]
+    stats = pool.snapshot()
+    assert stats["bytes_wire"] < stats["bytes_body"] == len(json.dumps(qlstats.route("/api/server/x/players")))
+
+
+def test_not_modified_returns_cached_body(qlstats, pool):
+    first = pool.get_json(players_url(qlstats), timeout=2.0)
+    second = pool.get_json(players_url(qlstats), timeout=2.0)
+    assert second == first
+    assert qlstats.not_modified == 1
+    assert pool.stats["not_modified"] == 1
+
+
+def test_changed_body_replaces_cached_one(qlstats, pool):
+    pool.get_json(players_url(qlstats), timeout=2.0)
+    qlstats.players = [("NewPlayer", "76561198000000009", 1, 1700)]
+    data = pool.get_json(players_url(qlstats), timeout=2.0)
+    assert [p["name"] for p in data["players"]] == ["NewPlayer"]
+    assert qlstats.not_modified == 0
+
+
+def test_retries_once_when_server_closed_idle_connection(qlstats, pool, monkeypatch):
+    # Der Stand-in schließt Keep-Alive-Verbindungen nach 0.2 s Leerlauf.
+    monkeypatch.setattr(standin._QlstatsHandler, "timeout", 0.2)
+    pool.get_json(players_url(qlstats), timeout=2.0)
+    time.sleep(0.5)
+    data = pool.get_json(players_url(qlstats), timeout=2.0)
+    assert data["ok"]
+    assert pool.stats["retries"] == 1
+    assert pool.stats["connections"] == 2
+    assert qlstats.connections == 2
+
+
+def test_fresh_connection_error_is_not_retried(pool):
+    with standin.QlstatsStandIn() as server:
+        url = players_url(server)
+    with pytest.raises(OSError):
+        pool.get_json(url, timeout=1.0)
+    assert pool.stats["retries"] == 0
@@ -0,0 +1,42 @@
+"""MapshotIndex: Index ohne Groß-/Kleinschreibung und Thumbnail-Aufräumen."""
+import os
+
+import pytest
+
+from mapshots import MapshotIndex
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def write_image(path, size=(64, 48)):
+    Image.new("RGB", size, (200, 40, 40)).save(path)
+
+
+def test_lookup_ignores_case(tmp_path):
+    write_image(tmp_path / "CampGrounds.jpg")
+    index = MapshotIndex(str(tmp_path), str(tmp_path / "thumbs"), (32, 24))
+    index.rescan()
+    index.ready.set()
+    path, mtime = index.lookup("campgrounds")
+    assert path == str(tmp_path / "CampGrounds.jpg")
+    assert index.lookup("CAMPGROUNDS") == (path, mtime)
+    assert index.lookup("bloodrun") == (None, None)
+
+
+def test_thumbnails_in_mapshot_dir_keep_originals(tmp_path):
+    # MAPSHOT_THUMB_DIR zeigt auf den Mapshot-Ordner selbst.
+    write_image(tmp_path / "campgrounds.jpg")
+    write_image(tmp_path / "bloodrun.png")
+    (tmp_path / "notes.jpg").write_bytes(b"not ours")
+    (tmp_path / "oldmap-1.thumb.jpg").write_bytes(b"stale thumbnail")
+    index = MapshotIndex(str(tmp_path), str(tmp_path), (32, 24))
+    index.rescan()
+    index.build_thumbnails()
+    names = set(os.listdir(tmp_path))
+    assert {"campgrounds.jpg", "bloodrun.png", "notes.jpg"} <= names
+    assert "oldmap-1.thumb.jpg" not in names
+    thumbs = sorted(n for n in names if n.endswith(".thumb.jpg"))
+    assert [n.split("-")[0] for n in thumbs] == ["bloodrun", "campgrounds"]
+    # Thumbnails selbst landen nicht im Index.
+    index.rescan()
+    assert len(index) == 3
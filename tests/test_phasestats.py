@@ -0,0 +1,63 @@
+"""Phasen-Statistik (phasestats.py) und der Text des Debug-Fensters."""
+import socket
+
+from phasestats import ERROR, OK, TIMEOUT, PhaseRing, PhaseStats, outcome_status
+
+A = ("10.0.0.1", 27960)
+B = ("10.0.0.2", 27961)
+
+
+def stats():
+    return PhaseStats(window=4, log_file="")
+
+
+def test_outcome_status():
+    assert outcome_status(True, 12) == OK
+    assert outcome_status(False, socket.timeout()) == TIMEOUT
+    assert outcome_status(False, ValueError()) == ERROR
+
+
+def test_ring_keeps_last_window_values():
+    ring = PhaseRing(4)
+    assert ring.stats() is None
+    for ms in (100.0, 1.0, 2.0, 3.0, 4.0):
+        ring.add(ms)
+    st = ring.stats()
+    assert st["n"] == 4
+    assert (st["p50"], st["p95"], st["max"]) == (2.0, 4.0, 4.0)
+
+
+def test_percentiles_errors_and_timeouts():
+    ps = stats()
+    ps.record(A, {"info": (10.0, OK), "qlstats": (50.0, OK)})
+    ps.record(A, {"info": (20.0, OK), "qlstats": (1000.0, TIMEOUT)})
+    ps.record(A, {"info": (30.0, ERROR)})
+    ps.record(A, {"info": (40.0, OK)})
+    info = ps.stats(A)["info"]
+    assert (info["n"], info["p50"], info["p95"], info["max"]) == (4, 20.0, 40.0, 40.0)
+    assert (info["errors"], info["timeouts"]) == (1, 0)
+    qlstats = ps.stats(A)["qlstats"]
+    assert (qlstats["n"], qlstats["timeouts"]) == (2, 1)
+
+
+def test_stats_follow_phase_order():
+    ps = stats()
+    ps.record(A, {"total": (5.0, OK), "ping": (1.0, OK), "info": (2.0, OK)})
+    assert list(ps.stats(A)) == ["info", "ping", "total"]
+    assert ps.stats(B) == {}
+
+
+def test_report():
+    ps = stats()
+    assert ps.report() == "No refresh measured yet."
+    ps.record(A, {"info": (12.4, OK), "own_elo": (800.0, TIMEOUT)})
+    ps.record(B, {"info": (7.0, ERROR)})
+    lines = ps.report([B, A]).splitlines()
+    assert lines[0] == "10.0.0.2:27961"
+    assert lines[1].split() == ["phase", "n", "p50", "p95", "max", "err", "t/o"]
+    assert lines[2].split() == ["info", "1", "7", "7", "7", "1", "0"]
+    assert lines[3] == ""
+    assert lines[4] == "10.0.0.1:27960"
+    assert lines[7].split() == ["own_elo", "1", "800", "800", "800", "0", "1"]
+    # Feste Breite: Kopf und Zeilen sind gleich lang.
+    assert len({len(line) for line in lines[1:3] + lines[5:8]}) == 1
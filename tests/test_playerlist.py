@@ -0,0 +1,122 @@
+"""Spielerlisten-Modell (playerlist.py) und Namens-Normalisierung."""
+import pytest
+
+import config
+import utils
+from playerlist import build_player_list, list_fingerprint
+from udp_engine import Player
+
+
+def player(name, score=0, duration=600.0, index=0):
+    return Player(index, name, score, duration)
+
+
+def qlstats(*entries):
+    """entries: (name, team, elo) -> elo/steamid/team je normalisiertem Namen."""
+    elo, sids, team = {}, {}, {}
+    for i, (name, team_id, rating) in enumerate(entries):
+        key = utils.normalize_name(name)
+        elo[key] = rating
+        sids[key] = str(76561198000000000 + i)
+        team[key] = team_id
+    return elo, sids, team
+
+
+def names(records):
+    return [r.name for r in records]
+
+
+@pytest.mark.parametrize("raw, key", [
+    ("^1Lo^7rem", "lorem"),
+    ("<LoremIpsum>", "loremipsum"),
+    ("ANDY'S  LANDLORD", "andys landlord"),
+    ("^^1caret", "^1caret"),
+    ("  ^3Pad  ", "pad"),
+])
+def test_normalize_name(raw, key):
+    assert utils.normalize_name(raw) == key
+
+
+def test_ordering_by_team_score_and_time():
+    players = [player("blue_low", 3), player("red_low", 1), player("blue_high", 20),
+               player("red_high", 15), player("spec_new", 0, 60.0), player("spec_old", 0, 3000.0)]
+    data = qlstats(("blue_low", 2, 1500), ("red_low", 1, 1400), ("blue_high", 2, 1600),
+                   ("red_high", 1, 1700), ("spec_new", -1, 1200), ("spec_old", 3, 1300))
+    playing, spectators = build_player_list(players, *data)
+    assert names(playing) == ["red_high", "red_low", "blue_high", "blue_low"]
+    assert names(spectators) == ["spec_old", "spec_new"]
+    assert [r.elo for r in playing] == [1700, 1400, 1600, 1500]
+
+
+def test_without_qlstats_negative_score_is_spectator():
+    playing, spectators = build_player_list([player("a", 5), player("b", -1)])
+    assert names(playing) == ["a"] and names(spectators) == ["b"]
+    assert playing[0].team is None and playing[0].steamid is None
+
+
+def test_bots_and_ghosts():
+    bot = sorted(config.BOT_NAMES)[0]
+    players = [player("real", 4), player(bot, 10), player("ghost", 0, 7200.0)]
+    playing, spectators = build_player_list(players, *qlstats(("real", 1, 1500)))
+    assert names(playing) == ["real"]
+    assert names(spectators) == [bot]
+    assert spectators[0].steamid is None
+
+
+def test_fingerprint_time_only_change():
+    data = qlstats(("a", 1, 1500), ("b", 2, 1600))
+    before = list_fingerprint(*build_player_list([player("a", 1, 60.0), player("b", 2, 60.0)], *data))
+    after = list_fingerprint(*build_player_list([player("a", 1, 125.0), player("b", 2, 125.0)], *data))
+    assert before[0] == after[0]
+    assert before[1] != after[1]
+
+
+def test_fingerprint_team_change_reorders():
+    players = [player("a", 5), player("b", 3)]
+    playing, _ = build_player_list(players, *qlstats(("a", 1, 1500), ("b", 2, 1500)))
+    switched, _ = build_player_list(players, *qlstats(("a", 2, 1500), ("b", 1, 1500)))
+    assert names(playing) == ["a", "b"] and names(switched) == ["b", "a"]
+    assert list_fingerprint(playing, [])[0] != list_fingerprint(switched, [])[0]
+
+
+def test_fingerprint_rename_and_removal():
+    data = qlstats(("a", 1, 1500), ("b", 1, 1500))
+    base = build_player_list([player("a", 5), player("b", 3)], *data)
+    renamed = build_player_list([player("^1a", 5), player("b", 3)], *data)
+    removed = build_player_list([player("a", 5)], *data)
+    # Farbcodes ändern den Anzeigenamen, nicht den qlstats-Schlüssel.
+    assert renamed[0][0].key == base[0][0].key == "a"
+    assert renamed[0][0].elo == 1500
+    assert list_fingerprint(*renamed)[0] != list_fingerprint(*base)[0]
+    assert names(removed[0]) == ["a"]
+    assert list_fingerprint(*removed)[0] != list_fingerprint(*base)[0]
+
+
+def keys(playing, spectators):
+    from ui import UIManager     # nur die statische Methode, kein Tk-Fenster
+    return [(key, r.name, spec) for key, r, spec in UIManager._keyed_players(playing, spectators)]
+
+
+def test_row_keys_survive_reordering_and_team_change():
+    players = [player("a", 5), player("b", 3), player("c", 0)]
+    before = keys(*build_player_list(players, *qlstats(("a", 1, 1500), ("b", 2, 1500), ("c", -1, 1500))))
+    after = keys(*build_player_list(players, *qlstats(("a", 2, 1500), ("b", 1, 1500), ("c", 1, 1500))))
+    assert before == [(("a", 0), "a", False), (("b", 0), "b", False), (("c", 0), "c", True)]
+    # Gleiche Zeilen-Schlüssel, nur Reihenfolge und Spectator-Status ändern sich.
+    assert {k for k, _, _ in before} == {k for k, _, _ in after}
+    assert [name for _, name, _ in after] == ["b", "c", "a"]
+    assert all(not spec for _, _, spec in after)
+
+
+def test_row_keys_for_duplicates_renames_and_removals():
+    data = qlstats(("dup", 1, 1500))
+    base = keys(*build_player_list([player("dup", 5), player("^2dup", 1)], *data))
+    assert [k for k, _, _ in base] == [("dup", 0), ("dup", 1)]
+    # Nur Farbcodes geändert: gleicher Schlüssel, die Zeile bleibt bestehen.
+    recolored = keys(*build_player_list([player("^3dup", 5), player("^2dup", 1)], *data))
+    assert [k for k, _, _ in recolored] == [("dup", 0), ("dup", 1)]
+    # Echte Umbenennung bzw. Abgang: alter Schlüssel fällt weg.
+    renamed = keys(*build_player_list([player("other", 5), player("^2dup", 1)], *data))
+    assert ("dup", 1) not in {k for k, _, _ in renamed}
+    removed = keys(*build_player_list([player("dup", 5)], *data))
+    assert [k for k, _, _ in removed] == [("dup", 0)]
@@ -0,0 +1,82 @@
+"""ServerHandler-Teile, die ohne Netz und Fenster laufen."""
+import config
+from server import ServerHandler, _QlstatsState
+
+
+def qlstats_delays(monkeypatch, outcomes):
+    monkeypatch.setattr(config, "BACKOFF_JITTER", 0.0)
+    state = _QlstatsState()
+    delays = []
+    for untracked in outcomes:
+        ServerHandler._qlstats_failed(state, untracked)
+        delays.append(round(state.backoff.remaining()))
+    return state, delays
+
+
+def test_untracked_backoff_grows_to_cap(monkeypatch):
+    # Nie geantwortet: nach QLSTATS_UNTRACKED_AFTER Fehlschlägen gilt der
+    # Server als ungetrackt und der Abstand wächst bis zum Maximum.
+    state, delays = qlstats_delays(monkeypatch, [False] * 10)
+    base, maximum = config.QLSTATS_UNTRACKED_BACKOFF
+    assert delays[:2] == [config.QLSTATS_ERROR_BACKOFF[0], 2 * config.QLSTATS_ERROR_BACKOFF[0]]
+    untracked = delays[config.QLSTATS_UNTRACKED_AFTER - 1:]
+    assert untracked[0] == base
+    assert untracked == sorted(untracked)
+    assert untracked[-1] == maximum
+    assert state.untracked
+
+
+def test_untracked_reply_then_errors_stays_untracked(monkeypatch):
+    state, delays = qlstats_delays(monkeypatch, [True, False, False])
+    base = config.QLSTATS_UNTRACKED_BACKOFF[0]
+    assert delays == [base, 2 * base, 4 * base]
+    assert state.untracked
+
+
+def test_failed_rules_query_keeps_last_gamestate():
+    handler = ServerHandler.__new__(ServerHandler)
+    handler._last_gamestate = None
+    match_ends = []
+    handler.invalidate_own_elo = lambda match_end=False: match_ends.append(match_end)
+    address = ("10.0.0.1", 27960)
+    for gamestate in ("Active", "", "Warmup"):
+        handler._track_gamestate(address, gamestate)
+    assert match_ends == [True]
+
+
+def test_collect_result_records_phase_statuses():
+    import time
+    from concurrent.futures import Future
+
+    from phasestats import PhaseStats, SKIPPED, TIMEOUT
+    from server import QueryTask
+
+    def done(value):
+        fut = Future()
+        fut.set_result(value)
+        return fut
+
+    handler = ServerHandler.__new__(ServerHandler)
+    handler.phase_stats = PhaseStats(window=4, log_file="")
+    address = ("10.0.0.1", 27960)
+    task = QueryTask()
+    # qlstats hat seinen Fehler selbst abgefangen, own_elo kam aus dem Cache.
+    task.http_traces[(address, "qlstats")] = {"status": TIMEOUT}
+    task.http_traces["own_elo"] = {"status": SKIPPED}
+    futures = {
+        "info": done((False, ValueError("bad packet"), 12.0)),
+        "ping": done((True, None, 1000.0)),
+        "qlstats": done((True, ({}, {}, {}, None, None), 2000.0)),
+        "own_elo": done((True, None, 0.1)),
+    }
+    handler._section_fields = lambda name, outcome: {}
+    result = handler._collect_result(address, futures, time.perf_counter(), task)
+    assert not result["ok"]
+    stats = handler.phase_stats.stats(address)
+    assert set(stats) == {"info", "ping", "qlstats", "total"}
+    assert stats["info"]["errors"] == 1
+    assert stats["ping"]["timeouts"] == 1       # best_ping: None = keine Antwort
+    assert stats["qlstats"]["timeouts"] == 1
+    report = handler.phase_stats.report([address])
+    assert report.splitlines()[0] == "10.0.0.1:27960"
+    assert "own_elo" not in report
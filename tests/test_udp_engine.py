@@ -0,0 +1,163 @@
+"""UdpEngine gegen den lokalen A2S-Stand-in (standin.A2SStandIn)."""
+import socket
+import time
+
+import pytest
+
+import standin
+from udp_engine import UdpEngine
+
+PLAYERS = [("Player{:02d}^7 with a rather long name".format(i), i, 60.0 * i) for i in range(40)]
+
+
+@pytest.fixture
+def engine():
+    engine = UdpEngine(sockets=3).start()
+    yield engine
+    engine.stop()
+
+
+def run(engine, coro, timeout=5.0):
+    return engine.submit(coro).result(timeout)
+
+
+def free_udp_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_info_players_rules(engine):
+    with standin.A2SStandIn() as server:
+        info = run(engine, engine.info(server.address, 2.0))
+        players = run(engine, engine.players(server.address, 2.0))
+        rules = run(engine, engine.rules(server.address, 2.0))
+    assert info.server_name == server.server_name
+    assert info.map_name == "campgrounds"
+    assert [p.name for p in players] == [p[0] for p in server.players]
+    assert rules == {"g_gameState": "IN_PROGRESS"}
+
+
+def test_challenge_is_remembered(engine):
+    with standin.A2SStandIn() as server:
+        first, second = {}, {}
+        run(engine, engine.players(server.address, 2.0, first))
+        run(engine, engine.players(server.address, 2.0, second))
+        requests = list(server.requests)
+    # Erst Challenge anfordern, dann die eigentliche Anfrage; danach reicht
+    # ein Round Trip mit der gemerkten Challenge.
+    assert requests == [b"\x55", b"\x55", b"\x55"]
+    assert first["round_trips"] == 2 and "saved_rtts" not in first
+    assert second["round_trips"] == 1 and second["saved_rtts"] == 1
+
+
+def test_rejected_challenge_is_renewed(engine):
+    with standin.A2SStandIn() as server:
+        run(engine, engine.rules(server.address, 2.0))
+        server.challenge = 0x0BADF00D
+        trace = {}
+        rules = run(engine, engine.rules(server.address, 2.0, trace))
+    assert rules == {"g_gameState": "IN_PROGRESS"}
+    assert trace["round_trips"] == 2
+    assert engine._challenges[server.address] == 0x0BADF00D
+
+
+def test_split_packets_are_reassembled(engine):
+    with standin.A2SStandIn(players=PLAYERS, split_size=200) as server:
+        players = run(engine, engine.players(server.address, 2.0))
+    assert [(p.name, p.score) for p in players] == [(p[0], p[1]) for p in PLAYERS]
+
+
+def test_bzip2_split_packets_are_decompressed(engine):
+    with standin.A2SStandIn(players=PLAYERS, split_size=200, compress=True) as server:
+        players = run(engine, engine.players(server.address, 2.0))
+    assert [(p.name, p.score) for p in players] == [(p[0], p[1]) for p in PLAYERS]
+
+
+def test_ping(engine):
+    with standin.A2SStandIn() as server:
+        ms = run(engine, engine.ping(server.address, 1.0))
+    assert 0.0 <= ms < 1000.0
+
+
+def test_ping_timeout(engine):
+    with pytest.raises(socket.timeout):
+        run(engine, engine.ping(("127.0.0.1", free_udp_port()), 0.2))
+
+
+def test_late_reply_is_not_credited_to_next_ping(engine):
+    # Der Stand-in antwortet erst nach 0.3 s (nacheinander): die Antwort auf
+    # die abgelaufene erste Probe kommt, während die zweite unterwegs ist.
+    with standin.A2SStandIn(delay=0.3) as server:
+        with pytest.raises(socket.timeout):
+            run(engine, engine.ping(server.address, 0.1, sock=0))
+        engine._rr = engine._sockets - 1    # Round Robin stünde wieder auf Socket 0
+        started = time.perf_counter()
+        ms = run(engine, engine.ping(server.address, 2.0))
+        elapsed = (time.perf_counter() - started) * 1000.0
+    assert ms > 350.0
+    assert abs(ms - elapsed) < 100.0
+    # Die späte Antwort hat den abgelaufenen Eintrag verbraucht.
+    assert (0, server.address) not in engine._pings
+
+
+def test_late_a2s_reply_is_not_credited_to_next_request():
+    # Ein Socket: die nächste Anfrage muss dasselbe (Socket, Adresse)-Paar
+    # nehmen, während die Antwort auf die abgelaufene noch unterwegs ist.
+    engine = UdpEngine(sockets=1).start()
+    try:
+        with standin.A2SStandIn(delay=0.3) as server:
+            with pytest.raises(socket.timeout):
+                run(engine, engine.rules(server.address, 0.1))
+            info = run(engine, engine.info(server.address, 2.0))
+    finally:
+        engine.stop()
+    assert info.map_name == "campgrounds"
+    assert info.ping * 1000.0 > 250.0
+    assert not engine._late
+
+
+def test_concurrent_pings_use_separate_sockets(engine):
+    with standin.A2SStandIn(delay=0.05) as server:
+        futures = [engine.submit(engine.ping(server.address, 2.0)) for _ in range(3)]
+        results = [f.result(5.0) for f in futures]
+    assert all(ms > 0.0 for ms in results)
+    assert len(server.requests) == 3
+
+
+def test_dedicated_socket_is_outside_the_pool():
+    engine = UdpEngine(sockets=2, dedicated=1).start()
+    try:
+        assert engine.dedicated_sockets == (2,)
+        assert len(engine._transports) == 3
+        picked = {engine._pick_socket(("127.0.0.1", 27960)) for _ in range(6)}
+        picked |= {engine._pick_ping_socket(("127.0.0.1", 27960)) for _ in range(6)}
+        assert picked == {0, 1}
+    finally:
+        engine.stop()
+
+
+def test_late_reply_on_fixed_socket_is_waited_for():
+    engine = UdpEngine(sockets=1, dedicated=1).start()
+    sock = engine.dedicated_sockets[0]
+    try:
+        with standin.A2SStandIn(delay=0.3) as server:
+            with pytest.raises(socket.timeout):
+                run(engine, engine.ping(server.address, 0.1, sock=sock))
+            ms = run(engine, engine.ping(server.address, 2.0, sock=sock))
+    finally:
+        engine.stop()
+    # Die späte Antwort (nach ~0.3 s) zählt nicht für die zweite Probe.
+    assert ms > 250.0
+
+
+def test_stop_closes_sockets():
+    engine = UdpEngine(sockets=2).start()
+    transports = list(engine._transports)
+    engine.stop()
+    engine._thread.join(2.0)
+    assert not engine._thread.is_alive()
+    assert all(t.is_closing() for t in transports)
+    assert all(t.get_extra_info("socket").fileno() == -1 for t in transports)
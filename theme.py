@@ -0,0 +1,119 @@
+# theme.py
+"""Registry für das Einfärben des Hauptfensters.
+
+Widgets melden sich beim Erzeugen mit einer Rolle an (register bzw. für
+fertige Teilbäume einmalig register_tree). Ein Schema-Wechsel konfiguriert
+dann nur die registrierten Widgets, jedes genau einmal, mit den Optionen
+seiner Rolle; die Optionen je Rolle werden pro Wechsel nur einmal gebaut.
+ttk-Widgets werden über benannte Styles eingefärbt.
+
+Widgets mit festen Farben (schwarze Trennlinien, Spielerliste-Spalten mit
+eigener Schriftfarbe) werden nicht oder mit einer bg-only-Rolle registriert
+und behalten so ihre Farben.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+# Rolle -> Optionen aus dem Schema
+ROLES = {
+    "bg": lambda s: {"bg": s["bg"]},
+    "label": lambda s: {"bg": s["bg"], "fg": s["fg"]},
+    "button": lambda s: {"bg": s["button_bg"], "fg": s["button_fg"], "activebackground": s["button_active"],
+                         "highlightbackground": s["bg"], "highlightthickness": 0},
+    "text": lambda s: {"bg": s["bg"], "fg": s["fg"], "highlightbackground": s["bg"]},
+    "check": lambda s: {"bg": s["bg"], "fg": s["fg"], "activebackground": s["bg"], "activeforeground": s["fg"],
+                        "selectcolor": s["info_bg"], "highlightbackground": s["bg"], "highlightthickness": 0},
+    "labelframe": lambda s: {"bg": s["bg"], "fg": s["fg"], "highlightbackground": s["bg"], "highlightthickness": 0},
+    "entry": lambda s: {"bg": s["info_bg"], "fg": s["fg"]},
+}
+
+# Standardrolle je Tk-Widgetklasse (für register_tree)
+CLASS_ROLES = {
+    "Frame": "bg", "Toplevel": "bg", "Canvas": "bg",
+    "Label": "label", "Button": "button", "Text": "text",
+    "Checkbutton": "check", "Radiobutton": "check",
+    "LabelFrame": "labelframe", "Entry": "entry",
+}
+
+
+class ThemeRegistry:
+    def __init__(self, root):
+        self.root = root
+        self.scheme = None
+        self._widgets = {}          # Widget-Pfad -> (widget, rolle oder painter)
+        self._styles = {}           # ttk-Stylename -> fn(schema) -> Optionen
+        self._style = None
+
+    # --- Anmelden ---
+    def register(self, widget, role=None, painter=None):
+        """Meldet widget an. role: Schlüssel aus ROLES (Standard nach
+        Widgetklasse); painter: fn(widget, schema) für selbst gezeichnete
+        Widgets. Mit aktivem Schema wird sofort eingefärbt."""
+        if painter is None:
+            role = role or CLASS_ROLES.get(widget.winfo_class())
+            if role is None:
+                return widget
+        self._widgets[str(widget)] = (widget, painter or role)
+        if self.scheme is not None:
+            self._paint(widget, painter or role, {}, self.scheme)
+        return widget
+
+    def register_tree(self, widget, skip=()):
+        """Meldet widget und alle Kinder mit ihrer Standardrolle an (einmalig
+        nach dem Aufbau eines Teilbaums). Bereits angemeldete Widgets und die
+        in skip behalten ihre Rolle."""
+        stack = [widget]
+        while stack:
+            w = stack.pop()
+            if w in skip:
+                continue
+            if str(w) not in self._widgets:
+                self.register(w)
+            stack.extend(w.winfo_children())
+
+    def forget(self, widget, children_only=False):
+        """Meldet widget (bzw. nur seine Kinder) samt Nachkommen ab, z.B. vor
+        dem Zerstören."""
+        path = str(widget)
+        prefix = path + "."
+        for key in [k for k in self._widgets if k.startswith(prefix) or (k == path and not children_only)]:
+            del self._widgets[key]
+
+    def style(self, name, options):
+        """Benannter ttk-Style; options: dict oder fn(schema) -> dict."""
+        if self._style is None:
+            self._style = ttk.Style(self.root)
+        self._styles[name] = options
+        if not callable(options):
+            self._style.configure(name, **options)
+        elif self.scheme is not None:
+            self._style.configure(name, **options(self.scheme))
+        return name
+
+    # --- Anwenden ---
+    def apply(self, scheme):
+        """Färbt alle registrierten Widgets mit scheme ein. Zerstörte Widgets
+        fallen dabei aus der Registry."""
+        self.scheme = scheme
+        options = {}
+        for key, (widget, role) in list(self._widgets.items()):
+            try:
+                self._paint(widget, role, options, scheme)
+            except tk.TclError:
+                del self._widgets[key]
+        for name, opts in self._styles.items():
+            if callable(opts):
+                self._style.configure(name, **opts(scheme))
+
+    @staticmethod
+    def _paint(widget, role, options, scheme):
+        if callable(role):
+            role(widget, scheme)
+            return
+        opts = options.get(role)
+        if opts is None:
+            opts = options[role] = ROLES[role](scheme)
+        widget.configure(**opts)
+
+    def __len__(self):
+        return len(self._widgets)
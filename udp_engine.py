@@ -0,0 +1,505 @@
+# udp_engine.py
+"""asyncio-Datagramm-Engine für A2S (info/players/rules) und Quake-getchallenge.
+
+Ein einziger Event-Loop-Thread bedient alle Abfragen: Viele gleichzeitige
+Anfragen laufen über wenige UDP-Sockets, Antworten werden über (Socket,
+Adresse) ihrer Anfrage zugeordnet. Challenge-Antworten (S2C_CHALLENGE) und
+gesplittete Pakete werden hier behandelt; RTTs werden pro Anfrage direkt beim
+Empfang im Loop gemessen.
+
+Challenge-Nummern werden pro Adresse gemerkt und wiederverwendet, bis der
+Server sie ablehnt: im eingeschwungenen Zustand braucht jede Abfrage nur
+einen Round Trip statt zwei.
+
+Aus anderen Threads: engine.submit(engine.info(addr, timeout)) liefert ein
+concurrent.futures.Future.
+"""
+import asyncio
+import bz2
+import socket
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+OOB = b"\xff\xff\xff\xff"
+SPLIT = b"\xfe\xff\xff\xff"
+
+A2S_INFO = b"\x54Source Engine Query\x00"
+A2S_PLAYER = b"\x55"
+A2S_RULES = b"\x56"
+GETCHALLENGE = OOB + b"getchallenge"
+
+S2C_CHALLENGE = 0x41
+INFO_RESPONSE = 0x49
+PLAYER_RESPONSE = 0x44
+RULES_RESPONSE = 0x45
+A2S_RESPONSES = frozenset((S2C_CHALLENGE, INFO_RESPONSE, PLAYER_RESPONSE, RULES_RESPONSE))
+
+NO_CHALLENGE = 0xFFFFFFFF   # players/rules: -1 fordert einen Challenge an
+MAX_CHALLENGE_RETRIES = 3
+# So lange (s) nach ihrem Timeout gehört eine Antwort (getchallenge oder A2S)
+# noch zur abgelaufenen Anfrage und wird verworfen, statt der nächsten
+# Anfrage an dieselbe Adresse über denselben Socket gutgeschrieben.
+LATE_REPLY_GRACE = 2.0
+
+# Felder wie bei python-a2s, damit der restliche Code unverändert bleibt.
+ServerInfo = namedtuple(
+    "ServerInfo",
+    "protocol server_name map_name folder game app_id player_count max_players "
+    "bot_count server_type platform password_protected vac_enabled version ping",
+)
+Player = namedtuple("Player", "index name score duration")
+
+
+class _Reader:
+    """Minimaler Little-Endian-Leser für A2S-Antworten."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def _unpack(self, fmt):
+        value = struct.unpack_from(fmt, self.data, self.pos)[0]
+        self.pos += struct.calcsize(fmt)
+        return value
+
+    def u8(self):
+        return self._unpack("<B")
+
+    def i16(self):
+        return self._unpack("<h")
+
+    def u16(self):
+        return self._unpack("<H")
+
+    def i32(self):
+        return self._unpack("<i")
+
+    def f32(self):
+        return self._unpack("<f")
+
+    def cstring(self):
+        end = self.data.find(b"\x00", self.pos)
+        if end < 0:
+            raise ValueError("Unterminated string in A2S response")
+        raw = self.data[self.pos:end]
+        self.pos = end + 1
+        return raw.decode("utf-8", errors="replace")
+
+
+def parse_info(payload, ping_ms):
+    r = _Reader(payload)
+    protocol = r.u8()
+    server_name, map_name, folder, game = r.cstring(), r.cstring(), r.cstring(), r.cstring()
+    app_id = r.u16()
+    player_count, max_players, bot_count = r.u8(), r.u8(), r.u8()
+    server_type, platform = chr(r.u8()).lower(), chr(r.u8()).lower()
+    password_protected, vac_enabled = bool(r.u8()), bool(r.u8())
+    version = r.cstring()
+    return ServerInfo(protocol, server_name, map_name, folder, game, app_id,
+                      player_count, max_players, bot_count, server_type, platform,
+                      password_protected, vac_enabled, version, ping_ms / 1000.0)
+
+
+def parse_players(payload):
+    r = _Reader(payload)
+    count = r.u8()
+    players = []
+    for _ in range(count):
+        # Manche Server melden mehr Spieler als sie mitschicken.
+        if r.pos >= len(payload):
+            break
+        players.append(Player(r.u8(), r.cstring(), r.i32(), r.f32()))
+    return players
+
+
+def parse_rules(payload):
+    r = _Reader(payload)
+    count = r.i16()
+    rules = {}
+    for _ in range(count):
+        if r.pos >= len(payload):
+            break
+        key = r.cstring()
+        rules[key] = r.cstring()
+    return rules
+
+
+def _challenge_bytes(challenge):
+    return challenge.to_bytes(4, "little")
+
+
+class _A2SRequest:
+    __slots__ = ("future", "sent", "received", "fragments")
+
+    def __init__(self, future):
+        self.future = future
+        self.sent = 0.0
+        self.received = 0.0
+        self.fragments = None   # (message_id, {nummer: daten})
+
+
+class _EngineProtocol(asyncio.DatagramProtocol):
+    def __init__(self, engine, index):
+        self.engine = engine
+        self.index = index
+
+    def datagram_received(self, data, addr):
+        self.engine._on_datagram(self.index, data, addr[:2])
+
+    def error_received(self, exc):
+        # ICMP-Fehler (z.B. Port unreachable) lassen sich keiner Anfrage
+        # sicher zuordnen; die betroffenen Anfragen laufen in ihren Timeout.
+        pass
+
+
+class UdpEngine:
+    def __init__(self, sockets=3, dedicated=0):
+        # sockets: gemeinsamer Pool (Round Robin); dedicated: zusätzliche
+        # Sockets, die nur mit explizitem Index benutzt werden (PingSampler).
+        self._sockets = max(1, int(sockets))
+        self._dedicated = max(0, int(dedicated))
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._start_error = None
+        self._transports = []
+        self._pending = {}    # (socket, addr) -> _A2SRequest (max. eine A2S-Anfrage)
+        self._locks = {}      # (socket, addr) -> asyncio.Lock
+        # (socket, addr) -> (verwerfen_bis, asyncio.Event): A2S-Anfrage dort
+        # abgelaufen; das Event wird gesetzt, sobald ihre späte Antwort kam.
+        self._late = {}
+        # (socket, addr) -> [gesendet, future, verwerfen_bis, event]: höchstens
+        # eine getchallenge-Probe je Paar, weil die Antwort keine Kennung trägt.
+        # verwerfen_bis und event (gesetzt, sobald die späte Antwort kam) gibt
+        # es erst nach einem Timeout (sonst None).
+        self._pings = {}
+        self._resolved = {}   # host -> ip
+        self._rr = 0
+        self._challenges = {}           # addr -> zuletzt erhaltene Challenge-Nummer
+        self._info_challenge = set()    # addrs, die auch für A2S_INFO eine Challenge wollen
+
+    # --- Lebenszyklus ---
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="qlview-udp", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._start_error is not None:
+            raise self._start_error
+        return self
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._open_sockets())
+        except Exception as e:
+            self._start_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _open_sockets(self):
+        for idx in range(self._sockets + self._dedicated):
+            transport, _ = await self._loop.create_datagram_endpoint(
+                lambda idx=idx: _EngineProtocol(self, idx),
+                local_addr=("0.0.0.0", 0), family=socket.AF_INET,
+            )
+            self._transports.append(transport)
+
+    @property
+    def dedicated_sockets(self):
+        """Indizes der Sockets außerhalb des gemeinsamen Pools."""
+        return tuple(range(self._sockets, self._sockets + self._dedicated))
+
+    def stop(self):
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._shutdown)
+
+    def _shutdown(self):
+        # Sockets schließen; der Loop hält erst an, nachdem die Transports
+        # ihre connection_lost-Callbacks (und damit close()) ausgeführt haben.
+        for task in asyncio.all_tasks(self._loop):
+            task.cancel()
+        for transport in self._transports:
+            transport.close()
+        self._loop.call_soon(self._loop.stop)
+
+    def submit(self, coro):
+        """Plant coro im Engine-Thread ein (thread-sicher) und gibt ein
+        concurrent.futures.Future zurück."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    # --- Öffentliche Abfragen (Coroutines, laufen im Engine-Loop) ---
+    # trace: optionales dict, in dem round_trips, saved_rtts und saved_ms
+    # (durch gemerkte Challenges eingesparte Round Trips) aufsummiert werden.
+    async def info(self, address, timeout=5.0, trace=None):
+        payload, rtt = await self._a2s_request(
+            address,
+            lambda c: A2S_INFO + (b"" if c == NO_CHALLENGE else _challenge_bytes(c)),
+            INFO_RESPONSE, timeout, trace,
+        )
+        return parse_info(payload, rtt)
+
+    async def players(self, address, timeout=5.0, trace=None):
+        payload, _ = await self._a2s_request(
+            address, lambda c: A2S_PLAYER + _challenge_bytes(c), PLAYER_RESPONSE, timeout, trace
+        )
+        return parse_players(payload)
+
+    async def rules(self, address, timeout=1.5, trace=None):
+        payload, _ = await self._a2s_request(
+            address, lambda c: A2S_RULES + _challenge_bytes(c), RULES_RESPONSE, timeout, trace
+        )
+        return parse_rules(payload)
+
+    async def ping(self, address, timeout=1.0, sock=None):
+        """Eine getchallenge-Runde (wie der Client beim Verbinden). RTT in ms.
+        sock: fester Socket-Index statt eines freien Sockets (z.B. einer aus
+        dedicated_sockets); steht dort noch die späte Antwort einer
+        abgelaufenen Probe aus, wird sie erst abgewartet."""
+        addr = await self._resolve(address)
+        idx = self._pick_ping_socket(addr) if sock is None else sock % len(self._transports)
+        key = (idx, addr)
+        old = self._pings.get(key)
+        if sock is not None and old is not None and old[2] is not None:
+            started = self._loop.time()
+            try:
+                await asyncio.wait_for(old[3].wait(), min(timeout, old[2] - time.perf_counter()))
+            except asyncio.TimeoutError:
+                pass
+            timeout -= self._loop.time() - started
+            if timeout <= 0:
+                raise socket.timeout("getchallenge to {}:{} timed out".format(*addr))
+        fut = self._loop.create_future()
+        entry = [time.perf_counter(), fut, None, None]
+        self._pings[key] = entry
+        try:
+            self._transports[idx].sendto(GETCHALLENGE, addr)
+            try:
+                return await asyncio.wait_for(fut, timeout)
+            except asyncio.TimeoutError:
+                # Eintrag bleibt stehen: eine späte Antwort wird ihm zugeordnet
+                # und verworfen.
+                entry[2] = time.perf_counter() + LATE_REPLY_GRACE
+                entry[3] = asyncio.Event()
+                raise socket.timeout("getchallenge to {}:{} timed out".format(*addr)) from None
+        finally:
+            if entry[2] is None and self._pings.get(key) is entry:
+                del self._pings[key]
+
+    async def best_ping(self, address, timeout=1.0, attempts=2):
+        """Bester von `attempts` getchallenge-Versuchen in ms, None wenn keiner
+        beantwortet wurde."""
+        best = None
+        for _ in range(attempts):
+            try:
+                ms = await self.ping(address, timeout)
+            except socket.timeout:
+                continue
+            best = ms if best is None else min(best, ms)
+        return best
+
+    # --- Interna ---
+    async def _resolve(self, address):
+        host, port = address[0], int(address[1])
+        ip = self._resolved.get(host)
+        if ip is None:
+            infos = await self._loop.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            ip = infos[0][4][0]
+            self._resolved[host] = ip
+        return (ip, port)
+
+    def _next_socket(self):
+        self._rr = (self._rr + 1) % self._sockets
+        return self._rr
+
+    def _pick_ping_socket(self, addr):
+        """Socket ohne offene (oder gerade abgelaufene) Probe an addr. Sind alle
+        belegt, wird die am frühesten verfallende abgelaufene Probe ersetzt."""
+        now = time.perf_counter()
+        oldest = None
+        for _ in range(self._sockets):
+            idx = self._next_socket()
+            entry = self._pings.get((idx, addr))
+            if entry is None or (entry[2] is not None and now > entry[2]):
+                return idx
+            if entry[2] is not None and (oldest is None or entry[2] < oldest[0]):
+                oldest = (entry[2], idx)
+        return oldest[1] if oldest is not None else self._next_socket()
+
+    def _late_entry(self, key, now):
+        """Noch gültiger Eintrag aus _late für key (abgelaufene werden entfernt)."""
+        late = self._late.get(key)
+        if late is not None and now > late[0]:
+            del self._late[key]
+            return None
+        return late
+
+    def _pick_socket(self, addr):
+        # Pro (Socket, Adresse) ist nur eine A2S-Anfrage gleichzeitig offen,
+        # sonst wären Challenge-Antworten nicht eindeutig. Freien Socket ohne
+        # ausstehende späte Antwort bevorzugen, dann einen freien; sind alle
+        # belegt, reiht sich die Anfrage am Lock ein.
+        now = time.perf_counter()
+        fallback = None
+        for _ in range(self._sockets):
+            idx = self._next_socket()
+            lock = self._locks.get((idx, addr))
+            if lock is None or not lock.locked():
+                if self._late_entry((idx, addr), now) is None:
+                    return idx
+                if fallback is None:
+                    fallback = idx
+        return fallback if fallback is not None else self._next_socket()
+
+    async def _a2s_request(self, address, build, expected, timeout, trace=None):
+        """Sendet eine A2S-Anfrage inkl. Challenge-Runden. Gibt (payload ohne
+        Typ-Byte, RTT der ersten Runde in ms) zurück.
+
+        Eine gemerkte Challenge wird gleich mitgeschickt. Lehnt der Server sie
+        ab (neue S2C_CHALLENGE), wird die neue gemerkt und wiederholt."""
+        addr = await self._resolve(address)
+        idx = self._pick_socket(addr)
+        lock = self._locks.setdefault((idx, addr), asyncio.Lock())
+        deadline = self._loop.time() + timeout
+        async with lock:
+            # A2S_INFO geht ohne Challenge, solange der Server keine verlangt.
+            if expected == INFO_RESPONSE and addr not in self._info_challenge:
+                challenge = NO_CHALLENGE
+            else:
+                challenge = self._challenges.get(addr, NO_CHALLENGE)
+            reused = challenge != NO_CHALLENGE
+            rtt = None
+            for round_trip in range(MAX_CHALLENGE_RETRIES + 1):
+                data, ms = await self._exchange(idx, addr, build(challenge), deadline - self._loop.time())
+                if trace is not None:
+                    trace["round_trips"] = trace.get("round_trips", 0) + 1
+                if rtt is None:
+                    rtt = ms
+                kind = data[0]
+                if kind == S2C_CHALLENGE and len(data) >= 5:
+                    challenge = struct.unpack_from("<I", data, 1)[0]
+                    self._challenges[addr] = challenge
+                    if expected == INFO_RESPONSE:
+                        self._info_challenge.add(addr)
+                    continue
+                if kind != expected:
+                    raise ValueError("Unexpected A2S response type 0x{:02x}".format(kind))
+                if reused and round_trip == 0 and trace is not None:
+                    # Ohne gemerkte Challenge wäre eine Runde mehr nötig gewesen.
+                    trace["saved_rtts"] = trace.get("saved_rtts", 0) + 1
+                    trace["saved_ms"] = trace.get("saved_ms", 0.0) + ms
+                return data[1:], rtt
+        raise ValueError("Server keeps sending challenge responses")
+
+    async def _exchange(self, idx, addr, payload, timeout):
+        key = (idx, addr)
+        late = self._late_entry(key, time.perf_counter())
+        if late is not None and timeout > 0:
+            # Erst die späte Antwort der abgelaufenen Anfrage abwarten (oder
+            # bis LATE_REPLY_GRACE vorbei ist), sonst würde sie dieser
+            # Anfrage zugeordnet.
+            started = self._loop.time()
+            try:
+                await asyncio.wait_for(late[1].wait(), min(timeout, late[0] - time.perf_counter()))
+            except asyncio.TimeoutError:
+                pass
+            timeout -= self._loop.time() - started
+            if self._late.get(key) is late:
+                del self._late[key]
+        if timeout <= 0:
+            raise socket.timeout("A2S query to {}:{} timed out".format(*addr))
+        req = _A2SRequest(self._loop.create_future())
+        self._pending[key] = req
+        try:
+            req.sent = time.perf_counter()
+            self._transports[idx].sendto(OOB + payload, addr)
+            try:
+                data = await asyncio.wait_for(req.future, timeout)
+            except asyncio.TimeoutError:
+                self._late[key] = (time.perf_counter() + LATE_REPLY_GRACE, asyncio.Event())
+                raise socket.timeout("A2S query to {}:{} timed out".format(*addr)) from None
+            return data, (req.received - req.sent) * 1000.0
+        finally:
+            if self._pending.get(key) is req:
+                del self._pending[key]
+
+    def _on_datagram(self, idx, data, addr):
+        now = time.perf_counter()
+        header = data[:4]
+        if header == OOB:
+            payload = data[4:]
+            if payload[:1] and payload[0] in A2S_RESPONSES:
+                self._deliver(idx, addr, payload, now)
+            else:
+                self._on_ping_reply(idx, addr, now)
+        elif header == SPLIT:
+            self._on_fragment(idx, addr, data[4:], now)
+
+    def _late_reply(self, key, now):
+        """True, wenn die Antwort zu einer abgelaufenen A2S-Anfrage gehört (sie
+        wird verworfen und gibt den Socket für die nächste Anfrage frei)."""
+        if key in self._pending:
+            return False
+        late = self._late_entry(key, now)
+        if late is None:
+            return False
+        del self._late[key]
+        late[1].set()
+        return True
+
+    def _deliver(self, idx, addr, payload, now):
+        if self._late_reply((idx, addr), now):
+            return
+        req = self._pending.get((idx, addr))
+        if req is not None and not req.future.done():
+            req.received = now
+            req.future.set_result(payload)
+
+    def _on_fragment(self, idx, addr, data, now):
+        """Gesplittete Antwort (Source-Format): id, total, number, size."""
+        if self._late_reply((idx, addr), now):
+            return
+        req = self._pending.get((idx, addr))
+        if req is None or req.future.done() or len(data) < 8:
+            return
+        msg_id, total, number = struct.unpack_from("<IBB", data, 0)
+        if req.fragments is None or req.fragments[0] != msg_id:
+            req.fragments = (msg_id, {})
+        parts = req.fragments[1]
+        parts[number] = data[8:]
+        if len(parts) < total:
+            return
+        try:
+            payload = b"".join(parts[i] for i in range(total))
+        except KeyError:
+            return   # Nummerierung kaputt -> Anfrage läuft in den Timeout
+        if msg_id & 0x80000000:
+            # bzip2-komprimiert: erstes Paket beginnt mit Größe und CRC32.
+            size, crc = struct.unpack_from("<II", payload, 0)
+            try:
+                payload = bz2.decompress(payload[8:])
+            except (OSError, ValueError):
+                return
+            if len(payload) != size or zlib.crc32(payload) != crc:
+                return
+        if payload.startswith(OOB):
+            payload = payload[4:]
+        self._deliver(idx, addr, payload, now)
+
+    def _on_ping_reply(self, idx, addr, now):
+        entry = self._pings.pop((idx, addr), None)
+        if entry is None:
+            return
+        sent, fut, late_until, replied = entry
+        if late_until is not None:
+            replied.set()
+            return      # Antwort auf eine schon abgelaufene Probe
+        if not fut.done():
+            fut.set_result((now - sent) * 1000.0)
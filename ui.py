@@ -1,26 +1,52 @@
 ﻿import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, font as tkfont
 import os
-import webbrowser
-from PIL import Image, ImageTk
 import utils
 import config
+from mapshots import MapshotIndex
+from theme import ThemeRegistry
+
+
+def open_steam_profile(steamid):
+    # webbrowser erst beim ersten Klick importieren (Startzeit).
+    import webbrowser
+    webbrowser.open("https://steamcommunity.com/profiles/{}".format(steamid))
+
+
+class _PlayerRow:
+    """Widgets einer Zeile der Spielerliste. Bleiben ueber Aktualisierungen
+    erhalten und werden nur umkonfiguriert (siehe update_player_list)."""
+    __slots__ = ("frame", "name_widget", "team_label", "score_label", "elo_label",
+                 "time_label", "sep", "name", "steamid", "state")
+
+    def __init__(self):
+        self.name = None
+        self.steamid = None
+        self.state = None
+
 
 class UIManager:
     def __init__(self, app):
         self.app = app
         self.root = app.root
         self.options_window = None
+        self.debug_window = None
         self.current_color_scheme = None
         self.q3_logo_placeholder_photo = None
         self.is_default_jpg_loaded = False
-        self.last_players = []
+        self.last_players = ([], [])
+        # Persistente Zeilen der Spielerliste: (normalisierter Name, n) -> _PlayerRow
+        self._player_rows = {}
+        self._player_list_static = False
         
         self.server_name_var = tk.StringVar(value="Loading...")
         self.map_name_var = tk.StringVar(value="...")
         self.player_count_var = tk.StringVar(value="-")
         self.ip_label_var = tk.StringVar(value="...")
         self.ping_var = tk.StringVar(value="...")
+        # Dauerhafte Ping-Messung (PingSampler): Kennzahlen und Sparkline.
+        self.ping_stats_var = tk.StringVar(value="")
+        self.ping_spark_var = tk.StringVar(value="")
         self.game_type_var = tk.StringVar(value="...")
         self.elo_info_var = tk.StringVar(value="...")
         self.error_message_var = tk.StringVar()
@@ -28,11 +54,6 @@ class UIManager:
         self._own_elo_val = None
         self._server_elo_summary = None
 
-        # ELO-Zustand: zuletzt empfangene Name->Rating-Zuordnung, damit ein
-        # Schema-Wechsel (Neuzeichnen mit alter Liste) die ELOs behält.
-        self.last_elo_by_name = {}
-        self.last_steamid_by_name = {}
-        self.last_team_by_name = {}
         self.last_server_info = {}
         
         # Einstellungen Variablen
@@ -42,11 +63,33 @@ class UIManager:
         self.show_hotkeys_var = tk.BooleanVar(value=self.app.app_config.get("show_hotkeys", True))
         self.start_minimized_var = tk.BooleanVar(value=self.app.app_config.get("start_minimized", False))
         self.start_with_system_var = tk.BooleanVar(value=self.app.app_config.get("start_with_system", False))
+        self.show_dashboard_var = tk.BooleanVar(value=self.app.app_config.get("show_dashboard", False))
+        # Dashboard-Zeilen je Favorit: fav_index -> [Labels]
+        self.dashboard_rows = {}
         
         # KORREKTUR: Einzelne StringVar für das Layout
         self.player_list_position_var = tk.StringVar(value=self.app.app_config.get("player_list_position", "right"))
+        # Renderer der Spielerliste: "widgets" (Frame/Label je Zeile) oder
+        # "canvas" (alles als Items auf einem Canvas, konstante Widget-Zahl).
+        self.player_list_renderer_var = tk.StringVar(value=self.app.app_config.get("player_list_renderer", "widgets"))
+        self._canvas_fonts = None
+        self._canvas_last = None
+        # Farben: registrierte Widgets statt Baum-Walk; Options-Vorschau entprellt.
+        self.theme = ThemeRegistry(self.root)
+        self._scheme_preview_job = None
+        # Zeit-Items je Zeile (Canvas-Renderer), fuer update_player_durations.
+        self._canvas_time_items = []
+        # Fertig skalierte Mapshots: (Mapname, mtime) -> PhotoImage.
+        self._mapshot_cache = utils.LRUCache(config.MAPSHOT_CACHE_SIZE)
+        # (Mapname, Pfad, mtime) des angezeigten Mapshots; Pfad None = Platzhalter.
+        self._preview_shown = None
+        # Zuletzt angeforderter Mapshot; Ergebnisse für andere werden verworfen.
+        self._preview_wanted = None
+        # Ordner-Index + Thumbnails; Scan und Aufbau laufen im Hintergrund.
+        self.mapshots = MapshotIndex()
 
     def setup_ui(self):
+        self.mapshots.start()
         self.load_placeholder_image()
         
         self.main_container = tk.Frame(self.root)
@@ -54,6 +97,8 @@ class UIManager:
         
         self.info_pane = tk.Frame(self.main_container)
         self.player_pane = tk.Frame(self.main_container)
+        self.theme.style("Vertical.TSeparator", {"background": "black"})
+        self.theme.style("Horizontal.TSeparator", {"background": "black"})
         self.separator = ttk.Separator(self.main_container, orient='vertical')
 
         self._arrange_panes()
@@ -61,7 +106,13 @@ class UIManager:
         self._create_header(self.info_pane)
         self._create_info_frame(self.info_pane)
         self.button_container = self._create_new_button_bar(self.info_pane)
+        self._create_dashboard(self.info_pane)
         self._create_player_list_frame(self.player_pane)
+        # Statische Widgets einmalig anmelden; Zeilen der Spielerliste melden
+        # sich beim Erzeugen selbst an.
+        self.theme.register_tree(self.main_container)
+        # Verstecktes Debug-Fenster: Laufzeit je Phase der Aktualisierungen.
+        self.root.bind(config.DEBUG_OVERLAY_KEY, lambda e: self.toggle_debug_overlay())
 
         self.apply_color_scheme(self.app.app_config["color_scheme"])
         # Initialer Aufruf der Größenanpassung
@@ -150,7 +201,7 @@ class UIManager:
         info_frame = tk.Frame(self.info_outer_frame)
         info_frame.pack(anchor="w")
         
-        info_labels_config = [("Server:", self.server_name_var), ("IP:", self.ip_label_var), ("Ping:", self.ping_var), ("Map:", self.map_name_var), ("Players:", self.player_count_var), ("Gamemode:", self.game_type_var), ("ELO:", self.elo_info_var)]
+        info_labels_config = [("Server:", self.server_name_var), ("IP:", self.ip_label_var), ("Ping:", self.ping_var), ("Quality:", self.ping_stats_var), ("", self.ping_spark_var), ("Map:", self.map_name_var), ("Players:", self.player_count_var), ("Gamemode:", self.game_type_var), ("ELO:", self.elo_info_var)]
         for i, (text, var) in enumerate(info_labels_config):
             tk.Label(info_frame, text=text, font=("Arial", 10, "bold")).grid(row=i, column=0, sticky="e", padx=(0,5), pady=0)
             lbl = tk.Label(info_frame, textvariable=var, font=("Arial", 10), wraplength=250, justify=tk.LEFT)
@@ -169,6 +220,73 @@ class UIManager:
         self._create_standard_button(bar, "CONNECT", self.app.connect_to_server).grid(row=0, column=1, sticky="nsew", padx=(5,0))
         return bar
 
+    def _create_dashboard(self, parent):
+        # Kompakte Uebersicht aller Favoriten (eine Zeile je Server). Die
+        # Labels werden einmal angelegt und danach nur noch umkonfiguriert.
+        self.dashboard_frame = tk.Frame(parent)
+        tk.Label(self.dashboard_frame, text="Favorites", font=("Arial", 10, "bold")).pack(anchor="w")
+        grid = tk.Frame(self.dashboard_frame)
+        grid.pack(fill="x")
+        grid.grid_columnconfigure(1, weight=1)
+        for i in range(1, 8):
+            labels = []
+            for col, (width, anchor) in enumerate([(2, "e"), (22, "w"), (10, "w"), (5, "e"), (6, "e"), (5, "e")]):
+                lbl = tk.Label(grid, text="", font=("Arial", 9), width=width, anchor=anchor, cursor="hand2")
+                lbl.grid(row=i, column=col, sticky="ew", padx=1)
+                lbl.bind("<Button-1>", lambda e, i=i: self.app.switch_to_favorite(i))
+                labels.append(lbl)
+            self.dashboard_rows[i] = labels
+        self.toggle_dashboard()
+
+    def toggle_dashboard(self):
+        if not hasattr(self, 'dashboard_frame'):
+            return
+        if self.show_dashboard_var.get():
+            self.dashboard_frame.pack(side="top", fill="x", pady=(0, 10))
+            self.update_dashboard()
+        else:
+            self.dashboard_frame.pack_forget()
+
+    def update_dashboard(self):
+        """Fuellt die Dashboard-Zeilen aus dem Ergebnis-Cache des ServerHandlers."""
+        if not self.dashboard_rows or not self.current_color_scheme:
+            return
+        cache = getattr(self.app.server_handler, 'result_cache', {})
+        pinger = getattr(self.app.server_handler, 'pinger', None)
+        fg = self.current_color_scheme["fg"]
+        accent = self.current_color_scheme["accent"]
+        for i, labels in self.dashboard_rows.items():
+            addr_str = self.app.favorites.get(str(i), "").strip()
+            try:
+                address = utils.parse_address(addr_str)
+            except ValueError:
+                address = ("", 0)
+            if not address[0]:
+                for lbl in labels: lbl.grid_remove()
+                continue
+            result = cache.get(address)
+            if result is None:
+                texts = [str(i), addr_str, "...", "", "", ""]
+            elif not result["ok"]:
+                texts = [str(i), addr_str, "offline", "", "", ""]
+            else:
+                avg = (result.get("elo_info") or {}).get("avg")
+                # Gemessener Durchschnitt des PingSamplers, sonst der Refresh-Ping.
+                ping = pinger.stats(address) if pinger is not None else None
+                ping_ms = round(ping["avg"]) if ping and ping["avg"] is not None else result['ping_ms']
+                texts = [
+                    str(i),
+                    utils.truncate_text(utils.strip_quake_colors(result["server_name"]), 24),
+                    utils.truncate_text(result["map_name"], 12),
+                    f"{result['player_count']}/{result['max_players']}",
+                    f"{ping_ms}ms",
+                    str(avg) if avg else "-",
+                ]
+            color = accent if self._is_active_fav(i) else fg
+            for lbl, text in zip(labels, texts):
+                lbl.configure(text=text, fg=color)
+                lbl.grid()
+
     def _on_mouse_wheel(self, event):
         if self.player_canvas.yview() == (0.0, 1.0): return "break"
         if event.num == 5 or event.delta < 0: self.player_canvas.yview_scroll(1, "units")
@@ -185,15 +303,26 @@ class UIManager:
         parent.grid_rowconfigure(0, weight=1)
         parent.grid_columnconfigure(0, weight=1)
         self.player_canvas = tk.Canvas(parent, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.player_canvas.yview)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.player_canvas.yview,
+                                  style=self.theme.style("QLView.Vertical.TScrollbar", lambda s: {
+                                      "troughcolor": s["bg"], "background": s["button_bg"], "arrowcolor": s["fg"]}))
         
         self.scrollable_frame = tk.Frame(self.player_canvas)
         
-        canvas_window = self.player_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        canvas_window = self._canvas_window = self.player_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         
-        def configure_canvas(event): self.player_canvas.itemconfig(canvas_window, width=event.width)
+        def configure_canvas(event):
+            self.player_canvas.itemconfig(canvas_window, width=event.width)
+            # Canvas-Renderer: Spalten haengen an der Breite -> neu zeichnen.
+            if self._canvas_last is not None and self._uses_canvas_renderer():
+                self._draw_player_list_canvas(*self._canvas_last)
         self.player_canvas.bind("<Configure>", configure_canvas)
 
+        # Klick auf einen Namen im Canvas-Renderer -> Steam-Profil.
+        self.player_canvas.tag_bind("link", "<Button-1>", self._on_canvas_link)
+        self.player_canvas.tag_bind("link", "<Enter>", lambda e: self.player_canvas.configure(cursor="hand2"))
+        self.player_canvas.tag_bind("link", "<Leave>", lambda e: self.player_canvas.configure(cursor=""))
+
         def configure_scrollable_frame(event): self.player_canvas.configure(scrollregion=self.player_canvas.bbox("all"))
         self.scrollable_frame.bind("<Configure>", configure_scrollable_frame)
 
@@ -204,18 +333,12 @@ class UIManager:
         self._bind_mouse_wheel_recursive(self.player_canvas)
 
 
-    def update_player_list(self, players, elo_by_name=None, steamid_by_name=None, team_by_name=None):
+    def update_player_list(self, playing, spectators):
+        """Zeichnet die fertige Spielerliste (PlayerRecords aus playerlist.
+        build_player_list, im Worker klassifiziert und sortiert)."""
         # Zuletzt empfangene Spielerliste merken, damit ein Schema-Wechsel
         # die Liste in den neuen Farben neu zeichnen kann.
-        self.last_players = players
-        # ELO/SteamID/Team nur überschreiben, wenn neue Daten geliefert wurden.
-        # Beim Schema-Neuzeichnen (=None) bleiben die alten erhalten.
-        if elo_by_name is not None:
-            self.last_elo_by_name = elo_by_name
-        if steamid_by_name is not None:
-            self.last_steamid_by_name = steamid_by_name
-        if team_by_name is not None:
-            self.last_team_by_name = team_by_name
+        self.last_players = (playing, spectators)
 
         # Scrollposition merken, damit die Liste bei jeder Aktualisierung nicht
         # nach oben springt.
@@ -224,49 +347,10 @@ class UIManager:
         except Exception:
             prev_top = 0.0
 
-        for widget in self.scrollable_frame.winfo_children(): widget.destroy()
         if not self.current_color_scheme: return
         bg_color = self.current_color_scheme["bg"]; fg_color = self.current_color_scheme["fg"]
         self.scrollable_frame.configure(bg=bg_color)
 
-        # Ghost-Player rausfiltern: QL haelt manchmal Karteileichen in der
-        # Liste (Score 0, seit >1h "verbunden"), die nicht wirklich drauf sind.
-        # Ein echter (auch stundenlanger) Spectator ist von qlstats getrackt und
-        # hat eine SteamID -> nur qlstats-UNBEKANNTE Score-0-Leichen fliegen raus.
-        # Ohne qlstats-Daten wird gar nicht gefiltert.
-        has_qlstats = bool(self.last_steamid_by_name)
-        def is_ghost(p):
-            if p.name in config.BOT_NAMES or not has_qlstats:
-                return False
-            known = utils.normalize_name(p.name) in self.last_steamid_by_name
-            return (not known) and p.score <= 0 and p.duration >= 3600
-        players = [p for p in players if not is_ghost(p)]
-
-        # Spectator-Erkennung ueber das qlstats-Team (zuverlaessig; der
-        # A2S-Score ist bei QL unbrauchbar). team -1 oder >=3 = Spectator,
-        # 0/1/2 = aktiv. Ohne qlstats-Daten Fallback auf A2S-Score < 0.
-        def team_of(p):
-            return self.last_team_by_name.get(utils.normalize_name(p.name))
-        def is_spec(p):
-            if p.name in config.BOT_NAMES:
-                return True
-            t = team_of(p)
-            if t is not None:
-                return t < 0 or t >= 3
-            return p.score < 0
-        def team_rank(p):
-            t = team_of(p)
-            return t if t is not None else 99
-        def elo_of(p):
-            return self.last_elo_by_name.get(utils.normalize_name(p.name)) or 0
-
-        spectators = sorted([p for p in players if is_spec(p)], key=lambda p: p.duration, reverse=True)
-        # Aktive nach Team (1=rot, 2=blau, dann Rest), innerhalb nach Score.
-        playing = sorted(
-            [p for p in players if not is_spec(p)],
-            key=lambda p: (team_rank(p), -p.score),
-        )
-
         # Spielstand im Header:
         #  - Team-Spiel (scoreRed/scoreBlue vorhanden): echte Werte, leer -> 0
         #  - Duel: die zwei hoechsten Frags der aktiven Spieler
@@ -287,53 +371,270 @@ class UIManager:
                 self._set_match_score(None)
         else:
             self._set_match_score(None)        
-        tk.Label(self.scrollable_frame, text="Players", font=("Arial", 11, "bold"), bg=bg_color, fg=fg_color).pack(pady=(0,5))
-        tk.Frame(self.scrollable_frame, height=1, bg="black").pack(fill="x", padx=5, pady=(0, 5))
 
-        if not playing and not spectators:
-            tk.Label(self.scrollable_frame, text="-- No Players --", font=("Arial", 10, "italic"), bg=bg_color, fg=fg_color).pack(pady=5)
+        if self._uses_canvas_renderer():
+            self._reset_player_list_widgets()
+            self.player_canvas.itemconfigure(self._canvas_window, state="hidden")
+            self._canvas_last = (playing, spectators)
+            self._draw_player_list_canvas(playing, spectators)
+            self.player_canvas.yview_moveto(prev_top)
+            return
+        self._canvas_last = None
+        self.player_canvas.delete("plist")
+        self.player_canvas.itemconfigure(self._canvas_window, state="normal")
+
+        # Abgleich statt Neuaufbau: Zeilen sind ueber den normalisierten Namen
+        # verschluesselt (bei Namensgleichheit plus laufende Nummer). Nur fuer
+        # neue/gegangene Spieler werden Widgets erzeugt bzw. zerstoert, die
+        # Reihenfolge ergibt sich aus dem Neu-Gridden.
+        self._ensure_player_list_static(bg_color, fg_color)
+        keyed = self._keyed_players(playing, spectators)
+
+        live = {key for key, _, _ in keyed}
+        for key in [k for k in self._player_rows if k not in live]:
+            row = self._player_rows.pop(key)
+            self.theme.forget(row.frame)
+            row.frame.destroy(); row.sep.destroy()
+
+        grid_row = 2
+        if not keyed:
+            self._no_players_label.grid(row=grid_row, column=0, pady=5)
         else:
-            for player in playing: 
-                self._create_player_list_row(self.scrollable_frame, player, is_spectator=False)
-            
-            if spectators:
-                tk.Frame(self.scrollable_frame, height=3, bg="gray").pack(fill="x", padx=5, pady=(5, 5)) 
-                for player in spectators: 
-                    self._create_player_list_row(self.scrollable_frame, player, is_spectator=True)
-        
+            self._no_players_label.grid_remove()
+        self._spectator_divider.grid_remove()
+        for key, player, spec in keyed:
+            if spec and player is spectators[0]:
+                self._spectator_divider.grid(row=grid_row, column=0, sticky="ew", padx=5, pady=(5, 5))
+                grid_row += 1
+            row = self._player_rows.get(key)
+            if row is None:
+                row = self._player_rows[key] = self._create_player_list_row(self.scrollable_frame, player)
+            self._update_player_list_row(row, player, spec)
+            row.frame.grid(row=grid_row, column=0, sticky="ew")
+            row.sep.grid(row=grid_row + 1, column=0, sticky="ew", padx=5, pady=2)
+            grid_row += 2
+
         self.root.update_idletasks() 
-        self._bind_mouse_wheel_recursive(self.scrollable_frame) 
         self.player_canvas.configure(scrollregion=self.player_canvas.bbox("all"))
         self.player_canvas.yview_moveto(prev_top)
 
-    def _create_player_list_row(self, parent, player, is_spectator):
+    @staticmethod
+    def _keyed_players(playing, spectators):
+        """[((normalisierter Name, n), PlayerRecord, is_spectator), ...]"""
+        seen = {}
+        keyed = []
+        for p, spec in [(p, False) for p in playing] + [(p, True) for p in spectators]:
+            base = p.key
+            n = seen.get(base, 0)
+            seen[base] = n + 1
+            keyed.append(((base, n), p, spec))
+        return keyed
+
+    def update_player_durations(self, playing, spectators):
+        """Schneller Pfad fuer eine Liste, deren Struktur sich nicht geaendert
+        hat (gleiche Spieler, Scores, Teams, ELO): nur die Zeit-Spalte wird
+        aktualisiert, ohne Abgleich/Neuzeichnen der Zeilen."""
+        self.last_players = (playing, spectators)
+        if not self.current_color_scheme:
+            return
+        if self._uses_canvas_renderer():
+            self._canvas_last = (playing, spectators)
+            for item, p in zip(self._canvas_time_items, playing + spectators):
+                self.player_canvas.itemconfigure(item, text=utils.format_seconds(p.duration))
+            return
+        for key, player, spec in self._keyed_players(playing, spectators):
+            row = self._player_rows.get(key)
+            if row is not None:
+                self._update_player_list_row(row, player, spec)
+
+    def _ensure_player_list_static(self, bg_color, fg_color):
+        """Kopfzeile, Trenner und Platzhalter der Liste einmalig anlegen."""
+        if self._player_list_static:
+            return
+        parent = self.scrollable_frame
+        parent.grid_columnconfigure(0, weight=1)
+        self.theme.register(tk.Label(parent, text="Players", font=("Arial", 11, "bold"), bg=bg_color, fg=fg_color)).grid(row=0, column=0, pady=(0,5))
+        tk.Frame(parent, height=1, bg="black").grid(row=1, column=0, sticky="ew", padx=5, pady=(0, 5))
+        self._no_players_label = self.theme.register(tk.Label(parent, text="-- No Players --", font=("Arial", 10, "italic"), bg=bg_color, fg=fg_color))
+        self._spectator_divider = tk.Frame(parent, height=3, bg="gray")
+        self._bind_mouse_wheel_recursive(parent)
+        self._player_list_static = True
+
+    def _uses_canvas_renderer(self):
+        return self.player_list_renderer_var.get() == "canvas"
+
+    def _get_canvas_fonts(self):
+        if self._canvas_fonts is None:
+            self._canvas_fonts = {
+                "title": tkfont.Font(family="Arial", size=11, weight="bold"),
+                "name": tkfont.Font(family="Arial", size=10, weight="bold"),
+                "cell": tkfont.Font(family="Arial", size=10),
+                "team": tkfont.Font(family="Arial", size=9),
+                "italic": tkfont.Font(family="Arial", size=10, slant="italic"),
+            }
+        return self._canvas_fonts
+
+    def _draw_player_list_canvas(self, playing, spectators):
+        """Zeichnet die komplette Liste als Items auf player_canvas: farbige
+        Namens-Runs, Team-Quadrat, Score, ELO und Zeit. Es entstehen keine
+        Widgets pro Spieler; vor jedem Zeichnen werden alle Items verworfen."""
+        cv = self.player_canvas
+        cv.delete("plist")
+        self._canvas_time_items = []
+        bg_color = self.current_color_scheme["bg"]; fg_color = self.current_color_scheme["fg"]
+        fonts = self._get_canvas_fonts()
+        colors = self._name_color_map()
+        width = max(cv.winfo_width(), 250)
+        line_h = fonts["name"].metrics("linespace") + 4
+        tags = ("plist",)
+
+        # Spalten von rechts nach links wie im Widget-Renderer:
+        # Zeit (60) | ELO (46) | Score (34) | Team (14) | Name
+        right = width - 4
+        x_time = right - 30
+        x_sep3 = right - 65
+        x_elo = x_sep3 - 7
+        x_sep2 = x_elo - 53
+        x_score = x_sep2 - 7
+        x_sep1 = x_score - 41
+        x_team = x_sep1 - 12
+        name_max = x_team - 10
+
+        y = 0
+        cv.create_text(width // 2, y, text="Players", anchor="n", font=fonts["title"], fill=fg_color, tags=tags)
+        y += fonts["title"].metrics("linespace") + 5
+        cv.create_line(5, y, width - 5, y, fill="black", tags=tags)
+        y += 6
+
+        if not playing and not spectators:
+            cv.create_text(width // 2, y + 5, text="-- No Players --", anchor="n", font=fonts["italic"], fill=fg_color, tags=tags)
+
+        rows = [(p, False) for p in playing] + [(p, True) for p in spectators]
+        for p, is_spectator in rows:
+            if is_spectator and p is spectators[0]:
+                y += 5
+                cv.create_line(5, y, width - 5, y, fill="gray", width=3, tags=tags)
+                y += 7
+            mid = y + line_h // 2
+
+            # Name als farbige Runs; wird vor der Team-Spalte abgeschnitten.
+            name_tags = tags + (("link", "sid:" + p.steamid) if p.steamid else ())
+            x = 4
+            for code, text in p.runs:
+                w = fonts["name"].measure(text)
+                cut = x + w > name_max
+                if cut:
+                    while text and x + fonts["name"].measure(text + "…") > name_max:
+                        text = text[:-1]
+                    text += "…"
+                    w = fonts["name"].measure(text)
+                cv.create_text(x, mid, text=text, anchor="w", font=fonts["name"], fill=colors.get(code, fg_color), tags=name_tags)
+                x += w
+                if cut:
+                    break
+
+            team_color = {1: "#e03030", 2: "#3565e0"}.get(p.team)
+            if team_color:
+                cv.create_text(x_team, mid, text="\u25a0", font=fonts["team"], fill=team_color, tags=tags)
+            if not is_spectator:
+                cv.create_text(x_score, mid, text=str(p.score), anchor="e", font=fonts["cell"], fill="gray", tags=tags)
+            elo = p.elo
+            if elo is not None:
+                cv.create_text(x_elo, mid, text=str(elo), anchor="e", font=fonts["name"],
+                               fill=utils.get_elo_color(elo, fg_color), tags=tags)
+            else:
+                cv.create_text(x_elo, mid, text="-", anchor="e", font=fonts["name"], fill="gray", tags=tags)
+            self._canvas_time_items.append(
+                cv.create_text(x_time, mid, text=utils.format_seconds(p.duration), font=fonts["cell"], fill="gray", tags=tags))
+            for xs in (x_sep1, x_sep2, x_sep3):
+                cv.create_line(xs, y, xs, y + line_h, fill="black", tags=tags)
+            y += line_h + 2
+            cv.create_line(5, y, width - 5, y, fill="black", tags=tags)
+            y += 3
+
+        cv.configure(bg=bg_color, scrollregion=cv.bbox("plist") or (0, 0, width, y))
+
+    def _on_canvas_link(self, event):
+        for tag in self.player_canvas.gettags("current"):
+            if tag.startswith("sid:"):
+                open_steam_profile(tag[4:])
+                return
+
+    def _reset_player_list_widgets(self):
+        """Verwirft alle Widgets der Liste (z.B. vor einem Schema-Wechsel: die
+        Farben stecken in den Widgets und werden beim Neuaufbau gesetzt)."""
+        if not hasattr(self, 'scrollable_frame'):
+            return
+        self.theme.forget(self.scrollable_frame, children_only=True)
+        for widget in self.scrollable_frame.winfo_children(): widget.destroy()
+        self._player_rows = {}
+        self._player_list_static = False
+
+    def _create_player_list_row(self, parent, player):
         bg_color = self.current_color_scheme["bg"]
-        row_frame = tk.Frame(parent, bg=bg_color); row_frame.pack(fill="x", expand=True)
+        row = _PlayerRow()
+        row_frame = row.frame = self.theme.register(tk.Frame(parent, bg=bg_color))
         row_frame.grid_columnconfigure(0, weight=1)
-        name_key = utils.normalize_name(player.name)
-        name_widget = self.render_colored_name(row_frame, utils.truncate_text(player.name or "(anon)", config.MAX_PLAYER_NAME_CHARS))
-        name_widget.grid(row=0, column=0, sticky="w", padx=2)
+        row.name_widget = self.theme.register(self.render_colored_name(row_frame, ""), painter=self._paint_name_widget)
+        row.name_widget.grid(row=0, column=0, sticky="w", padx=2)
+
+        # --- Team-Farbe (qlstats): Quadrat links neben der ELO ---
+        row_frame.grid_columnconfigure(1, minsize=14)
+        row.team_label = self.theme.register(tk.Label(row_frame, text="", fg=bg_color, bg=bg_color, font=("Arial", 9)), "bg")
+        row.team_label.grid(row=0, column=1, padx=(0, 2))
+        tk.Frame(row_frame, width=1, bg="black").grid(row=0, column=2, sticky="ns", padx=5)
+
+        # --- Score (A2S). Spectators haben keinen sinnvollen Score. ---
+        row_frame.grid_columnconfigure(3, minsize=34)
+        row.score_label = self.theme.register(tk.Label(row_frame, text="", fg="gray", font=("Arial", 10), bg=bg_color), "bg")
+        row.score_label.grid(row=0, column=3, sticky="e", padx=2)
+        tk.Frame(row_frame, width=1, bg="black").grid(row=0, column=4, sticky="ns", padx=5)
+
+        # --- ELO-Spalte (qlstats) ---
+        row_frame.grid_columnconfigure(5, minsize=46)
+        row.elo_label = self.theme.register(tk.Label(row_frame, text="-", fg="gray", font=("Arial", 10, "bold"), bg=bg_color), "bg")
+        row.elo_label.grid(row=0, column=5, sticky="e", padx=2)
+
+        # --- Zeit-Spalte ---
+        row_frame.grid_columnconfigure(7, minsize=60)
+        tk.Frame(row_frame, width=1, bg="black").grid(row=0, column=6, sticky="ns", padx=5)
+        row.time_label = self.theme.register(tk.Label(row_frame, text="", fg="gray", font=("Arial", 10), bg=bg_color), "bg")
+        row.time_label.grid(row=0, column=7, padx=2)
+
+        row.sep = tk.Frame(parent, height=1, bg="black")
+        self._bind_mouse_wheel_recursive(row_frame)
+        self._bind_mouse_wheel_recursive(row.sep)
+        return row
+
+    def _update_player_list_row(self, row, player, is_spectator):
+        """Aktualisiert eine bestehende Zeile; nur geaenderte Werte werden
+        an Tk weitergegeben."""
+        bg_color = self.current_color_scheme["bg"]
+
+        if row.name != player.runs:
+            row.name = player.runs
+            self._fill_colored_name(row.name_widget, player.runs)
 
         # Klick auf den Namen -> Steam-Profil. Nur mit echter SteamID (qlstats).
         # Ohne SteamID und bei Bots kein Link.
-        if player.name not in config.BOT_NAMES:
-            steamid = self.last_steamid_by_name.get(name_key)
+        steamid = player.steamid
+        if row.steamid != steamid:
+            row.steamid = steamid
             if steamid:
-                name_widget.configure(cursor="hand2")
-                name_widget.bind(
+                row.name_widget.configure(cursor="hand2")
+                row.name_widget.bind(
                     "<Button-1>",
-                    lambda e, sid=steamid: webbrowser.open("https://steamcommunity.com/profiles/{}".format(sid)),
+                    lambda e, sid=steamid: open_steam_profile(sid),
                 )
+            else:
+                row.name_widget.configure(cursor="")
+                row.name_widget.unbind("<Button-1>")
 
-        # --- Team-Farbe (qlstats): Quadrat links neben der ELO ---
         # team 1 = rot, 2 = blau; frei/Spectator -> kein Quadrat.
-        team = self.last_team_by_name.get(name_key)
-        team_color = {1: "#e03030", 2: "#3565e0"}.get(team)
+        team_color = {1: "#e03030", 2: "#3565e0"}.get(player.team)
 
-        # --- ELO-Spalte (qlstats) ---
-        # Abgleich ueber den normalisierten Namen. Bots und Spieler mit < 5
-        # gewerteten Spielen liefern kein Rating -> "-".
-        elo = self.last_elo_by_name.get(name_key)
+        # Bots und Spieler mit < 5 gewerteten Spielen liefern kein Rating -> "-".
+        elo = player.elo
         if elo is not None:
             elo_text = str(elo)
             elo_fg = utils.get_elo_color(elo, self.current_color_scheme["fg"])
@@ -341,33 +642,29 @@ class UIManager:
             elo_text = "-"
             elo_fg = "gray"
 
-        row_frame.grid_columnconfigure(1, minsize=14)
-        team_label = tk.Label(row_frame, text=("\u25a0" if team_color else ""),
-                              fg=(team_color or bg_color), bg=bg_color, font=("Arial", 9))
-        team_label.grid(row=0, column=1, padx=(0, 2))
-        tk.Frame(row_frame, width=1, bg="black").grid(row=0, column=2, sticky="ns", padx=5)
-
-        # --- Score (A2S). Spectators haben keinen sinnvollen Score. ---
-        row_frame.grid_columnconfigure(3, minsize=34)
-        score_text = str(player.score) if not is_spectator else ""
-        score_label = tk.Label(row_frame, text=score_text, fg="gray", font=("Arial", 10), bg=bg_color)
-        score_label.grid(row=0, column=3, sticky="e", padx=2)
-        tk.Frame(row_frame, width=1, bg="black").grid(row=0, column=4, sticky="ns", padx=5)
-        row_frame.grid_columnconfigure(5, minsize=46)
-        elo_label = tk.Label(row_frame, text=elo_text, fg=elo_fg, font=("Arial", 10, "bold"), bg=bg_color)
-        elo_label.grid(row=0, column=5, sticky="e", padx=2)
-
-        # --- Zeit-Spalte ---
-        row_frame.grid_columnconfigure(7, minsize=60)
-        tk.Frame(row_frame, width=1, bg="black").grid(row=0, column=6, sticky="ns", padx=5)
-        time_label = tk.Label(row_frame, text=utils.format_seconds(player.duration), fg="gray", font=("Arial", 10), bg=bg_color)
-        time_label.grid(row=0, column=7, padx=2)
-
-        tk.Frame(parent, height=1, bg="black").pack(fill="x", padx=5, pady=2)
-
-    def set_server_elo_info(self, info):
+        state = (
+            team_color,
+            str(player.score) if not is_spectator else "",
+            elo_text, elo_fg,
+            utils.format_seconds(player.duration),
+        )
+        if row.state == state:
+            return
+        old = row.state or (None, None, None, None, None)
+        row.state = state
+        if old[0] != team_color:
+            row.team_label.configure(text=("\u25a0" if team_color else ""), fg=(team_color or bg_color))
+        if old[1] != state[1]:
+            row.score_label.configure(text=state[1])
+        if old[2:4] != state[2:4]:
+            row.elo_label.configure(text=elo_text, fg=elo_fg)
+        if old[4] != state[4]:
+            row.time_label.configure(text=state[4])
+
+    def set_server_elo_info(self, info, status=None):
         """Server-Durchschnitt (Ø/Min/Max) als hinterer Teil der ELO-Zeile.
-        info=None oder ohne Werte -> kein Durchschnitt."""
+        info=None oder ohne Werte -> kein Durchschnitt; stattdessen wird ein
+        qlstats-Status (z.B. 'not tracked by qlstats (retry in 4m)') gezeigt."""
         self.last_server_info = info or {}
         summary = None
         if info:
@@ -380,6 +677,8 @@ class UIManager:
                 summary = "\u00d8 {}{}".format(avg, suffix)
                 if lo and hi:
                     summary += "  \u00b7  {}\u2013{}".format(lo, hi)
+        if summary is None and status:
+            summary = status
         self._server_elo_summary = summary
         self._render_elo_line()
 
@@ -399,6 +698,21 @@ class UIManager:
             parts.append(self._server_elo_summary)
         self.elo_info_var.set("  \u00b7  ".join(parts) if parts else "N/A")
 
+    def set_ping_stats(self, stats, spark=""):
+        """Kennzahlen der dauerhaften Ping-Messung (PingRing.stats) plus
+        Sparkline. stats=None -> noch keine Samples, Zeilen bleiben leer."""
+        if not stats:
+            self.ping_stats_var.set("")
+            self.ping_spark_var.set("")
+            return
+        if stats["avg"] is None:
+            text = "no reply  \u00b7  loss {:.0f}%".format(stats["loss"])
+        else:
+            text = "min {:.0f}  \u00b7  avg {:.0f}  \u00b7  p95 {:.0f}  \u00b7  jitter {:.0f}ms  \u00b7  loss {:.0f}%".format(
+                stats["min"], stats["avg"], stats["p95"], stats["jitter"], stats["loss"])
+        self.ping_stats_var.set(text)
+        self.ping_spark_var.set(spark)
+
     def set_gamestate(self, raw):
         """Setzt den Gamestate-Text unter dem Score (leer -> ausblenden)."""
         self._gamestate_text = raw or ""
@@ -441,47 +755,45 @@ class UIManager:
 
     def apply_color_scheme(self, scheme_name):
         if scheme_name not in config.COLOR_SCHEMES: return
+        if self._scheme_preview_job is not None:
+            # Direkter Wechsel (Speichern/Abbrechen) schlaegt eine offene Vorschau.
+            self.root.after_cancel(self._scheme_preview_job)
+            self._scheme_preview_job = None
         self.current_color_scheme = config.COLOR_SCHEMES[scheme_name]
         self.root.configure(bg=self.current_color_scheme["bg"])
-        self._apply_colors_recursive(self.root)
-        # Spielerliste mit den neuen Farben neu zeichnen. Die Namen-Textfelder
-        # uebernehmen ihre Hintergrundfarbe beim Erstellen, daher reicht
-        # Umkonfigurieren nicht - die Liste muss neu aufgebaut werden.
+        # Nur registrierte Widgets umfaerben, jedes einmal (siehe theme.py).
+        # Das Options-Fenster ist nie registriert und behaelt sein Design.
+        self.theme.apply(self.current_color_scheme)
+        # Spielerliste: Zeilen bleiben bestehen; ihr Zustand wird vergessen,
+        # damit Team-/ELO-Farben (haengen an fg/bg) neu gesetzt werden. Der
+        # Canvas-Renderer zeichnet neu.
+        for row in self._player_rows.values():
+            row.state = None
         if hasattr(self, 'scrollable_frame') and self.scrollable_frame.winfo_exists():
-            self.update_player_list(self.last_players)
-
-    def _apply_colors_recursive(self, widget, scheme=None):
-        active_scheme = scheme if scheme else self.current_color_scheme
-        if not active_scheme: return
-        # WICHTIG: Das Options-Fenster niemals einfaerben. Es ist ein Toplevel
-        # und taucht als Kind von self.root in der Hierarchie auf, soll aber sein
-        # neutrales graues Standard-Design behalten.
-        if self.options_window is not None and (widget is self.options_window):
-            return
-        try:
-            widget_class = widget.winfo_class()
-            config_map = {
-                'Frame': {'bg': active_scheme["bg"]}, 'Toplevel': {'bg': active_scheme["bg"]}, 'Canvas': {'bg': active_scheme["bg"]},
-                'Label': {'bg': active_scheme["bg"], 'fg': active_scheme["fg"]},
-                'Button': {'bg': active_scheme["button_bg"], 'fg': active_scheme["button_fg"], 'activebackground': active_scheme["button_active"], 'highlightbackground': active_scheme["bg"], 'highlightthickness': 0},
-                'Text': {'bg': active_scheme["bg"], 'fg': active_scheme["fg"], 'highlightbackground': active_scheme["bg"]},
-                'Checkbutton': {'bg': active_scheme["bg"], 'fg': active_scheme["fg"], 'activebackground': active_scheme["bg"], 'activeforeground': active_scheme["fg"], 'selectcolor': active_scheme["info_bg"], 'highlightbackground': active_scheme["bg"], 'highlightthickness': 0},
-                'Radiobutton': {'bg': active_scheme["bg"], 'fg': active_scheme["fg"], 'activebackground': active_scheme["bg"], 'activeforeground': active_scheme["fg"], 'selectcolor': active_scheme["info_bg"], 'highlightbackground': active_scheme["bg"], 'highlightthickness': 0},
-                'LabelFrame': {'bg': active_scheme["bg"], 'fg': active_scheme["fg"], 'highlightbackground': active_scheme["bg"], 'highlightthickness': 0}, 'Entry': {'bg': active_scheme["info_bg"], 'fg': active_scheme["fg"]},
-            }
-            if widget_class in config_map: widget.configure(**config_map[widget_class])
-            if hasattr(self, 'refresh_button') and widget == self.refresh_button: widget.configure(fg=active_scheme["fg"])
-            if getattr(widget, 'is_hotkey_button', False):
-                # Canvas-Hotkey-Button: über Neuzeichnen einfärben.
-                self._draw_hotkey_button(widget, str(widget.fav_index))
-            if isinstance(widget, ttk.Separator): style = ttk.Style(); style.configure("Vertical.TSeparator", background="black"); style.configure("Horizontal.TSeparator", background="black")
-        except tk.TclError: pass
-        for child in widget.winfo_children(): self._apply_colors_recursive(child, scheme=scheme)
-
-    def render_colored_name(self, parent, name_str):
+            self.update_player_list(*self.last_players)
+        self.update_dashboard()
+
+    def preview_color_scheme(self, scheme_name):
+        """Live-Vorschau aus den Optionen. Schnelle Klickfolgen werden
+        zusammengefasst: angewendet wird nur das zuletzt gewaehlte Schema."""
+        if self._scheme_preview_job is not None:
+            self.root.after_cancel(self._scheme_preview_job)
+        def apply():
+            self._scheme_preview_job = None
+            self.apply_color_scheme(scheme_name)
+        self._scheme_preview_job = self.root.after(config.THEME_PREVIEW_DEBOUNCE_MS, apply)
+
+    def _paint_name_widget(self, widget, scheme):
+        """Namens-Textfeld einer Zeile: Hintergrund plus die Farbcodes, die
+        auf fg abgebildet werden (^0, ^7)."""
+        widget.configure(bg=scheme["bg"], highlightbackground=scheme["bg"])
+        widget.tag_configure("color_0", foreground=scheme["fg"])
+        widget.tag_configure("color_7", foreground=scheme["fg"])
+
+    def _name_color_map(self):
         default_color = self.current_color_scheme.get("fg", "#ffffff")
         # Quake-Live-Farbpalette ^0 - ^9
-        color_map = {
+        return {
             "0": default_color,   # schwarz -> nutze fg, damit auf dunklem bg sichtbar
             "1": "#ff0000",       # rot
             "2": "#00ff00",       # gruen
@@ -493,81 +805,118 @@ class UIManager:
             "8": "#ff8000",       # orange
             "9": "#808080",       # grau
         }
+
+    def render_colored_name(self, parent, name_str):
         text_widget = tk.Text(parent, height=1, borderwidth=0, highlightthickness=0, bg=parent.cget("bg"),
                             highlightbackground=parent.cget("bg"), wrap="none", font=("Arial", 10, "bold"), padx=0, pady=0)
-        for code, color_name in color_map.items():
+        for code, color_name in self._name_color_map().items():
             text_widget.tag_configure(f"color_{code}", foreground=color_name)
+        self._fill_colored_name(text_widget, utils.color_runs(name_str))
+        return text_widget
 
-        clean_name = name_str.replace('\x00', '')
-        current_tag = "color_7"
-        i = 0
-        n = len(clean_name)
-        buffer = ""
-
-        def flush():
-            nonlocal buffer
-            if buffer:
-                text_widget.insert("end", buffer, (current_tag,))
-                buffer = ""
-
-        while i < n:
-            ch = clean_name[i]
-            if ch == '^' and i + 1 < n:
-                nxt = clean_name[i + 1]
-                if nxt == '^':
-                    # ^^ -> literales Caret
-                    buffer += '^'
-                    i += 2
-                    continue
-                elif nxt.isdigit():
-                    # Farbcode: erst gepufferten Text mit alter Farbe schreiben
-                    flush()
-                    current_tag = f"color_{nxt}"
-                    i += 2
-                    continue
-            buffer += ch
-            i += 1
-
-        flush()
+    def _fill_colored_name(self, text_widget, runs):
+        """Setzt einen farbigen Namen (Runs aus utils.color_runs) in ein von
+        render_colored_name erzeugtes Textfeld; vorhandener Inhalt wird ersetzt."""
+        text_widget.configure(state="normal")
+        text_widget.delete("1.0", "end")
+        for code, text in runs:
+            text_widget.insert("end", text, (f"color_{code}",))
         text_widget.configure(state="disabled")
-        return text_widget
 
     def load_placeholder_image(self):
+        # Sofort ein graues Bild (ohne PIL-Arbeit); default.jpg wird im
+        # Bild-Worker dekodiert und ersetzt es, sobald es fertig ist.
+        width, height = config.MAPSHOT_SIZE
+        self.q3_logo_placeholder_photo = tk.PhotoImage(width=width, height=height)
+        self.q3_logo_placeholder_photo.put("#333333", to=(0, 0, width, height))
+        self.is_default_jpg_loaded = False
+        default_path = os.path.join(config.MAPSHOTS_DIR, "default.jpg")
+        if os.path.exists(default_path):
+            future = self.mapshots.submit(self.mapshots.decode_rgb, default_path)
+            self.app.handoff.wake()
+            future.add_done_callback(lambda f: self._post_to_ui(self._on_placeholder_loaded, f, key=("placeholder",)))
+
+    def _on_placeholder_loaded(self, future):
         try:
-            default_path = os.path.join(config.MAPSHOTS_DIR, "default.jpg")
-            if os.path.exists(default_path):
-                with Image.open(default_path) as img:
-                    img_resized = img.resize((256, 192), Image.Resampling.LANCZOS)
-                    self.q3_logo_placeholder_photo = ImageTk.PhotoImage(img_resized)
-                    self.is_default_jpg_loaded = True 
-            else:
-                img_gray = Image.new("RGB", (256, 192), color="#333333")
-                self.q3_logo_placeholder_photo = ImageTk.PhotoImage(img_gray)
-                self.is_default_jpg_loaded = False 
-        except Exception as e: 
+            self.q3_logo_placeholder_photo = self._photo_from_rgb(*future.result())
+            self.is_default_jpg_loaded = True
+        except Exception as e:
             print(f"Warning: Could not load placeholder image: {e}")
-            self.q3_logo_placeholder_photo = None
-            self.is_default_jpg_loaded = False
+            return
+        # Wird gerade der Platzhalter gezeigt -> gegen default.jpg tauschen.
+        shown, wanted = self._preview_shown, self._preview_wanted
+        if shown is None or shown[1] is None:
+            self.set_placeholder_or_clear_preview()
+            self._preview_shown, self._preview_wanted = shown, wanted
+
+    def _post_to_ui(self, func, *args, key=None):
+        """Aus einem Worker-Thread: func(*args) im Tk-Thread ausführen (über
+        app.handoff; gleiche keys werden zusammengefasst)."""
+        self.app.handoff.post(lambda: func(*args), key)
+
+    @staticmethod
+    def _photo_from_rgb(size, data):
+        # PIL erst beim ersten Mapshot laden, nicht vor dem ersten Zeichnen.
+        from PIL import Image, ImageTk
+        return ImageTk.PhotoImage(Image.frombuffer("RGB", size, data, "raw", "RGB", 0, 1))
 
     def update_map_preview(self, mapname_param):
         if not hasattr(self, 'preview_label'): return
         sanitized_map_name = utils.sanitize_filename(mapname_param)
-        for ext in ["png", "jpg", "jpeg"]:
-            path_to_check = os.path.join(config.MAPSHOTS_DIR, f"{sanitized_map_name}.{ext}")
-            if os.path.exists(path_to_check):
-                try:
-                    with Image.open(path_to_check) as img:
-                        img_resized = img.resize((256, 192), Image.Resampling.LANCZOS)
-                        photo_to_display = ImageTk.PhotoImage(img_resized)
-                        self.preview_label.config(text="", image=photo_to_display, compound="none"); self.preview_label.image = photo_to_display
-                    if self.root.winfo_exists(): self.root.update_idletasks()
-                    return
-                except Exception as e: print(f"Warning: Local image '{path_to_check}' could not be loaded: {e}")
-        
-        self.set_placeholder_or_clear_preview()
+        path, mtime = self.mapshots.lookup(sanitized_map_name)
+        wanted = (sanitized_map_name, path, mtime)
+
+        # Gleiche Map und Datei wie angezeigt oder schon in Arbeit -> nichts tun.
+        if wanted == self._preview_shown or wanted == self._preview_wanted:
+            return
+        self._preview_wanted = wanted
+
+        if path is None:
+            self.set_placeholder_or_clear_preview()
+            self._preview_shown = wanted
+            return
+
+        photo_to_display = self._mapshot_cache.get((sanitized_map_name, mtime))
+        if photo_to_display is not None:
+            self._show_mapshot(wanted, photo_to_display)
+            return
+
+        def job():
+            # Schon veraltet (Map erneut gewechselt) -> gar nicht erst dekodieren.
+            if self._preview_wanted != wanted:
+                return None
+            return self.mapshots.load_rgb(*wanted)
+        future = self.mapshots.submit(job)
+        self.app.handoff.wake()
+        # Bild-Worker arbeitet FIFO: ein neuerer Mapshot ersetzt einen noch
+        # nicht angezeigten aelteren.
+        future.add_done_callback(lambda f: self._post_to_ui(self._on_mapshot_loaded, wanted, f, key=("mapshot",)))
+
+    def _on_mapshot_loaded(self, wanted, future):
+        if self._preview_wanted != wanted:
+            return      # Ergebnis für eine Map, die nicht mehr aktuell ist
+        try:
+            rgb = future.result()
+        except Exception as e:
+            print(f"Warning: Local image '{wanted[1]}' could not be loaded: {e}")
+            self.set_placeholder_or_clear_preview()
+            self._preview_shown = wanted
+            return
+        if rgb is None:
+            return
+        photo_to_display = self._photo_from_rgb(*rgb)
+        self._mapshot_cache.put((wanted[0], wanted[2]), photo_to_display)
+        self._show_mapshot(wanted, photo_to_display)
+
+    def _show_mapshot(self, wanted, photo_to_display):
+        if not self.preview_label.winfo_exists(): return
+        self.preview_label.config(text="", image=photo_to_display, compound="none"); self.preview_label.image = photo_to_display
+        self._preview_shown = wanted
     
     def set_placeholder_or_clear_preview(self):
         if not (hasattr(self, 'preview_label') and self.preview_label.winfo_exists()): return
+        self._preview_shown = None
+        self._preview_wanted = None
         
         fg_color = self.current_color_scheme.get("fg", "#ffffff")
         
@@ -601,6 +950,7 @@ class UIManager:
         cv.fav_index = int(text)
         cv.bind("<Button-1>", lambda e: command())
         self._draw_hotkey_button(cv, text)
+        self.theme.register(cv, painter=lambda w, scheme: self._draw_hotkey_button(w, str(w.fav_index)))
         return cv
 
     def _is_active_fav(self, idx):
@@ -651,6 +1001,37 @@ class UIManager:
             else: 
                 self.hotkeys_button_frame.pack_forget()
 
+    def toggle_debug_overlay(self):
+        """Öffnet/schließt das Debug-Fenster mit p50/p95/max je Phase (siehe
+        phasestats.py). Das erste Öffnen schaltet die Messung ein."""
+        if self.debug_window and self.debug_window.winfo_exists():
+            # Sonst hielte die Theme-Registry die zerstörten Widgets.
+            self.theme.forget(self.debug_window)
+            self.debug_window.destroy()
+            self.debug_window = None
+            return
+        self.app.server_handler.enable_phase_stats()
+        self.debug_window = tk.Toplevel(self.root)
+        self.debug_window.title("Refresh phases"); self.debug_window.transient(self.root); self.debug_window.resizable(False, False)
+        self.debug_window.bind(config.DEBUG_OVERLAY_KEY, lambda e: self.toggle_debug_overlay())
+        self.debug_window.bind("<Escape>", lambda e: self.toggle_debug_overlay())
+        self.debug_window.protocol("WM_DELETE_WINDOW", self.toggle_debug_overlay)
+        self.debug_text_var = tk.StringVar()
+        tk.Label(self.debug_window, textvariable=self.debug_text_var, font=("Consolas", 9),
+                 justify="left", anchor="nw", padx=10, pady=8).pack(fill="both", expand=True)
+        self.theme.register_tree(self.debug_window)
+        self._update_debug_overlay()
+
+    def _update_debug_overlay(self):
+        if not (self.debug_window and self.debug_window.winfo_exists()):
+            return
+        stats = self.app.server_handler.phase_stats
+        current = tuple(self.app.SERVER_ADDRESS)
+        # Aktueller Server zuerst, dann die übrigen (Dashboard).
+        addresses = [current] + [a for a in stats.servers() if a != current]
+        self.debug_text_var.set(stats.report(addresses))
+        self.debug_window.after(config.DEBUG_OVERLAY_REFRESH_MS, self._update_debug_overlay)
+
     def _copy_ip(self, event=None):
         self.root.clipboard_clear(); self.root.clipboard_append(self.ip_label_var.get())
         original_ip = self.ip_label_var.get()
@@ -704,9 +1085,11 @@ class UIManager:
                 self.app.app_config["show_hotkeys"] = self.show_hotkeys_var.get()
                 self.app.app_config["start_minimized"] = self.start_minimized_var.get()
                 self.app.app_config["start_with_system"] = self.start_with_system_var.get()
+                self.app.app_config["show_dashboard"] = self.show_dashboard_var.get()
                 
                 # KORREKTUR: Speichert die neue String-Variable
                 self.app.app_config["player_list_position"] = self.player_list_position_var.get()
+                self.app.app_config["player_list_renderer"] = self.player_list_renderer_var.get()
                 self.app.app_config["own_steamid"] = self.own_steamid_var.get().strip()
                 self.app.app_config["own_gametype"] = self.own_gametype_var.get()
                 self.app.app_config["own_rating"] = self.own_rating_var.get()
@@ -714,7 +1097,14 @@ class UIManager:
                 utils.save_app_config(self.app)
                 utils.save_favorites(self.app.favorites)
 
+                # Gespeichertes Schema direkt anwenden; eine noch offene
+                # Vorschau (Debounce) wird dabei verworfen.
+                self.apply_color_scheme(self.app.app_config["color_scheme"])
                 self.refresh_hotkey_buttons()
+                self.toggle_dashboard()
+                # Eigene ELO neu holen (SteamID/Gametype/A-B evtl. geaendert).
+                self.app.server_handler.invalidate_own_elo()
+                self.update_player_list(*self.last_players)
                 self._arrange_panes()
                 self.app.server_handler.manual_refresh()
                 saved_flag["done"] = True
@@ -771,6 +1161,7 @@ class UIManager:
         # --- TAB 2: Appearance ---
         appearance_tab = tk.Frame(notebook, padx=10, pady=10); notebook.add(appearance_tab, text="Appearance")
         tk.Checkbutton(appearance_tab, text="Show Favorite Hotkeys", variable=self.show_hotkeys_var, command=self.toggle_hotkeys).pack(anchor="w")
+        tk.Checkbutton(appearance_tab, text="Favorites dashboard (polls all favorites)", variable=self.show_dashboard_var).pack(anchor="w")
         
         layout_frame = tk.LabelFrame(appearance_tab, text="Layout", padx=10, pady=10); layout_frame.pack(fill='x', pady=5)
         
@@ -785,6 +1176,11 @@ class UIManager:
                        variable=self.player_list_position_var, 
                        value="bottom").pack(anchor="w")
 
+        renderer_frame = tk.LabelFrame(appearance_tab, text="Player list renderer", padx=10, pady=10); renderer_frame.pack(fill='x', pady=5)
+        tk.Radiobutton(renderer_frame, text="Widgets (one row per player)",
+                       variable=self.player_list_renderer_var, value="widgets").pack(anchor="w")
+        tk.Radiobutton(renderer_frame, text="Canvas (single drawing surface, faster)",
+                       variable=self.player_list_renderer_var, value="canvas").pack(anchor="w")
 
         color_frame = tk.LabelFrame(appearance_tab, text="Color Scheme", padx=10, pady=10); color_frame.pack(fill="x", pady=5)
         color_var = tk.StringVar(value=self.app.app_config.get("color_scheme", "Dark1"))
@@ -792,7 +1188,7 @@ class UIManager:
         def on_color_change():
             # Nur das Hauptfenster umfaerben (Live-Vorschau).
             # Das Options-Fenster behaelt bewusst sein festes graues Design.
-            self.apply_color_scheme(color_var.get())
+            self.preview_color_scheme(color_var.get())
 
         for i, name in enumerate(config.COLOR_SCHEMES.keys()):
             tk.Radiobutton(color_frame, text=name, variable=color_var, value=name, command=on_color_change).grid(row=i//4, column=i%4, sticky="w")
@@ -3,7 +3,12 @@ import os
 import sys
 import re
 import configparser
+import functools
+import threading
+import time
 import json
+import random
+from collections import OrderedDict
 import config
 
 # Neue Windows-spezifische Importe für die Verknüpfung
@@ -40,37 +45,55 @@ def format_seconds(secs):
     mins = int((secs % 3600) // 60)
     return f"{hours}:{mins:02d}h" if hours > 0 else f"{mins}m"
 
+# Quake-Farbcodes: ^0-^9 setzt die Farbe, ^^ ist ein literales Caret.
+_COLOR_TOKEN = re.compile(r"\^([0-9^])")
+# Zeichen, die A2S liefert, der ZMQ-Name (qlstats) aber nicht (siehe normalize_name).
+_NAME_DROP = str.maketrans("", "", "'\"<>\x00")
+_MULTI_SPACE = re.compile(r"\s{2,}")
+
+@functools.lru_cache(maxsize=config.NAME_CACHE_SIZE)
+def color_runs(name):
+    """Zerlegt einen Namen mit Quake-Farbcodes in ((code, text), ...).
+    Ohne Farbcode gilt ^7. Gemeinsame Basis für strip_quake_colors,
+    normalize_name und die farbige Darstellung in der UI."""
+    if not name:
+        return ()
+    name = name.replace('\x00', '')
+    runs = []
+    code = "7"
+    buffer = []
+    pos = 0
+    for m in _COLOR_TOKEN.finditer(name):
+        buffer.append(name[pos:m.start()])
+        pos = m.end()
+        token = m.group(1)
+        if token == '^':
+            buffer.append('^')
+            continue
+        text = ''.join(buffer)
+        if text:
+            runs.append((code, text))
+        buffer = []
+        code = token
+    buffer.append(name[pos:])
+    text = ''.join(buffer)
+    if text:
+        runs.append((code, text))
+    return tuple(runs)
+
 def strip_quake_colors(name):
     """Entfernt Quake-Farbcodes (^0-^9) aus einem Namen. ^^ wird zu ^."""
-    if not name:
-        return ""
-    out = []
-    i = 0
-    n = len(name)
-    while i < n:
-        ch = name[i]
-        if ch == '^' and i + 1 < n:
-            nxt = name[i + 1]
-            if nxt == '^':
-                out.append('^')
-                i += 2
-                continue
-            elif nxt.isdigit():
-                i += 2
-                continue
-        out.append(ch)
-        i += 1
-    return ''.join(out)
+    return ''.join(text for _, text in color_runs(name))
 
+@functools.lru_cache(maxsize=config.NAME_CACHE_SIZE)
 def normalize_name(name):
     """Vergleichsschlüssel für den Abgleich A2S-Name <-> qlstats-Name.
     QL liefert in der A2S-Abfrage die Zeichen ' " < > sowie Doppel-Leerzeichen,
     die im ZMQ-Namen (Basis der qlstats-Daten) fehlen. Beide Seiten werden hier
-    identisch bereinigt, damit z.B. <LoremIpsum> oder ANDY'S LANDLORD matchen."""
-    s = strip_quake_colors(name).replace('\x00', '')
-    for ch in "'\"<>":
-        s = s.replace(ch, '')
-    s = re.sub(r'\s{2,}', ' ', s)
+    identisch bereinigt, damit z.B. <LoremIpsum> oder ANDY'S LANDLORD matchen.
+    Ergebnisse werden gemerkt (LRU), wiederholte Aufrufe pro Refresh sind billig."""
+    s = strip_quake_colors(name).translate(_NAME_DROP)
+    s = _MULTI_SPACE.sub(' ', s)
     return s.strip().lower()
 
 def get_elo_color(elo, default="#ffffff"):
@@ -88,6 +111,155 @@ def get_elo_color(elo, default="#ffffff"):
     else:
         return "#9e9e9e"   # niedrig
 
+class LRUCache:
+    """Kleiner LRU-Cache mit fester Maximalgröße. Beim Überlauf fliegt der am
+    längsten nicht benutzte Eintrag raus. Nicht thread-safe."""
+
+    def __init__(self, maxsize):
+        self.maxsize = max(0, int(maxsize))
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def discard(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+class Backoff:
+    """Exponentieller Backoff mit Jitter: nach jedem Fehlschlag verdoppelt
+    sich die Wartezeit (base .. maximum), +-jitter zufällig gestreut, damit
+    viele Server nicht im Gleichtakt erneut geprüft werden."""
+
+    def __init__(self, base, maximum, factor=2.0, jitter=None):
+        self.base = base
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = config.BACKOFF_JITTER if jitter is None else jitter
+        self.failures = 0
+        self.next_at = 0.0
+        self._schedule = (base, maximum)    # Plan der zuletzt gezählten Fehlschläge
+
+    def ready(self, now=None):
+        return (time.monotonic() if now is None else now) >= self.next_at
+
+    def remaining(self, now=None):
+        return max(0.0, self.next_at - (time.monotonic() if now is None else now))
+
+    def failure(self, base=None, maximum=None, now=None):
+        """Fehlschlag zählen; gibt die Wartezeit bis zum nächsten Versuch zurück.
+        base/maximum überschreiben die Standardwerte für diesen Schritt. Ein
+        Wechsel des Plans beginnt wieder bei base, statt die Fehlschläge des
+        anderen Plans mitzuzählen."""
+        base = self.base if base is None else base
+        maximum = self.maximum if maximum is None else maximum
+        if (base, maximum) != self._schedule:
+            self._schedule = (base, maximum)
+            self.failures = 0
+        self.failures += 1
+        delay = min(maximum, base * self.factor ** (self.failures - 1))
+        delay *= 1.0 + random.uniform(-self.jitter, self.jitter)
+        self.next_at = (time.monotonic() if now is None else now) + delay
+        return delay
+
+    def success(self):
+        self.failures = 0
+        self.next_at = 0.0
+
+def format_duration(secs):
+    """Kurze Dauer für Statusanzeigen: 45s, 4m, 1h."""
+    secs = int(round(secs))
+    if secs < 60:
+        return f"{secs}s"
+    if secs < 3600:
+        return f"{secs // 60}m"
+    return f"{secs // 3600}h"
+
+class TTLCache:
+    """Cache mit Ablaufzeit je Eintrag. Mit path wird er als JSON auf der
+    Platte gehalten und übersteht so einen Neustart; die Ablaufzeiten sind
+    deshalb Wall-Clock. Schlüssel sind Tupel aus Strings. Thread-safe."""
+
+    def __init__(self, ttl, path=None):
+        self.ttl = ttl
+        self.path = path
+        self._data = {}     # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[1] <= time.time():
+                del self._data[key]
+                return default
+            return entry[0]
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.time() + (self.ttl if ttl is None else ttl))
+        self.save()
+
+    def invalidate(self, key=None):
+        """Einen Eintrag oder (key=None) alle verwerfen."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+        self.save()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                raw = json.load(f)
+            now = time.time()
+            with self._lock:
+                self._data = {tuple(k): (v, exp) for k, v, exp in raw if exp > now}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not load cache '{self.path}': {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            raw = [[list(k), v, exp] for k, (v, exp) in self._data.items()]
+            try:
+                with open(self.path, 'w') as f:
+                    json.dump(raw, f)
+            except Exception as e:
+                print(f"Warning: Could not save cache '{self.path}': {e}")
+
 def load_favorites():
     default_favs = {str(i): "" for i in range(1, 8)}
     if os.path.exists(config.FAVORITES_FILE):
@@ -120,6 +292,8 @@ def load_app_config():
         "start_with_system": False,
         "color_scheme": "Dark1",
         "player_list_position": "right",
+        "player_list_renderer": "widgets",
+        "show_dashboard": False,
         "own_steamid": "",
         "own_gametype": "ca",
         "own_rating": "B",
@@ -136,10 +310,12 @@ def load_app_config():
         app_cfg["show_hotkeys"] = parser.getboolean("settings", "show_hotkeys", fallback=True)
         app_cfg["start_minimized"] = parser.getboolean("settings", "start_minimized", fallback=False)
         app_cfg["start_with_system"] = parser.getboolean("settings", "start_with_system", fallback=False)
+        app_cfg["show_dashboard"] = parser.getboolean("settings", "show_dashboard", fallback=False)
         app_cfg["color_scheme"] = parser.get("settings", "color_scheme", fallback="Dark1")
         app_cfg["own_steamid"] = parser.get("settings", "own_steamid", fallback="")
         app_cfg["own_gametype"] = parser.get("settings", "own_gametype", fallback="ca")
         app_cfg["own_rating"] = parser.get("settings", "own_rating", fallback="B")
+        app_cfg["player_list_renderer"] = parser.get("settings", "player_list_renderer", fallback="widgets")
 
         # LOGIK FÜR DIE PLAYER-LISTE (Konvertierung/Laden)
         new_position = parser.get("settings", "player_list_position", fallback=None)
@@ -260,8 +436,10 @@ def save_app_config(app):
     parser.set("settings", "show_hotkeys", str(app.ui.show_hotkeys_var.get()))
     parser.set("settings", "start_minimized", str(app.ui.start_minimized_var.get()))
     parser.set("settings", "start_with_system", str(app.ui.start_with_system_var.get()))
+    parser.set("settings", "show_dashboard", str(app.ui.show_dashboard_var.get()))
     
     parser.set("settings", "player_list_position", app.ui.player_list_position_var.get())
+    parser.set("settings", "player_list_renderer", app.ui.player_list_renderer_var.get())
     
     scheme_name = next((name for name, scheme in config.COLOR_SCHEMES.items() if scheme == app.ui.current_color_scheme), "Dark1")
     parser.set("settings", "color_scheme", scheme_name)